@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: bench_plot_path.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Compare the pandas plotting path (DataFrame.plot on an iloc-strided copy, as
+EzPlot.plot did before) with the direct numpy path of plot_api.PlotColumns.
+
+usage: python benchmarks/bench_plot_path.py [--rows 100000 1000000] [--ys 1 4] [--repeat 5]
+
+plot: time to create the lines, draw: one Agg draw of the figure after that.
+"""
+import os
+import sys
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from plot_api import PlotColumns
+from decimation import DecimateIndex, SAMPLING_STRIDE, SAMPLING_MINMAX
+
+
+def PandasPlot(ax, df, xName, ys, sampling, rowSkip, nPixels):
+    """ the previous path: DataFrame.plot on a strided / decimated frame copy """
+    if sampling == SAMPLING_STRIDE:
+        df.iloc[::rowSkip, :].plot(x=xName, y=ys, ax=ax, legend=False) if rowSkip > 0 else \
+            df.plot(x=xName, y=ys, ax=ax, legend=False)
+    else:
+        x = df[xName].to_numpy()
+        for y in ys:
+            idx = DecimateIndex(x, df[y].to_numpy(), nPixels, mode=sampling)
+            df[[xName, y]].iloc[idx].plot(x=xName, y=[y], ax=ax, legend=False)
+
+
+def DirectPlot(ax, df, xName, ys, sampling, rowSkip, nPixels):
+    PlotColumns(ax, df, xName, ys, sampling, rowSkip, nPixels)
+
+
+def TimePath(func, df, ys, sampling, rowSkip, repeat):
+    """ best (plot, draw) seconds over repeats, on a fresh figure each time """
+    best = (float('inf'), float('inf'))
+    for _ in range(repeat):
+        fig = Figure(figsize=(8, 4.5), dpi=100)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        nPixels = int(ax.bbox.width)
+        t0 = time.perf_counter()
+        func(ax, df, 't', ys, sampling, rowSkip, nPixels)
+        t1 = time.perf_counter()
+        canvas.draw()
+        t2 = time.perf_counter()
+        best = min(best, (t1 - t0, t2 - t1))
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pandas vs direct numpy plot path')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--ys', type=int, nargs='+', default=[1, 4], help='numbers of y columns')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    cases = [(SAMPLING_STRIDE, 0), (SAMPLING_STRIDE, 10), (SAMPLING_MINMAX, 0)]
+    print('%9s %3s %-10s %18s %18s %8s' % ('rows', 'ys', 'sampling', 'pandas plot/draw', 'direct plot/draw', 'speedup'))
+    for nRows in args.rows:
+        rng = np.random.default_rng(0)
+        nYs = max(args.ys)
+        df = pd.DataFrame({'t': np.arange(nRows, dtype=np.float64)})
+        for i in range(nYs):
+            df['y%d' % i] = np.cumsum(rng.standard_normal(nRows))
+        for nY in args.ys:
+            ys = ['y%d' % i for i in range(nY)]
+            for sampling, skip in cases:
+                old = TimePath(PandasPlot, df, ys, sampling, skip, args.repeat)
+                new = TimePath(DirectPlot, df, ys, sampling, skip, args.repeat)
+                label = sampling + ('/%d' % skip if skip else '')
+                print('%9d %3d %-10s %8.1f /%7.1f ms %8.1f /%7.1f ms %7.1fx' % (
+                    nRows, nY, label, old[0] * 1e3, old[1] * 1e3, new[0] * 1e3, new[1] * 1e3,
+                    old[0] / max(new[0], 1e-9)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
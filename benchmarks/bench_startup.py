@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: bench_startup.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Startup benchmark: every run is a fresh interpreter, timings are from process start.
+
+usage: python benchmarks/bench_startup.py [-n 5] [--eager] [--modules] [--offscreen]
+
+    import    : ezplot module imported (Qt + light modules only)
+    window    : main window constructed
+    paint     : first paint of the main window
+    ready     : figure panel built, plotting stack loaded
+--eager builds the figure panel in the constructor (the pre-deferral path) for comparison,
+--modules adds the cold import time of each heavy module.
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+from collections import OrderedDict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = ('import', 'window', 'paint', 'ready')
+
+
+def ChildRun(eager):
+    """ start the app in this process, print the stage timings as json """
+    import time
+    t0 = time.perf_counter()
+    stamps = OrderedDict()
+    def mark(stage):
+        if stage not in stamps:
+            stamps[stage] = time.perf_counter() - t0
+
+    sys.path.insert(0, ROOT)
+    import importlib.util
+    from importlib.machinery import SourceFileLoader
+    from PyQt5 import QtCore, QtWidgets
+    app = QtWidgets.QApplication(sys.argv[:1])
+    loader = SourceFileLoader('ezplot', os.path.join(ROOT, 'ezplot.pyw'))
+    spec = importlib.util.spec_from_loader('ezplot', loader)
+    ezplot = importlib.util.module_from_spec(spec)
+    loader.exec_module(ezplot)
+    mark('import')
+
+    class PaintWatcher(QtCore.QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QtCore.QEvent.Paint:
+                mark('paint')
+            return False
+
+    window = ezplot.EzPlot({'SplitterState': None}, deferPlotting=not eager)
+    mark('window')
+    watcher = PaintWatcher()
+    window.installEventFilter(watcher)
+    window.centralWidget().installEventFilter(watcher)
+    def onReady():
+        mark('ready')
+        QtCore.QTimer.singleShot(0, app.quit)
+    if window.fig is not None: # eager: built in the constructor
+        mark('ready')
+        QtCore.QTimer.singleShot(200, app.quit) # let the window paint
+    else:
+        window.signal_ready.connect(onReady)
+    QtCore.QTimer.singleShot(30000, app.quit) # give up
+    window.show()
+    app.exec_()
+    print(json.dumps(stamps))
+
+
+def ModuleTimes(modules):
+    """ cold import time of each module, each in a fresh interpreter """
+    code = 'import sys, time; sys.path.insert(0, %r); t = time.perf_counter(); import %%s; print(time.perf_counter() - t)' % ROOT
+    result = OrderedDict()
+    for name in modules:
+        out = subprocess.run([sys.executable, '-c', code % name], capture_output=True, text=True, cwd=ROOT)
+        result[name] = float(out.stdout.strip() or 'nan')
+    return result
+
+
+def Median(values):
+    values = sorted(values)
+    n = len(values)
+    return (values[n // 2] + values[(n - 1) // 2]) / 2.0 if n else float('nan')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure ezPlot start-up times.')
+    parser.add_argument('-n', '--runs', type=int, default=5, help='number of fresh starts')
+    parser.add_argument('--eager', action='store_true', help='build the figure panel in the constructor')
+    parser.add_argument('--modules', action='store_true', help='also time the heavy module imports')
+    parser.add_argument('--offscreen', action='store_true', help='use the offscreen Qt platform (no display)')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        ChildRun(args.eager)
+        return 0
+
+    env = dict(os.environ)
+    if args.offscreen:
+        env['QT_QPA_PLATFORM'] = 'offscreen'
+    cmd = [sys.executable, os.path.abspath(__file__), '--child'] + (['--eager'] if args.eager else [])
+    runs = []
+    for _ in range(args.runs):
+        out = subprocess.run(cmd, capture_output=True, text=True, env=env, cwd=ROOT)
+        try:
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        except (IndexError, ValueError):
+            print(out.stderr, file=sys.stderr)
+            return 1
+
+    print('%s start, %d runs (ms from process start)' % ('eager' if args.eager else 'deferred', len(runs)))
+    print('%-8s %8s %8s %8s' % ('stage', 'median', 'min', 'max'))
+    for stage in STAGES:
+        values = [r[stage] * 1e3 for r in runs if stage in r]
+        if values:
+            print('%-8s %8.0f %8.0f %8.0f' % (stage, Median(values), min(values), max(values)))
+
+    if args.modules:
+        from startup import PLOTTING_MODULES
+        print('\ncold imports (ms)')
+        for name, sec in ModuleTimes(('PyQt5.QtWidgets', 'numpy') + PLOTTING_MODULES + ('qdarkstyle',)).items():
+            print('%-40s %8.0f' % (name, sec * 1e3))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.path.insert(0, ROOT)
+    sys.exit(main())
@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: bench_suite.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Benchmark suite of the load, plot and redraw paths of the main window, run headless
+(offscreen Qt) on generated data files, results are written as json to compare releases.
+
+usage: python benchmarks/bench_suite.py [--preset quick|full] [--files 1e6x10:csv,pkl ...]
+                                        [--select 1 10 100] [--skip 0 10 100] [--repeat 3]
+                                        [--data-dir DIR] [--regen] [-o results.json] [--compare base.json]
+
+    files     : ROWSxCOLS:FORMATS, formats of csv, xlsx, pkl; generated once into --data-dir
+                (column 't' is the x-axis, 'c0000'... are random walks)
+    load      : EzPlot.loadFile until the dataFrame node is added (file cache off)
+    xnames    : EzPlot.updateXAxisNames
+    tree      : DataFrameTree.addDataFrame into a new tree
+    plot      : EzPlot.plot of the first n columns with DataSkip, from a cleared axes
+    draw      : full canvas draw after the plot
+Every case is timed --repeat times, min and median are reported (seconds in json, ms on screen).
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import subprocess
+from collections import OrderedDict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+EXCEL_MAX_ROWS = 1048575 # one header row
+CSV_CHUNK_ROWS = 1000000
+PRESETS = {
+    'quick' : ['1e4x10:csv,xlsx,pkl', '1e6x10:csv,pkl', '1e4x1000:csv,pkl'],
+    'full'  : ['1e6x10:csv,xlsx,pkl', '1e7x10:csv,pkl', '1e8x10:csv', '1e5x5000:csv,pkl', '1e6x100:csv,pkl'],
+}
+FORMATS = ('csv', 'xlsx', 'pkl')
+
+
+def ParseFileSpec(spec):
+    """ '1e6x10:csv,pkl' => (1000000, 10, ['csv', 'pkl']) """
+    size, _, fmts = spec.partition(':')
+    rows, cols = size.lower().split('x')
+    formats = [f.strip() for f in (fmts or 'csv').split(',') if f.strip()]
+    for fmt in formats:
+        if fmt not in FORMATS:
+            raise ValueError('unknown format %r in %r (one of %s)' % (fmt, spec, ', '.join(FORMATS)))
+    return int(float(rows)), max(int(float(cols)), 2), formats
+
+
+def MakeFrame(rows, cols, seed=0, start=0):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(seed + start)
+    data = OrderedDict([('t', np.arange(start, start + rows, dtype=np.float64) * 1e-3)])
+    for i in range(cols - 1):
+        data['c%04d' % i] = np.cumsum(rng.standard_normal(rows))
+    return pd.DataFrame(data)
+
+
+def GenerateFile(dataDir, rows, cols, fmt, regen=False):
+    """ write the synthetic file unless it exists, return its path """
+    fn = os.path.join(dataDir, 'bench_%dx%d.%s' % (rows, cols, fmt))
+    if os.path.isfile(fn) and not regen:
+        return fn
+    tmp = os.path.join(dataDir, 'partial_' + os.path.basename(fn)) # keeps the extension for the writers
+    if fmt == 'csv': # written in chunks, so 100M rows do not have to fit in memory
+        with open(tmp, 'w', newline='') as f:
+            for start in range(0, rows, CSV_CHUNK_ROWS):
+                df = MakeFrame(min(CSV_CHUNK_ROWS, rows - start), cols, start=start)
+                df.to_csv(f, index=False, header=(start == 0), float_format='%.6g')
+    elif fmt == 'xlsx':
+        MakeFrame(rows, cols).to_excel(tmp, index=False, engine='openpyxl')
+    elif fmt == 'pkl':
+        MakeFrame(rows, cols).to_pickle(tmp, compression=None)
+    os.replace(tmp, fn)
+    return fn
+
+
+class Case(object):
+    """ timings of one benchmark case """
+    def __init__(self, stage, fileInfo, **params):
+        super().__init__()
+        self.stage = stage
+        self.file_info = fileInfo
+        self.params = OrderedDict(params)
+        self.times = []
+
+    def key(self):
+        info = self.file_info
+        return '%s|%s|%dx%d|%s' % (self.stage, info['format'], info['rows'], info['cols'],
+                                   ','.join('%s=%s' % kv for kv in self.params.items()))
+
+    def toDict(self):
+        times = sorted(self.times)
+        n = len(times)
+        return OrderedDict([
+            ('key', self.key()), ('stage', self.stage), ('file', self.file_info), ('params', self.params),
+            ('times', self.times), ('min', times[0] if n else None),
+            ('median', (times[n // 2] + times[(n - 1) // 2]) / 2.0 if n else None),
+        ])
+
+
+class Runner(object):
+    """ drives one headless EzPlot window through the benchmark cases """
+    def __init__(self, app, repeat=3):
+        super().__init__()
+        from importlib.machinery import SourceFileLoader
+        import importlib.util
+        loader = SourceFileLoader('ezplot', os.path.join(ROOT, 'ezplot.pyw'))
+        spec = importlib.util.spec_from_loader('ezplot', loader)
+        self.ezplot = importlib.util.module_from_spec(spec)
+        loader.exec_module(self.ezplot)
+        import data_loader # pandas is imported at first load otherwise, keep it out of the load timings
+        self.app = app
+        self.repeat = repeat
+        self.window = self.ezplot.EzPlot({'FlagCache': False, 'FlagLegend': False, 'SplitterState': None})
+        self.window.show()
+        self.app.processEvents()
+
+    def waitLoaded(self, fn, timeout=3600):
+        """ load the file through the window, return the seconds until its node is added """
+        from PyQt5 import QtCore
+        w = self.window
+        loop = QtCore.QEventLoop()
+        outcome = {}
+        def onLoaded(name, result):
+            if name == fn:
+                outcome['ok'] = True
+                loop.quit()
+        def onFailed(name, msg):
+            if name == fn:
+                outcome['error'] = msg
+                loop.quit()
+        w.loader.signal_loaded.connect(onLoaded) # after EzPlot.onFileLoaded, so that is timed too
+        w.loader.signal_load_failed.connect(onFailed)
+        QtCore.QTimer.singleShot(int(timeout * 1000), loop.quit)
+        t0 = time.perf_counter()
+        w.loadFile(fn)
+        loop.exec_()
+        elapsed = time.perf_counter() - t0
+        w.loader.signal_loaded.disconnect(onLoaded)
+        w.loader.signal_load_failed.disconnect(onFailed)
+        if 'error' in outcome:
+            raise RuntimeError(outcome['error'])
+        if fn not in w.dataframes:
+            raise RuntimeError('not loaded within %d s' % timeout)
+        return elapsed
+
+    def unload(self, fn):
+        tree = self.window.editor_y_axis
+        if fn in tree.df_nodes:
+            tree.df_model.removeDataFrame(fn)
+            tree.signal_dataframe_deleted.emit(fn)
+        self.app.processEvents()
+
+    def timeRepeated(self, case, func):
+        for _ in range(self.repeat):
+            case.times.append(func())
+        return case
+
+    def benchFile(self, fn, fileInfo, selectSizes, skips):
+        from yaxis_selector import DataFrameTree
+        from decimation import SAMPLING_STRIDE
+        w = self.window
+        cases = []
+        cases.append(self.timeRepeated(Case('load', fileInfo), lambda: self.waitLoaded(fn)))
+        columns = w.dataframes[fn].columns.tolist()
+
+        def timeXNames():
+            t0 = time.perf_counter()
+            w.updateXAxisNames()
+            return time.perf_counter() - t0
+        cases.append(self.timeRepeated(Case('xnames', fileInfo), timeXNames))
+
+        def timeTree():
+            tree = DataFrameTree()
+            t0 = time.perf_counter()
+            tree.addDataFrame(datafn=fn, columns=columns)
+            elapsed = time.perf_counter() - t0
+            tree.deleteLater()
+            return elapsed
+        cases.append(self.timeRepeated(Case('tree', fileInfo), timeTree))
+
+        w.editor_x_axis.setValue('t')
+        w.combo_sampling.setValue(SAMPLING_STRIDE)
+        yNames = [c for c in columns if c != 't']
+        for n in sorted(set(min(n, len(yNames)) for n in selectSizes)):
+            w.editor_y_axis.selectColumns(fn, yNames[:n], clear=True)
+            for skip in skips:
+                w.editor_skip.setValue(skip)
+                self.app.processEvents()
+                w.plot_scheduler.cancel()
+                plotCase = Case('plot', fileInfo, select=n, skip=skip)
+                drawCase = Case('draw', fileInfo, select=n, skip=skip)
+                for _ in range(self.repeat):
+                    w.axes.clear()
+                    w.plot_model.reset()
+                    t0 = time.perf_counter()
+                    w.plot()
+                    t1 = time.perf_counter()
+                    w.canvas.draw()
+                    t2 = time.perf_counter()
+                    plotCase.times.append(t1 - t0)
+                    drawCase.times.append(t2 - t1)
+                cases += [plotCase, drawCase]
+        self.unload(fn)
+        return cases
+
+
+def GitRevision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=ROOT)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def Metadata(ezplot):
+    import numpy, pandas, matplotlib
+    from PyQt5.QtCore import QT_VERSION_STR
+    return OrderedDict([
+        ('version', ezplot.__version__), ('git', GitRevision()),
+        ('time', time.strftime('%Y-%m-%d %H:%M:%S')), ('platform', platform.platform()),
+        ('cpu_count', os.cpu_count()), ('python', platform.python_version()),
+        ('numpy', numpy.__version__), ('pandas', pandas.__version__),
+        ('matplotlib', matplotlib.__version__), ('qt', QT_VERSION_STR),
+    ])
+
+
+def CaseLabel(case):
+    info = case['file']
+    params = ' '.join('%s=%s' % kv for kv in case['params'].items())
+    return '%-6s %-4s %9d x %-5d %s' % (case['stage'], info['format'], info['rows'], info['cols'], params)
+
+
+def PrintResults(results, baseline=None):
+    base = {c['key']: c for c in baseline['results']} if baseline else {}
+    print('%-50s %10s %10s%s' % ('case', 'min ms', 'median ms', '   vs base' if base else ''))
+    for case in results['results']:
+        line = '%-50s %10.1f %10.1f' % (CaseLabel(case), case['min'] * 1e3, case['median'] * 1e3)
+        old = base.get(case['key'])
+        if old is not None and old['median']:
+            line += ' %9.2fx' % (case['median'] / old['median'])
+        print(line)
+    for skipped in results['skipped']:
+        print('skipped %s: %s' % (skipped['file'], skipped['reason']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the load, plot and redraw paths of ezPlot.')
+    parser.add_argument('--preset', choices=sorted(PRESETS), default='quick', help='predefined set of files')
+    parser.add_argument('--files', nargs='+', metavar='ROWSxCOLS:FMTS', help='files to benchmark, overrides --preset')
+    parser.add_argument('--select', type=int, nargs='+', default=[1, 10, 100], help='numbers of selected y columns')
+    parser.add_argument('--skip', type=int, nargs='+', default=[0, 10, 100], help='DataSkip settings')
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per case')
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'ezplot_bench'),
+                        help='where the generated files are kept between runs')
+    parser.add_argument('--regen', action='store_true', help='regenerate the data files')
+    parser.add_argument('-o', '--output', help='write the results as json, - for stdout')
+    parser.add_argument('--compare', help='json results of a previous run to compare medians with')
+    args = parser.parse_args(argv)
+
+    specs = [ParseFileSpec(s) for s in (args.files or PRESETS[args.preset])]
+    baseline = json.load(open(args.compare)) if args.compare else None
+    os.makedirs(args.data_dir, exist_ok=True)
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5 import QtWidgets
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+    runner = Runner(app, repeat=args.repeat)
+    log = sys.stderr if args.output == '-' else sys.stdout
+
+    results = OrderedDict([('meta', Metadata(runner.ezplot)), ('results', []), ('skipped', [])])
+    for rows, cols, formats in specs:
+        for fmt in formats:
+            name = '%dx%d.%s' % (rows, cols, fmt)
+            if fmt == 'xlsx' and rows > EXCEL_MAX_ROWS:
+                results['skipped'].append({'file': name, 'reason': 'more rows than an Excel sheet holds'})
+                continue
+            t0 = time.perf_counter()
+            fn = GenerateFile(args.data_dir, rows, cols, fmt, regen=args.regen)
+            print('%s: ready in %.1f s, benchmarking...' % (name, time.perf_counter() - t0), file=log)
+            fileInfo = OrderedDict([('format', fmt), ('rows', rows), ('cols', cols), ('bytes', os.path.getsize(fn))])
+            try:
+                cases = runner.benchFile(fn, fileInfo, args.select, args.skip)
+            except (RuntimeError, MemoryError) as e:
+                runner.unload(fn)
+                results['skipped'].append({'file': name, 'reason': str(e)})
+                continue
+            results['results'] += [case.toDict() for case in cases]
+
+    if args.output == '-':
+        json.dump(results, sys.stdout, indent=2)
+    else:
+        if args.output:
+            with open(args.output, 'w') as f:
+                json.dump(results, f, indent=2)
+        PrintResults(results, baseline)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
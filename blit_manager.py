@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: blit_manager.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+ref: https://matplotlib.org/stable/tutorials/advanced/blitting.html
+"""
+import numpy as np
+
+
+class BlitManager(object):
+    """ Redraw a few animated artists over a cached background instead of the whole figure.
+        The background is captured on every full draw (without the animated artists),
+        so an artist added here costs one full draw, later updates of it only a blit.
+    """
+    def __init__(self, canvas):
+        super().__init__()
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        self._need_full_draw = False
+        self._cid = canvas.mpl_connect('draw_event', self.onDraw)
+
+    def onDraw(self, event):
+        """ capture the background & draw the animated artists over it """
+        if event is not None and event.canvas is not self.canvas:
+            return
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._drawArtists()
+        self._need_full_draw = False
+
+    def _drawArtists(self):
+        fig = self.canvas.figure
+        for art in self.artists:
+            fig.draw_artist(art)
+
+    def addArtist(self, art):
+        """ animate the artist, it is no longer part of the cached background """
+        if art not in self.artists:
+            art.set_animated(True)
+            self.artists.append(art)
+            self._need_full_draw = True
+
+    def replaceArtist(self, oldArt, newArt):
+        """ swap a re-created artist (e.g. a legend) in place """
+        if oldArt in self.artists:
+            self.artists.remove(oldArt)
+        if newArt is not None:
+            newArt.set_animated(True)
+            self.artists.append(newArt)
+
+    def reset(self):
+        """ put all artists back to normal drawing, call before structural changes of the figure """
+        for art in self.artists:
+            art.set_animated(False)
+        self.artists.clear()
+        self.background = None
+
+    def update(self):
+        """ blit the animated artists, fall back to a full draw if the background is stale """
+        stale = any(not art.get_animated() for art in self.artists) # e.g. reset by a draggable legend
+        if stale:
+            for art in self.artists:
+                art.set_animated(True)
+        if self.background is None or self._need_full_draw or stale:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            self._drawArtists()
+            self.canvas.blit(self.canvas.figure.bbox)
+
+    def redrawAxes(self, axes, regions):
+        """ redraw some axes over the figure as last drawn and blit them, the other axes are kept,
+            call after reset() so no artist is left out as animated.
+            - axes: in drawing order, a secondary y axes after its primary one
+            - regions: display bboxes covering everything the axes showed & show now (e.g. their tight
+                       bboxes before & after the change), cleared to the figure background first.
+                       They must not overlap axes that are not redrawn.
+        """
+        from matplotlib.transforms import Bbox
+        fig = self.canvas.figure
+        pixels = np.asarray(self.canvas.buffer_rgba())
+        height, width = pixels.shape[:2]
+        clip = fig.patch.get_clip_box()
+        boxes = []
+        for region in regions:
+            x0, y0 = max(int(region.x0) - 1, 0), max(int(region.y0) - 1, 0)
+            x1, y1 = min(int(np.ceil(region.x1)) + 1, width), min(int(np.ceil(region.y1)) + 1, height)
+            if x0 >= x1 or y0 >= y1:
+                continue
+            pixels[height - y1:height - y0, x0:x1] = (255, 255, 255, 0) # cleared as by the renderer, the figure patch may be transparent
+            box = Bbox.from_extents(x0, y0, x1, y1)
+            fig.patch.set_clip_box(box)
+            fig.draw_artist(fig.patch)
+            boxes.append(box)
+        fig.patch.set_clip_box(clip)
+        for ax in axes:
+            fig.draw_artist(ax)
+        for box in boxes:
+            self.canvas.blit(box)
+        self.background = self.canvas.copy_from_bbox(fig.bbox)
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: column_index.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Incremental index of which loaded files hold which column names.
+"""
+from collections import OrderedDict
+
+
+class ColumnIndex(object):
+    """ column name => set of files holding it, kept up to date on add / rename / remove,
+        so an update costs O(columns of the changed file) instead of intersecting all files.
+        Columns are listed in order of first appearance.
+    """
+    def __init__(self):
+        super().__init__()
+        self.files = OrderedDict() # fn => [column names]
+        self.refs = OrderedDict() # column name => {fn}
+
+    def __len__(self):
+        return len(self.files)
+
+    def __contains__(self, fn):
+        return fn in self.files
+
+    def _ref(self, fn, name):
+        self.refs.setdefault(name, set()).add(fn)
+
+    def _unref(self, fn, name):
+        fns = self.refs.get(name)
+        if fns is not None:
+            fns.discard(fn)
+            if not fns:
+                del self.refs[name]
+
+    def addFile(self, fn, columns):
+        """ add a file, or replace the columns of a reloaded one """
+        columns = list(columns)
+        old = set(self.files.get(fn, ()))
+        new = set(columns)
+        for name in old - new:
+            self._unref(fn, name)
+        for name in columns:
+            if name not in old:
+                self._ref(fn, name)
+        self.files[fn] = columns
+
+    def removeFile(self, fn):
+        for name in self.files.pop(fn, ()):
+            self._unref(fn, name)
+
+    def renameColumn(self, fn, oldName, newName):
+        columns = self.files.get(fn)
+        if columns is None or oldName not in columns:
+            return
+        columns[columns.index(oldName)] = newName
+        self._unref(fn, oldName)
+        self._ref(fn, newName)
+
+    def count(self, name):
+        """ number of files holding the column """
+        return len(self.refs.get(name, ()))
+
+    def filesOf(self, name):
+        return set(self.refs.get(name, ()))
+
+    def common(self):
+        """ columns held by every file """
+        n = len(self.files)
+        if n == 1: # keep the file's own column order
+            return list(next(iter(self.files.values())))
+        return [name for name, fns in self.refs.items() if len(fns) == n] if n else []
+
+    def shared(self, minFiles=2):
+        """ [(column, nFiles)] of the columns held by at least minFiles but not all files """
+        n = len(self.files)
+        return [(name, len(fns)) for name, fns in self.refs.items() if minFiles <= len(fns) < n]
+
+
+class ColumnAliases(object):
+    """ display name => column name in the stored dataFrame, per file.
+        A rename only changes the display name, the stored frames are never rewritten;
+        the real names are applied when a frame is exported.
+    """
+    def __init__(self):
+        super().__init__()
+        self.files = {} # fn => {display name: source name}, of the renamed columns only
+
+    def source(self, fn, name):
+        """ column name in the stored frame of a displayed name """
+        return self.files.get(fn, {}).get(name, name)
+
+    def sources(self, fn, names):
+        aliases = self.files.get(fn, {})
+        return [aliases.get(n, n) for n in names]
+
+    def rename(self, fn, oldName, newName):
+        aliases = self.files.setdefault(fn, {})
+        source = aliases.pop(oldName, oldName)
+        if newName != source:
+            aliases[newName] = source
+
+    def removeFile(self, fn):
+        self.files.pop(fn, None)
+
+    def renames(self, fn):
+        """ {source name: display name} of the renamed columns, for DataFrame.rename """
+        return {source: name for name, source in self.files.get(fn, {}).items()}
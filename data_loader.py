@@ -0,0 +1,727 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: data_loader.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Data file loader registry.
+
+The reader is picked from the file's magic bytes and extension before any parsing
+is done, so a file costs a single parse instead of running every pandas reader
+in turn until one does not raise.
+"""
+import io
+import os
+import zipfile
+import warnings
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+import pandas as pd
+
+
+SNIFF_BYTES = 4096 # bytes read from the file head for sniffing
+CHUNK_ROWS = 200000 # rows per chunk for chunked text readers
+SCAN_BUFFER = 1 << 20 # bytes per read of a text file parsed up to a given size
+CATEGORY_RATIO = 0.5 # string columns with less unique/total values become categoricals in compact mode
+DATETIME_SAMPLE = 100 # values of a string column tried as timestamps before parsing all of it
+
+MAGIC_PICKLE = (b'\x80\x02', b'\x80\x03', b'\x80\x04', b'\x80\x05') # pickle protocol 2~5 header
+MAGIC_ZIP    = b'PK\x03\x04'
+MAGIC_OLE2   = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' # legacy .xls
+MAGIC_PARQUET = b'PAR1'
+MAGIC_HDF5   = b'\x89HDF\r\n\x1a\n'
+MAGIC_ARROW  = b'ARROW1' # Arrow IPC file, i.e. Feather v2
+
+
+LoadResult = namedtuple('LoadResult', ['df', 'reader', 'reason', 'skipped', 'nbytes', 'end_offset'],
+                        defaults=(None,))
+
+
+class LoadCancelled(Exception):
+    """ raised inside a reader when the loading is cancelled by user """
+    pass
+
+
+class DataReader(object):
+    """ A registered file reader.
+        - name: short reader name shown to the user
+        - func: pandas style reader, func(fn, **kwargs) -> DataFrame
+        - extensions: lower case file extensions (with dot) handled by this reader
+        - sniffFunc: sniffFunc(fn, head:bytes) -> reason string if the content matches, else None
+        - chunked: func supports chunk-wise reading with progress report and cancellation,
+                   called as func(fn, progressFunc=..., isCancelled=..., nbytes=..., **kwargs)
+                   and parses only the first nbytes of the file (if not None)
+        - headerFunc: headerFunc(fn, **kwargs) -> raw column names, without reading the data
+        - columnsFunc: columnsFunc(fn, rawNames, **kwargs) -> DataFrame of only these columns
+        - rangeFunc: rangeFunc(fn, rawNames, start, stop, **kwargs) -> DataFrame of these columns
+                     holding rows [start, stop) only
+        - countFunc: countFunc(fn, **kwargs) -> number of rows, from the file metadata
+    """
+    def __init__(self, name, func, extensions=(), sniffFunc=None, kwargs=None, chunked=False,
+                 headerFunc=None, columnsFunc=None, rangeFunc=None, countFunc=None):
+        super().__init__()
+        self.name = name
+        self.func = func
+        self.extensions = tuple(extensions)
+        self.sniffFunc = sniffFunc
+        self.kwargs = kwargs or {}
+        self.chunked = chunked
+        self.headerFunc = headerFunc
+        self.columnsFunc = columnsFunc
+        self.rangeFunc = rangeFunc
+        self.countFunc = countFunc
+
+    def sniff(self, fn, head):
+        return self.sniffFunc(fn, head) if self.sniffFunc else None
+
+    def canReadColumns(self):
+        """ True if columns can be read one by one (for lazy loading) """
+        return self.headerFunc is not None and self.columnsFunc is not None
+
+    def readHeader(self, fn):
+        return list(self.headerFunc(fn, **self.kwargs))
+
+    def readColumns(self, fn, rawNames):
+        return self.columnsFunc(fn, list(rawNames), **self.kwargs)
+
+    def canReadRange(self):
+        """ True if a row range of columns can be read without the rest of the rows """
+        return self.rangeFunc is not None
+
+    def readRange(self, fn, rawNames, start, stop):
+        return self.rangeFunc(fn, list(rawNames), start, stop, **self.kwargs)
+
+    def rowCount(self, fn):
+        """ number of rows if the file metadata tells, else None """
+        return int(self.countFunc(fn, **self.kwargs)) if self.countFunc else None
+
+    def read(self, fn, progressFunc=None, isCancelled=None, nbytes=None):
+        """ progressFunc(bytesRead, totalBytes, rowsParsed) is called as reading goes,
+            isCancelled() is polled between chunks (if chunked) and raise LoadCancelled when True
+            - nbytes: a chunked reader parses only the first nbytes, e.g. of a file still written
+        """
+        if self.chunked:
+            return self.func(fn, progressFunc=progressFunc, isCancelled=isCancelled, nbytes=nbytes, **self.kwargs)
+        if isCancelled and isCancelled():
+            raise LoadCancelled(fn)
+        df = self.func(fn, **self.kwargs)
+        if progressFunc:
+            size = os.path.getsize(fn)
+            progressFunc(size, size, len(df))
+        return df
+
+    def __repr__(self):
+        return 'DataReader(%s)' % self.name
+
+
+READERS = OrderedDict() # name => DataReader, in fallback order
+
+
+def RegisterReader(reader:DataReader):
+    """ register (or replace) a reader, later registered readers are tried later """
+    READERS[reader.name] = reader
+    return reader
+
+
+def ReadFileHead(fn, nbytes=SNIFF_BYTES):
+    with open(fn, 'rb') as f:
+        return f.read(nbytes)
+
+
+def IsTextHead(head):
+    """ guess if the head bytes are plain text """
+    if not head:
+        return False
+    if b'\x00' in head:
+        return False
+    try:
+        head.decode('utf-8')
+    except UnicodeDecodeError as e:
+        if e.start < len(head) - 4: # not just a multi-byte char cut at the end
+            try:
+                head.decode('latin-1')
+            except UnicodeDecodeError:
+                return False
+    return True
+
+
+def FirstTextLine(head):
+    line = head.split(b'\n', 1)[0]
+    return line.decode('utf-8', errors='replace')
+
+
+###############################################################################
+# content sniffers
+
+def _SniffPickle(fn, head):
+    if head[:2] in MAGIC_PICKLE:
+        return 'pickle protocol %d header' % head[1]
+    return None
+
+
+def _SniffExcel(fn, head):
+    if head.startswith(MAGIC_OLE2):
+        return 'OLE2 (xls) signature'
+    if head.startswith(MAGIC_ZIP):
+        try:
+            with zipfile.ZipFile(fn) as zf:
+                names = zf.namelist()
+        except (zipfile.BadZipFile, OSError):
+            return None
+        if any(n.startswith('xl/') for n in names):
+            return 'ZIP signature with xl/ workbook'
+    return None
+
+
+def _SniffParquet(fn, head):
+    if head.startswith(MAGIC_PARQUET):
+        return 'PAR1 signature'
+    return None
+
+
+def _SniffHdf5(fn, head):
+    if head.startswith(MAGIC_HDF5):
+        return 'HDF5 signature'
+    return None
+
+
+def _SniffFeather(fn, head):
+    if head.startswith(MAGIC_ARROW):
+        return 'ARROW1 (Feather v2) signature'
+    return None
+
+
+def _SniffCsv(fn, head):
+    if IsTextHead(head):
+        line = FirstTextLine(head)
+        if '\t' in line and ',' not in line:
+            return None # tab separated, leave it to the table reader
+        return 'text content, comma separated'
+    return None
+
+
+def _SniffTable(fn, head):
+    if IsTextHead(head) and '\t' in FirstTextLine(head):
+        return 'text content, tab separated'
+    return None
+
+
+class _FileHead(io.RawIOBase):
+    """ the first nbytes of a binary file as a stream """
+    def __init__(self, f, nbytes):
+        super().__init__()
+        self.file = f
+        self.remaining = nbytes
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        data = self.file.read(min(len(b), self.remaining))
+        b[:len(data)] = data
+        self.remaining -= len(data)
+        return len(data)
+
+
+def _CompleteLinesEnd(fn, size):
+    """ offset past the last line end within the first size bytes of the file, so a last line
+        still being written is not parsed half. A file without any line end counts whole.
+    """
+    with open(fn, 'rb') as f:
+        pos = size
+        while pos > 0:
+            start = max(pos - SCAN_BUFFER, 0)
+            f.seek(start)
+            i = f.read(pos - start).rfind(b'\n')
+            if i >= 0:
+                return start + i + 1
+            pos = start
+    return size
+
+
+def _ReadTextChunked(fn, progressFunc=None, isCancelled=None, nbytes=None, **kwargs):
+    """ read text table chunk by chunk, report the file position after each chunk.
+        - nbytes: parse the first nbytes only, the rows appended while reading are left to a follower
+    """
+    total = os.path.getsize(fn) if nbytes is None else nbytes
+    chunks, nrows = [], 0
+    with open(fn, 'rb') as f:
+        stream = f if nbytes is None else io.BufferedReader(_FileHead(f, nbytes), SCAN_BUFFER)
+        for chunk in pd.read_csv(stream, chunksize=CHUNK_ROWS, **kwargs):
+            if isCancelled and isCancelled():
+                raise LoadCancelled(fn)
+            chunks.append(chunk)
+            nrows += len(chunk)
+            if progressFunc:
+                progressFunc(min(f.tell(), total), total, nrows)
+    if not chunks:
+        return pd.DataFrame()
+    df = chunks[0] if len(chunks) == 1 else pd.concat(chunks, ignore_index=True)
+    if progressFunc:
+        progressFunc(total, total, nrows)
+    return df
+
+
+def _ReadTextHeader(fn, **kwargs):
+    return pd.read_csv(fn, nrows=0, **kwargs).columns
+
+
+def _ReadTextColumns(fn, rawNames, **kwargs):
+    return pd.read_csv(fn, usecols=rawNames, **kwargs)[rawNames]
+
+
+def _ArrowDataColumns(schema):
+    """ column names of an arrow schema, without the stored pandas index """
+    indexCols = set()
+    meta = schema.pandas_metadata or {}
+    for idx in meta.get('index_columns', []):
+        if isinstance(idx, str):
+            indexCols.add(idx)
+    return [n for n in schema.names if n not in indexCols]
+
+
+def _ReadParquetHeader(fn, **kwargs):
+    import pyarrow.parquet as pq
+    return _ArrowDataColumns(pq.ParquetFile(fn).schema_arrow)
+
+
+def _ReadParquetColumns(fn, rawNames, **kwargs):
+    return pd.read_parquet(fn, columns=rawNames, **kwargs).reset_index(drop=True)
+
+
+def _ReadParquetRange(fn, rawNames, start, stop, **kwargs):
+    """ read only the row groups overlapping the rows """
+    import pyarrow.parquet as pq
+    pf = pq.ParquetFile(fn)
+    groups, first, offset = [], 0, 0
+    for i in range(pf.metadata.num_row_groups):
+        n = pf.metadata.row_group(i).num_rows
+        if offset < stop and offset + n > start:
+            if not groups:
+                first = offset
+            groups.append(i)
+        offset += n
+    if not groups:
+        return pd.DataFrame(columns=rawNames)
+    table = pf.read_row_groups(groups, columns=rawNames, use_pandas_metadata=False)
+    return table.slice(start - first, stop - start).to_pandas()
+
+
+def _ParquetRowCount(fn, **kwargs):
+    import pyarrow.parquet as pq
+    return pq.ParquetFile(fn).metadata.num_rows
+
+
+def _ReadFeatherHeader(fn, **kwargs):
+    """ only the schema in the file footer is read """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    with pa.memory_map(fn) as source:
+        return _ArrowDataColumns(ipc.open_file(source).schema)
+
+
+def _ReadFeatherColumns(fn, rawNames, **kwargs):
+    return pd.read_feather(fn, columns=rawNames, **kwargs).reset_index(drop=True)
+
+
+def _ReadFeatherRange(fn, rawNames, start, stop, **kwargs):
+    """ the columns are memory mapped & sliced, so an uncompressed file only pages in the rows
+        (compressed record batches are decompressed per column)
+    """
+    import pyarrow.feather as feather
+    table = feather.read_table(fn, columns=rawNames, memory_map=True)
+    return table.slice(start, max(stop - start, 0)).to_pandas()
+
+
+def _FeatherRowCount(fn, **kwargs):
+    import pyarrow.feather as feather
+    return feather.read_table(fn, columns=[], memory_map=True).num_rows
+
+
+def _HdfKey(store, kwargs):
+    """ the given key, else the first key of the store """
+    if kwargs.get('key'):
+        return kwargs['key']
+    keys = store.keys()
+    if not keys:
+        raise KeyError('no dataset in the HDF5 file')
+    return keys[0]
+
+
+def _ReadHdf(fn, **kwargs):
+    """ read the first key if the store holds more than one """
+    if 'key' not in kwargs:
+        with pd.HDFStore(fn, mode='r') as store:
+            keys = store.keys()
+        if keys:
+            kwargs['key'] = keys[0]
+    return pd.read_hdf(fn, **kwargs)
+
+
+def _ReadHdfHeader(fn, **kwargs):
+    with pd.HDFStore(fn, mode='r') as store:
+        return list(store.select(_HdfKey(store, kwargs), stop=0).columns)
+
+
+def _ReadHdfRange(fn, rawNames, start=None, stop=None, **kwargs):
+    """ table format stores read only the columns, fixed format ones are read whole, 
+        both read only the row range
+    """
+    with pd.HDFStore(fn, mode='r') as store:
+        key = _HdfKey(store, kwargs)
+        if store.get_storer(key).is_table:
+            df = store.select(key, columns=rawNames, start=start, stop=stop)
+        else:
+            df = store.select(key, start=start, stop=stop)
+    return df[rawNames].reset_index(drop=True)
+
+
+def _ReadHdfColumns(fn, rawNames, **kwargs):
+    return _ReadHdfRange(fn, rawNames, **kwargs)
+
+
+def _HdfRowCount(fn, **kwargs):
+    with pd.HDFStore(fn, mode='r') as store:
+        storer = store.get_storer(_HdfKey(store, kwargs))
+        return storer.nrows if storer.is_table else storer.shape[0]
+
+
+RegisterReader(DataReader('csv', _ReadTextChunked, extensions=('.csv', '.txt', '.dat', '.log'),
+                          sniffFunc=_SniffCsv, kwargs={'index_col': False}, chunked=True,
+                          headerFunc=_ReadTextHeader, columnsFunc=_ReadTextColumns))
+RegisterReader(DataReader('excel', pd.read_excel, extensions=('.xlsx', '.xlsm', '.xls'),
+                          sniffFunc=_SniffExcel))
+RegisterReader(DataReader('pickle', pd.read_pickle, extensions=('.pkl', '.pickle', '.p'),
+                          sniffFunc=_SniffPickle))
+RegisterReader(DataReader('parquet', pd.read_parquet, extensions=('.parquet', '.pq'),
+                          sniffFunc=_SniffParquet,
+                          headerFunc=_ReadParquetHeader, columnsFunc=_ReadParquetColumns,
+                          rangeFunc=_ReadParquetRange, countFunc=_ParquetRowCount))
+RegisterReader(DataReader('feather', pd.read_feather, extensions=('.feather', '.arrow', '.ipc'),
+                          sniffFunc=_SniffFeather,
+                          headerFunc=_ReadFeatherHeader, columnsFunc=_ReadFeatherColumns,
+                          rangeFunc=_ReadFeatherRange, countFunc=_FeatherRowCount))
+RegisterReader(DataReader('hdf5', _ReadHdf, extensions=('.h5', '.hdf5', '.hdf'),
+                          sniffFunc=_SniffHdf5,
+                          headerFunc=_ReadHdfHeader, columnsFunc=_ReadHdfColumns,
+                          rangeFunc=_ReadHdfRange, countFunc=_HdfRowCount))
+RegisterReader(DataReader('table', _ReadTextChunked, extensions=('.tsv', '.tab'),
+                          sniffFunc=_SniffTable, kwargs={'sep': '\t'}, chunked=True,
+                          headerFunc=_ReadTextHeader, columnsFunc=_ReadTextColumns))
+
+
+###############################################################################
+
+def SniffReaders(fn, head=None):
+    """ rank the registered readers for the given file.
+        return ([(reader, reason)] candidates in try order, {readerName: skip reason})
+        Readers whose signature matches come first, then those matching the file extension.
+        Readers matching neither are skipped and never run.
+    """
+    if head is None:
+        head = ReadFileHead(fn)
+    ext = os.path.splitext(fn)[1].lower()
+
+    byContent, byExt, skipped = [], [], OrderedDict()
+    for reader in READERS.values():
+        reason = reader.sniff(fn, head)
+        if reason:
+            byContent.append((reader, reason))
+        elif ext and ext in reader.extensions:
+            byExt.append((reader, 'extension %s' % ext))
+        else:
+            skipped[reader.name] = 'no signature match' + (', extension %s not handled' % ext if ext else '')
+    return byContent + byExt, skipped
+
+
+def NormalizeFrame(df):
+    """ post-process a freshly read dataFrame (in place) """
+    df.reset_index(level=None, inplace=True) # in case the header column does not math data column number
+    df.columns = [str(c).strip() for c in df.columns] # strip column names
+    return df
+
+
+def _DowncastFloat(col):
+    """ float64 to float32 only if no value changes """
+    f32 = col.astype(np.float32)
+    if np.array_equal(f32.to_numpy(np.float64), col.to_numpy(), equal_nan=True):
+        return f32
+    return col
+
+
+def _ParseDatetime(col):
+    """ the string column as datetime64 if all its values are timestamps, else None.
+        A sample is tried first, so free text is not parsed value by value.
+    """
+    values = col.dropna()
+    if values.empty:
+        return None
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', UserWarning) # format not inferred, parsed per value
+        if pd.to_datetime(values.iloc[:DATETIME_SAMPLE], errors='coerce').isna().any():
+            return None
+        ts = pd.to_datetime(col, errors='coerce')
+    return ts if ts.notna().sum() == len(values) else None
+
+
+def CompactFrame(df, dropText=True):
+    """ shrink a dataFrame for plotting: downcast numerics (lossless), parse timestamp strings,
+        turn repeated strings into categoricals and drop the other non-plottable columns (if dropText).
+    """
+    cols = OrderedDict()
+    for name in df.columns:
+        col = df[name]
+        kind = col.dtype.kind
+        if kind in 'iu':
+            cols[name] = pd.to_numeric(col, downcast='unsigned' if kind=='u' or (len(col) and col.min()>=0) else 'integer')
+        elif kind == 'f':
+            cols[name] = _DowncastFloat(col)
+        elif kind in 'bmM':
+            cols[name] = col
+        elif kind == 'O':
+            num = pd.to_numeric(col, errors='coerce')
+            isNumber = num.notna().sum() == col.notna().sum()
+            ts = None if isNumber else _ParseDatetime(col)
+            if isNumber: # numbers stored as text
+                cols[name] = pd.to_numeric(num, downcast='integer' if num.dtype.kind in 'iu' else 'float')
+            elif ts is not None: # timestamps, e.g. the time axis
+                cols[name] = ts
+            elif len(col) and col.nunique() < CATEGORY_RATIO * len(col):
+                cols[name] = col.astype('category')
+            elif not dropText:
+                cols[name] = col
+            # else: free text, not plottable, dropped
+        elif isinstance(col.dtype, pd.CategoricalDtype):
+            cols[name] = col
+    return pd.DataFrame(cols, index=df.index)
+
+
+def FrameMemory(df):
+    """ memory used by the dataFrame in bytes """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def FormatSize(nbytes):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(nbytes) < 1024 or unit == 'GB':
+            return ('%d %s' if unit == 'B' else '%.1f %s') % (nbytes, unit)
+        nbytes /= 1024
+
+
+class LazyFrame(object):
+    """ A dataFrame of which only the header is read, the data of a column is read
+        the first time it is asked for, then cached.
+        Mimics the parts of DataFrame used by the app: columns, [], rename, empty, len.
+        - cache_limit: bytes of cached columns, the least recently used ones are dropped beyond it
+                       (None: no limit), row ranges of dropped columns are read from the file
+    """
+    def __init__(self, fn, reader:DataReader, rawNames, compact=False):
+        super().__init__()
+        self.datafile = fn
+        self.reader = reader
+        self.compact = compact
+        names = [str(c).strip() for c in rawNames]
+        # the full load path adds the row number by reset_index(), so does this
+        self.index_name = 'index' if 'index' not in names else 'level_0'
+        self.raw_names = OrderedDict(zip(names, rawNames)) # column name => name in file
+        self.columns = pd.Index([self.index_name] + names)
+        self._cache = OrderedDict() # column name => Series, least recently used first
+        self._nrows = None
+        self.cache_limit = None
+
+    @property
+    def empty(self):
+        return len(self.raw_names) == 0
+
+    def __len__(self):
+        if self._nrows is None:
+            self._nrows = self.reader.rowCount(self.datafile)
+        if self._nrows is None:
+            self.getColumns([self.columns[1]])
+        return self._nrows
+
+    def loadedColumns(self):
+        return [c for c in self.columns if c in self._cache]
+
+    def memoryUsage(self):
+        return sum(int(s.memory_usage(index=False, deep=True)) for s in self._cache.values())
+
+    def _readMissing(self, names, rows=None):
+        """ read the not cached columns, of all rows or of the (start, stop) row range """
+        missing = [n for n in names if n not in self._cache and n != self.index_name]
+        if not missing:
+            return {}
+        rawNames = [self.raw_names[n] for n in missing]
+        if rows is None:
+            df = self.reader.readColumns(self.datafile, rawNames)
+        else:
+            df = self.reader.readRange(self.datafile, rawNames, *rows)
+        df.columns = missing
+        if self.compact:
+            df = CompactFrame(df, dropText=False)
+        df.index = pd.RangeIndex(len(df)) if rows is None else pd.RangeIndex(rows[0], rows[0] + len(df))
+        return {n: df[n] for n in missing}
+
+    def _evict(self, keep):
+        """ drop the least recently used columns while the cache is over its limit """
+        if self.cache_limit is None:
+            return
+        used = self.memoryUsage()
+        for name in list(self._cache):
+            if used <= self.cache_limit:
+                break
+            if name not in keep:
+                used -= int(self._cache.pop(name).memory_usage(index=False, deep=True))
+
+    def getColumns(self, names, rows=None):
+        """ return a DataFrame of the given columns, read the missing ones from file.
+            - rows: (start, stop) to get this row range only, the columns not cached are read
+                    for the range only (if the reader can) and are not cached
+        """
+        if rows is not None and self.reader.canReadRange():
+            start, stop = rows
+            data = self._readMissing(names, rows)
+            for n in names:
+                if n in self._cache:
+                    data[n] = self._cache[n].iloc[start:stop]
+            if self.index_name in names and self.index_name not in data:
+                stop = start + len(next(iter(data.values()))) if data else min(stop, len(self))
+                data[self.index_name] = pd.Series(np.arange(start, stop), index=pd.RangeIndex(start, stop),
+                                                  name=self.index_name)
+            return pd.DataFrame({n: data[n] for n in names})
+        read = self._readMissing(names)
+        if read:
+            self._cache.update(read)
+            self._nrows = len(next(iter(read.values())))
+        if self.index_name in names and self.index_name not in self._cache:
+            if self._nrows is None:
+                len(self)
+            self._cache[self.index_name] = pd.Series(np.arange(self._nrows), name=self.index_name)
+        for n in names:
+            self._cache.move_to_end(n)
+        df = pd.DataFrame({n: self._cache[n] for n in names})
+        self._evict(keep=set(names))
+        return df if rows is None else df.iloc[rows[0]:rows[1]]
+
+    def __getitem__(self, key):
+        if isinstance(key, (list, tuple, pd.Index)):
+            return self.getColumns(list(key))
+        return self.getColumns([key])[key]
+
+    def rename(self, columns, inplace=True):
+        """ rename columns, only in place """
+        assert inplace, 'LazyFrame only renames in place'
+        for old, new in columns.items():
+            if old == self.index_name:
+                self.index_name = new
+            elif old in self.raw_names:
+                self.raw_names = OrderedDict((new if k==old else k, v) for k, v in self.raw_names.items())
+            if old in self._cache:
+                self._cache[new] = self._cache.pop(old).rename(new)
+        self.columns = pd.Index([columns.get(c, c) for c in self.columns])
+
+
+def FrameColumns(frame, names):
+    """ a DataFrame holding (at least) the given columns, columns of a LazyFrame are read here """
+    if isinstance(frame, LazyFrame):
+        return frame.getColumns(list(names))
+    return frame
+
+
+def ColumnRange(frame, name, start, stop):
+    """ rows [start, stop) of a column as an array, a LazyFrame reads only these rows
+        if the column is not cached (e.g. dropped by its cache limit) and its reader can read
+        a row range (binary formats), a text column is read & cached whole again
+    """
+    if isinstance(frame, LazyFrame):
+        return frame.getColumns([name], rows=(start, stop))[name].to_numpy()
+    return frame[name].to_numpy()[start:stop]
+
+
+def LoadDataFrame(fn, progressFunc=None, isCancelled=None, compact=False, lazy=False, cache=None):
+    """ load data file into a dataFrame with the sniffed reader.
+        return LoadResult(df, readerName, reason, {readerName: skip reason}, memoryBytes, endOffset),
+        df is None if no reader could parse the file. endOffset is the bytes of a text file parsed
+        (up to the last line end when the load starts, a partly written last row is left out), where following it starts.
+        Raise LoadCancelled if isCancelled() turns True while reading.
+        - compact: shrink the dataFrame by CompactFrame
+        - lazy: only read the header and return a LazyFrame, if the reader can read by column
+        - cache: a file_cache.FileCache, unchanged files are memory mapped from it and
+                 freshly parsed (non-lazy) files are stored to it
+    """
+    variant = 'compact' if compact else ''
+    size = os.path.getsize(fn)
+    end = _CompleteLinesEnd(fn, size)
+    if cache is not None:
+        df = cache.load(fn, variant)
+        if df is not None: # unchanged, so all of the file was parsed
+            if progressFunc:
+                progressFunc(size, size, len(df))
+            return LoadResult(df, 'cache', 'unchanged since cached, memory mapped', OrderedDict(), FrameMemory(df),
+                              end)
+    candidates, skipped = SniffReaders(fn)
+    for reader, reason in candidates:
+        if lazy and reader.canReadColumns():
+            try:
+                rawNames = reader.readHeader(fn)
+            except Exception as e:
+                skipped[reader.name] = 'failed reading header (%s): %s' % (reason, e)
+                continue
+            return LoadResult(LazyFrame(fn, reader, rawNames, compact=compact), reader.name,
+                              reason + ', lazy', skipped, 0)
+        try:
+            df = reader.read(fn, progressFunc=progressFunc, isCancelled=isCancelled, nbytes=end)
+        except LoadCancelled:
+            raise
+        except Exception as e:
+            skipped[reader.name] = 'failed (%s): %s' % (reason, e)
+            continue
+        if isinstance(df, pd.Series):
+            df = df.to_frame()
+        if not isinstance(df, pd.DataFrame):
+            skipped[reader.name] = 'not a DataFrame (%s)' % type(df).__name__
+            continue
+        df = NormalizeFrame(df)
+        if compact:
+            df = CompactFrame(df)
+        if cache is not None:
+            cache.store(fn, df, variant)
+        return LoadResult(df, reader.name, reason, skipped, FrameMemory(df), end if reader.chunked else None)
+    return LoadResult(None, None, None, skipped, 0)
+
+
+###############################################################################
+# export
+
+def _WriteHdf(df, fn):
+    df.to_hdf(fn, key='data', mode='w', format='table', index=False)
+
+
+WRITERS = OrderedDict([ # extension => (format name, writer(df, fn))
+    ('.csv',     ('CSV', lambda df, fn: df.to_csv(fn, index=False))),
+    ('.tsv',     ('TSV', lambda df, fn: df.to_csv(fn, index=False, sep='\t'))),
+    ('.parquet', ('Parquet', lambda df, fn: df.to_parquet(fn, index=False))),
+    ('.feather', ('Feather', lambda df, fn: df.reset_index(drop=True).to_feather(fn))),
+    ('.h5',      ('HDF5', _WriteHdf)),
+    ('.pkl',     ('Pickle', lambda df, fn: df.to_pickle(fn))),
+    ('.xlsx',    ('Excel', lambda df, fn: df.to_excel(fn, index=False))),
+])
+
+
+def DataExportFilters():
+    """ file dialog filters of the writers """
+    return ';;'.join('%s (*%s)' % (name, ext) for ext, (name, _) in WRITERS.items())
+
+
+def SaveDataFrame(df, fn):
+    """ write the dataFrame in the format of the file extension """
+    ext = os.path.splitext(fn)[1].lower()
+    if ext not in WRITERS:
+        raise ValueError('unsupported export format %s (one of %s)' % (ext or '(none)', ', '.join(WRITERS)))
+    WRITERS[ext][1](df, fn)
+
+
+def DescribeSkipped(skipped):
+    return '; '.join('%s: %s' % (name, why) for name, why in skipped.items())
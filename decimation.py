@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: decimation.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Level-of-detail decimation of line data, sized to the canvas width in pixels.
+
+All functions return the (sorted) row positions to keep, so the caller can take
+the rows of any column it likes with them.
+"""
+import numpy as np
+
+
+SAMPLING_STRIDE = 'Stride'
+SAMPLING_MINMAX = 'MinMax'
+SAMPLING_LTTB   = 'LTTB'
+SAMPLING_MODES  = [SAMPLING_STRIDE, SAMPLING_MINMAX, SAMPLING_LTTB]
+
+
+def NumericView(arr):
+    """ view array as float64 for bucketing/area computing, return None if not numeric """
+    arr = np.asarray(arr)
+    if arr.dtype.kind in 'Mm': # datetime / timedelta
+        return arr.view('i8').astype(np.float64)
+    if arr.dtype.kind in 'biuf':
+        return arr.astype(np.float64, copy=False)
+    return None
+
+
+def IsSorted(x):
+    """ True if x is numeric and monotonic non-decreasing """
+    xv = NumericView(x)
+    if xv is None or len(xv) < 2:
+        return xv is not None
+    return bool(np.all(xv[1:] >= xv[:-1]))
+
+
+def BucketStarts(n, nBins, x=None):
+    """ start positions of the non-empty buckets.
+        Buckets are equal x-ranges if sorted x is given (one per pixel), else equal row counts.
+    """
+    if x is not None and n > 1:
+        edges = np.linspace(x[0], x[-1], nBins + 1)[:-1]
+        starts = np.searchsorted(x, edges, side='left')
+    else:
+        starts = (np.arange(nBins) * (n / nBins)).astype(np.int64)
+    return np.unique(starts)
+
+
+def _FirstMatchInBuckets(mask, starts):
+    """ position of the first True in each bucket, every bucket must hold one """
+    hits = np.flatnonzero(mask)
+    return hits[np.searchsorted(hits, starts)]
+
+
+def MinMaxIndex(y, nBins, x=None):
+    """ positions of the min & max of y in each bucket, plus both end points.
+        Extremes are kept exactly, output holds at most 2*nBins+2 points.
+        - x: sorted numeric x to make the buckets equal in x-range (pixel columns)
+    """
+    yv = NumericView(y)
+    n = len(y)
+    if yv is None or n <= 2 * nBins + 2:
+        return np.arange(n)
+    xv = NumericView(x) if x is not None else None
+    starts = BucketStarts(n, nBins, xv)
+    counts = np.diff(np.append(starts, n))
+
+    nans = np.isnan(yv)
+    if nans.any():
+        ylo, yhi = np.where(nans, np.inf, yv), np.where(nans, -np.inf, yv)
+    else:
+        ylo = yhi = yv
+    mins = np.minimum.reduceat(ylo, starts)
+    maxs = np.maximum.reduceat(yhi, starts)
+    imin = _FirstMatchInBuckets(ylo == np.repeat(mins, counts), starts)
+    imax = _FirstMatchInBuckets(yhi == np.repeat(maxs, counts), starts)
+    return np.unique(np.concatenate(([0, n - 1], imin, imax)))
+
+
+def LTTBIndex(y, nOut, x=None):
+    """ Largest-Triangle-Three-Buckets downsampling, the global min & max are always kept.
+        The bucket averages are computed at once, only the pick of each bucket stays sequential
+        as it is the anchor of the next bucket's triangles.
+        ref: Sveinn Steinarsson, Downsampling Time Series for Visual Representation, 2013
+    """
+    yv = NumericView(y)
+    n = len(y)
+    if yv is None or nOut < 3 or n <= nOut:
+        return np.arange(n)
+    xv = NumericView(x) if x is not None else None
+    if xv is None:
+        xv = np.arange(n, dtype=np.float64)
+    finite = np.isfinite(yv) & np.isfinite(xv)
+    allFinite = bool(finite.all())
+    yf = yv if allFinite else np.where(finite, yv, 0.0)
+    xf = xv if allFinite else np.where(finite, xv, 0.0)
+
+    # nOut-2 buckets between the fixed first & last points, the last point is a bucket of its own
+    edges = (np.arange(nOut - 1) * ((n - 2) / (nOut - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # average point of each bucket (non-finite points left out), of the last point if none is finite
+    counts = np.diff(np.append(edges, n)) if allFinite else np.add.reduceat(finite, edges, dtype=np.int64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avgx = np.where(counts > 0, np.add.reduceat(xf, edges) / counts, xv[n - 1])
+        avgy = np.where(counts > 0, np.add.reduceat(yf, edges) / counts, yf[n - 1])
+
+    idx = np.empty(nOut, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(nOut - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = xv[a], yf[a]
+        area = np.abs((ax - avgx[i + 1]) * (yf[lo:hi] - ay) - (ax - xv[lo:hi]) * (avgy[i + 1] - ay))
+        if not allFinite:
+            area[~finite[lo:hi]] = -1.0
+        a = lo + int(np.argmax(area))
+        idx[i + 1] = a
+
+    extremes = []
+    if finite.any():
+        extremes = [int(np.argmin(np.where(finite, yv, np.inf))), int(np.argmax(np.where(finite, yv, -np.inf)))]
+    return np.unique(np.concatenate((idx, extremes)))
+
+
+def DecimateIndex(x, y, nPixels, mode=SAMPLING_MINMAX):
+    """ row positions to plot y against x on a canvas nPixels wide.
+        x buckets follow pixel columns when x is sorted, else rows are bucketed evenly.
+    """
+    nPixels = max(int(nPixels), 2)
+    xs = x if x is not None and IsSorted(x) else None
+    if mode == SAMPLING_LTTB:
+        return LTTBIndex(y, 2 * nPixels, x=x if xs is not None else None)
+    return MinMaxIndex(y, nPixels, x=xs)
@@ -10,24 +10,38 @@ import os
 import sys
 import json
 import warnings
-import pandas as pd
-import matplotlib as plt
-import qdarkstyle
+import numpy as np
 from collections import OrderedDict, defaultdict
-from matplotlib import style, colors
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-from matplotlib.figure import Figure
 from PyQt5 import QtCore, QtWidgets, QtGui
 from PyQt5.QtCore import pyqtSlot
 
+# pandas, matplotlib & qdarkstyle are imported at first use (see startup.py),
+# so the window shows before the plotting stack is loaded
 import gui_base as gui
+from startup import MakeSplash, WarmUpTask
+from load_worker import LoadManager
+from column_index import ColumnIndex, ColumnAliases
+from file_cache import FileCache, DEFAULT_CACHE_DIR
+from log_follower import FileFollower, GrowingFrame
+from plot_model import PlotModel
+from profiler import PROFILER, ProcessRSS
+from plot_api import GetPlotThemeSyles, ApplyTheme, ThemeLineProps, PreparePlotData, DecorateAxes, MakeLegend, SetLegendTexts
+from plot_layout import AxesLayout, GroupSeries, LAYOUT_MODES, LAYOUT_SINGLE, LAYOUT_PER_FILE, LAYOUT_PER_COLUMN
+from redraw_scheduler import RedrawScheduler
+from blit_manager import BlitManager
+from fast_canvas import FastLineCanvas, CANVAS_BACKENDS, CANVAS_MATPLOTLIB, CANVAS_FAST
+from decimation import DecimateIndex, IsSorted, SAMPLING_MODES, SAMPLING_STRIDE, SAMPLING_MINMAX
 from yaxis_selector import DataFrameTree
+from theme_preview import ThemePreview
+from session import SaveSession, LoadSession, PendingRestore, FileStamp
+from figure_export import FigureSnapshot, ExportTask, ExportFilters, StartExport
 
 __appname__ = 'EzPlot'
 __version__ = "3.0.1802"
 __author__  = 'RayN'
 __config__ = os.path.join(os.path.dirname(__file__), 'config.json')
+__session__ = os.path.join(os.path.dirname(__file__), 'session.json') # last session, restored on startup
+FOLLOW_LINE_POINTS = 8 # points per pixel a followed decimated line may gather before it is decimated again
 
 
 '''
@@ -36,13 +50,10 @@ TODO:
 '''
 
 
-def GetPlotThemeSyles():
-    return ['default', 'classic'] + sorted(
-        style for style in plt.style.available if style != 'classic')
-        
-
 class EzPlot(QtWidgets.QMainWindow):
     
+    signal_ready = QtCore.pyqtSignal() # figure panel is built, plotting stack loaded
+    
     # default config
     config = {
         'WindowSize' : (1200, 800),
@@ -51,10 +62,25 @@ class EzPlot(QtWidgets.QMainWindow):
         'Style' : 'default',
         'FigWidth' : 5, 'FigHeight' : 4, 'FigAlpha' : 1.0,
         'FlagClear' : True, 'FlagGrid' : True, 'FlagLegend' : True,
+        'FlagCompact' : False, 'FlagLazy' : False,
+        'LazyCacheMB' : 1024, # columns kept of a lazy file, row ranges of the dropped ones are read on zoom
         'FontSize' : 11,
+        'Sampling' : SAMPLING_STRIDE,
+        'Layout' : LAYOUT_SINGLE, # one subplot for all, per file or per column
+        'Canvas' : CANVAS_MATPLOTLIB, # interactive view, export always goes through matplotlib
+        'RedrawInterval' : 16, # ms, redraw requests within are merged into one
+        'FlagCache' : True, 'CacheDir' : DEFAULT_CACHE_DIR, 'CacheSizeMB' : 4096,
+        'FollowInterval' : 1000, # ms, poll interval of followed files
+        'FollowWindowRows' : 0, # keep only the last n rows of followed files, 0 to keep all
+        'FlagProfile' : False, # time load & redraw stages, breakdown in the status bar
+        'FlagRestoreSession' : True, # reopen the files & figure of the last session on startup
+        'ExportDPI' : 300, # exported figures, also the resolution of their rasterized dense lines
     }
     
-    def __init__(self, config:dict=None):
+    def __init__(self, config:dict=None, deferPlotting=False):
+        """ - deferPlotting: build the figure panel after the window is shown, 
+                               with the plotting stack imported in the background
+        """
         super(EzPlot, self).__init__()
         if config:
             self.config.update(config)
@@ -65,11 +91,41 @@ class EzPlot(QtWidgets.QMainWindow):
         self.center()
         
         self.dataframes = OrderedDict() # fn => df
+        self.sorted_x = {} # (fn, xName) => x array if sorted numeric else None
+        self.column_index = ColumnIndex() # column name => files holding it
+        self.column_aliases = ColumnAliases() # displayed => stored column names, renames never touch the frames
+        self.plot_model = PlotModel() # (fn, yName) => plotted Line2D
+        self.followers = {} # fn => FileFollower
+        self.followed_rows = {} # fn => GrowingFrame of a followed file, the dataFrame is a view on it
+        self.parsed_bytes = {} # fn => bytes of the text file loaded, following starts there
+        self.plot_scheduler = RedrawScheduler(self.plot, interval=self.config['RedrawInterval'], parent=self)
+        self.zoom_scheduler = RedrawScheduler(self.redecimateVisible, interval=self.config['RedrawInterval'], parent=self)
+        self._xlim_cids = [] # (axes, cid) of the xlim_changed callbacks
+        self._spacing_key = None # subplots & texts the grid spacing was fitted to
+        self._decoration_key = None # inputs of the subplot decorations last applied
+        self._load_started = {} # fn => perf_counter time of loadFile, while profiling
+        self.load_options = {} # fn => (compact, lazy) it was loaded with
+        self._restore = None # PendingRestore of the session whose files are loading
+        self._export = None # running ExportTask
+        self.loader = LoadManager(self)
+        self.file_cache = FileCache(self.config['CacheDir'], maxBytes=self.config['CacheSizeMB'] * 2**20)
+        if self.config['FlagCache']:
+            self.loader.cache = self.file_cache
+        self.loader.signal_loaded.connect(self.onFileLoaded)
+        self.loader.signal_load_failed.connect(self.onFileLoadFailed)
+        self.loader.signal_progress.connect(self.onLoadProgress)
+        self.loader.signal_idle.connect(self.onLoadIdle)
         
+        self.fig = None # no figure panel until the plotting stack is loaded
+        self._warm_up = None
         self.createMenu()
         self.createLoaderPanel()
-        self.createFigurePanel()
-        self.applyPlotStyle()
+        if deferPlotting:
+            self.panel_figure = QtWidgets.QLabel('Loading plotting libraries...')
+            self.panel_figure.setAlignment(QtCore.Qt.AlignCenter)
+            QtCore.QTimer.singleShot(0, self.warmUp)
+        else:
+            self.createPlottingPanel()
 
         self.main_frame = QtWidgets.QSplitter(QtCore.Qt.Horizontal)
         self.main_frame.addWidget(self.panel_loader)
@@ -86,10 +142,30 @@ class EzPlot(QtWidgets.QMainWindow):
         
         status = self.statusBar()
         status.setSizeGripEnabled(True)
+        self.pbar_load = gui.MakeProgressBar(maxWidth=200, maxHeight=16)
+        self.button_cancel_load = gui.MakePushButton('Cancel', clickFunc=self.cancelLoading, 
+                                                     tooltip='cancel loading', maxHeight=20)
+        self.label_profile = QtWidgets.QLabel()
+        self.pbar_export = gui.MakeProgressBar(maxWidth=120, maxHeight=16)
+        self.pbar_export.setFormat('export %p%')
+        self.pbar_export.setVisible(False)
+        status.addPermanentWidget(self.label_profile)
+        status.addPermanentWidget(self.pbar_export)
+        status.addPermanentWidget(self.pbar_load)
+        status.addPermanentWidget(self.button_cancel_load)
+        self.onLoadIdle()
+        self.action_profile.setChecked(self.config['FlagProfile'])
+        self.action_restore_session.setChecked(self.config['FlagRestoreSession'])
+        self.setProfiling(self.config['FlagProfile'])
         status.showMessage("Ready", 5000)
     
     
     def saveConfig(self, fn):
+        self.config['FlagProfile'] = self.action_profile.isChecked()
+        self.config['FlagRestoreSession'] = self.action_restore_session.isChecked()
+        if self.fig is None: # closed before the figure panel was built
+            json.dump(self.config, open(fn,'w'), indent=4)
+            return
         self.config.update({
             # 'WindowSize'    : (self.frameGeometry().width(), self.frameGeometry().height()),
             'SplitterState' : str(self.main_frame.saveState().toHex(), encoding='ascii'),
@@ -101,7 +177,12 @@ class EzPlot(QtWidgets.QMainWindow):
             'FlagClear'     : self.chkbox_clear.isChecked(), 
             'FlagGrid'      : self.chkbox_grid.isChecked(), 
             'FlagLegend'    : self.chkbox_legend.isChecked(),
+            'FlagCompact'   : self.chkbox_compact.isChecked(),
+            'FlagLazy'      : self.chkbox_lazy.isChecked(),
             'FontSize'      : self.editor_fontsz.getValue(),
+            'Sampling'      : self.combo_sampling.getValue(),
+            'Layout'        : self.combo_layout.getValue(),
+            'Canvas'        : self.combo_canvas.getValue(),
         })
         json.dump(self.config, open(fn,'w'), indent=4)
         
@@ -114,6 +195,8 @@ class EzPlot(QtWidgets.QMainWindow):
     
         if reply == QtWidgets.QMessageBox.Yes:
             self.saveConfig(__config__)
+            if self.config['FlagRestoreSession']:
+                self.saveSession(__session__)
             event.accept()
         else:
             event.ignore()
@@ -121,14 +204,17 @@ class EzPlot(QtWidgets.QMainWindow):
             
     def showEvent(self, event):
         # update fig size text when show
+        if self.fig is None:
+            return
         fsize = self.fig.get_size_inches()
         self.setEditorFigureSize(fsize[0], fsize[1])
     
     
     def resizeEvent(self, event):
         # update fig size text when resized
-        fsize = self.fig.get_size_inches()
-        self.setEditorFigureSize(fsize[0], fsize[1])
+        if self.fig is not None:
+            fsize = self.fig.get_size_inches()
+            self.setEditorFigureSize(fsize[0], fsize[1])
         wsize = self.frameSize()
         self.config['WindowSize'] = (wsize.width(), wsize.height())
     
@@ -146,15 +232,24 @@ class EzPlot(QtWidgets.QMainWindow):
         self.editor_datafile = gui.File(label="Data", default=None,
                                         dlgDir=os.path.dirname(self.config['DataFile']),
                                         minWidth=120, callbackFunc=self.loadFile)
-        self.editor_x_axis = gui.ComboBox(textList=[], label='X Axis', connectFunc=self.plot)
+        self.chkbox_compact = gui.CheckBox(default=self.config['FlagCompact'], label='Compact',
+                                           tooltip='load compactly: downcast numbers, categorize repeated strings\n'
+                                                   'and drop the columns that can not be plotted')
+        self.chkbox_lazy = gui.CheckBox(default=self.config['FlagLazy'], label='Lazy',
+                                        tooltip='only read the header when loading,\n'
+                                                'a column is read the first time it is plotted (CSV, Parquet, Feather, HDF5)')
+        self.editor_x_axis = gui.ComboBox(textList=[], label='X Axis', connectFunc=self.plot_scheduler.request)
 
 
         self.editor_y_axis = DataFrameTree(parent=self,label='Y Axis')
-        self.editor_y_axis.itemSelectionChanged.connect(self.plot)
+        self.editor_y_axis.itemSelectionChanged.connect(self.plot_scheduler.request)
         self.editor_y_axis.signal_column_renamed.connect(self.onColumnRenamed)
-        self.editor_y_axis.signal_active_style_changed.connect(self.plot)
+        self.editor_y_axis.signal_active_style_changed.connect(self.onColumnStyleChanged)
         self.editor_y_axis.signal_dataframe_deleted.connect(self.onDataFrameDeleted)
         self.editor_y_axis.signal_dataframe_reload.connect(self.onDataFrameReload)
+        self.editor_y_axis.signal_dataframe_export.connect(self.onDataFrameExport)
+        self.editor_y_axis.signal_dataframe_follow.connect(self.onDataFrameFollow)
+        self.editor_y_axis.signal_follow_settings.connect(self.dialogFollowSettings)
         
         self.editor_ytitle = gui.Text(default=None, label='Y Title')     
         self.editor_xtitle = gui.Text(default=None, label='X Title')        
@@ -166,13 +261,14 @@ class EzPlot(QtWidgets.QMainWindow):
         grid.setSpacing(10)
         grid.addWidget(self.editor_datafile.labelText, 1, 0)
         grid.addWidget(self.editor_datafile.text, 1, 1)
-        grid.addWidget(self.editor_datafile.button, 1, 2)
+        grid.addLayout(gui.MakeHBoxLayout([self.editor_datafile.button, self.chkbox_compact, self.chkbox_lazy]), 1, 2)
 
         grid.addWidget(self.editor_x_axis.labelText, 2, 0)
         grid.addWidget(self.editor_x_axis, 2, 1, 1, 2)
 
         grid.addWidget(self.editor_y_axis.labelText, 3, 0)
-        grid.addWidget(self.editor_y_axis, 3, 1, 4, 2)
+        grid.addWidget(self.editor_y_axis.editor_filter, 3, 1, 1, 2)
+        grid.addWidget(self.editor_y_axis, 4, 1, 3, 2)
         
         grid.addWidget(self.editor_xtitle.labelText, 7, 0)
         grid.addWidget(self.editor_xtitle, 7, 1, 1, 2)
@@ -185,33 +281,40 @@ class EzPlot(QtWidgets.QMainWindow):
         self.panel_loader.setLayout(grid)
     
     
-    def updateXAxisNames(self, colNames=None):
-        """update the common x-axis names for editor_x_axis, keep currently selected if possible"""
-        if colNames is None: # update to current df if given None
-            ndf = len(self.dataframes)
-            if ndf>1:
-                commonNames = set.intersection(*[set(df.columns) for df in self.dataframes.values()])
-            elif ndf==1:
-                commonNames = [df.columns.tolist() for df in self.dataframes.values()][0]
-            else: # <1
-                commonNames = []
-            self.updateXAxisNames(commonNames)
-        else:  
-            if colNames: # non-empty
-                xSelected = self.editor_x_axis.getValue()
-                if xSelected not in colNames:
-                    xSelected = None
-                self.editor_x_axis.resetItems(list(colNames), default=xSelected)
-            else:
-                self.editor_x_axis.resetItems([])
+    def updateXAxisNames(self):
+        """update the x-axis names of editor_x_axis from the column index, keep currently selected if possible.
+           Columns of all files come first, then the columns shared by some files (only those files are plotted).
+        """
+        index = self.column_index
+        names = index.common()
+        texts = list(names)
+        for name, count in index.shared(minFiles=2):
+            names.append(name)
+            texts.append('%s  (%d/%d files)' % (name, count, len(index)))
+        self.editor_x_axis.updateItems(texts, names)
+    
+    
+    def dropFrameCaches(self, fn):
+        """ forget cached per-file data derived from the dataFrame """
+        self.sorted_x = {k:v for k,v in self.sorted_x.items() if k[0]!=fn}
     
     
     @pyqtSlot(tuple) #  (fn, oldName, newName) 
     def onColumnRenamed(self, names:tuple):
         fn, oldName, newName = names
-        df = self.dataframes[fn] 
-        # rename df columns
-        df.rename(columns={oldName:newName}, inplace=True)
+        self.dropFrameCaches(fn)
+        if self.plot_model.data_key and self.plot_model.data_key[0]==oldName:
+            self.plot_model.removeFile(fn) # x column of the plotted lines is renamed
+        self.plot_model.renameSeries(fn, oldName, newName)
+        # only the displayed name changes, the frame is renamed on export
+        self.column_aliases.rename(fn, oldName, newName)
+        self.column_index.renameColumn(fn, oldName, newName)
+        if (fn, newName) in self.plot_model and self.fig is not None: # new label in the legend
+            if self.combo_layout.getValue() == LAYOUT_PER_COLUMN:
+                self.plot_scheduler.request() # the column's series go to the subplot of its new name
+            else:
+                self.refreshLegend()
+                self.refreshArtists()
         # update x-axis to current common names
         # commonNames = set.intersection(*[set(df.columns) for df in self.dataframes.values()])
         self.updateXAxisNames()
@@ -219,54 +322,475 @@ class EzPlot(QtWidgets.QMainWindow):
     @pyqtSlot(str) # fn
     def onDataFrameDeleted(self, fn:str):
         if fn in self.dataframes:
+            self.stopFollowing(fn)
             del self.dataframes[fn]
+            self.parsed_bytes.pop(fn, None)
+            self.column_index.removeFile(fn)
+            self.column_aliases.removeFile(fn)
+            self.dropFrameCaches(fn)
+            self.plot_model.removeFile(fn)
+            if self.fig is not None and len(self.axes_layout) > 1:
+                self.plot_scheduler.request() # drop the subplots left empty
+            self.refreshCanvas()
             # update x-axis to current common names
             self.updateXAxisNames()
     
     @pyqtSlot(str) # fn
     def onDataFrameReload(self, fn:str):
+        self.stopFollowing(fn) # read offset is no longer valid
         self.loadFile(fn)
     
     
-    def loadFile(self, fn:str=None):
-        """ load data into dataFrame """
+    @pyqtSlot(str) # fn
+    def onDataFrameExport(self, fn:str):
+        """ write the data of a file with its renamed columns, without the row number column added on load """
+        from data_loader import FrameColumns, SaveDataFrame, DataExportFilters
+        frame = self.dataframes.get(fn)
+        if frame is None:
+            return
+        out, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Export data', os.path.splitext(fn)[0] + '_export.csv',
+                                                       DataExportFilters())
+        if not out:
+            return
+        names = list(frame.columns[1:])
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        try:
+            df = FrameColumns(frame, names)[names].rename(columns=self.column_aliases.renames(fn))
+            SaveDataFrame(df, out)
+        except Exception as e:
+            self.statusBar().showMessage('Export failed! %s' % e, 8000)
+        else:
+            self.statusBar().showMessage('Exported %d rows x %d columns to %s' % (len(df), len(names), out), 5000)
+        finally:
+            QtWidgets.QApplication.restoreOverrideCursor()
+    
+    
+    @pyqtSlot(str, bool) # (fn, on/off)
+    def onDataFrameFollow(self, fn:str, on:bool):
+        """ start/stop following the rows appended to a text data file """
+        if not on:
+            self.stopFollowing(fn)
+            return
+        from data_loader import LazyFrame, SniffReaders
+        df = self.dataframes.get(fn)
+        candidates, _ = SniffReaders(fn)
+        reader = candidates[0][0] if candidates else None
+        if df is None or isinstance(df, LazyFrame) or reader is None or not reader.canReadColumns() \
+                or reader.name not in ('csv', 'table'):
+            self.editor_y_axis.setFollowing(fn, False)
+            self.statusBar().showMessage('Follow is only supported for fully loaded CSV/TSV files', 5000)
+            return
+        offset = self.parsed_bytes.get(fn)
+        if offset is None:
+            self.editor_y_axis.setFollowing(fn, False)
+            self.statusBar().showMessage('Follow needs the file reloaded as text: %s' % fn, 5000)
+            return
+        names = [str(c).strip() for c in reader.readHeader(fn)]
+        if len(df.columns) == len(names) + 1: # same layout as file (+ index column), use the frame's names
+            names = df.columns[1:].tolist()
+        follower = FileFollower(fn, names, offset, self.loader, interval=self.config['FollowInterval'],
+                                sep=reader.kwargs.get('sep', ','), parent=self)
+        rows = GrowingFrame(df, window=self.config['FollowWindowRows'])
+        self.followed_rows[fn] = rows
+        self.dataframes[fn] = rows.frame()
+        follower.signal_appended.connect(self.onRowsAppended)
+        follower.signal_truncated.connect(self.onFollowTruncated)
+        follower.signal_failed.connect(self.onFollowFailed)
+        self.followers[fn] = follower
+        self.editor_y_axis.setFollowing(fn, True)
+        follower.start()
+    
+    
+    def stopFollowing(self, fn):
+        follower = self.followers.pop(fn, None)
+        self.followed_rows.pop(fn, None)
+        if follower is not None:
+            self.parsed_bytes[fn] = follower.offset # following again goes on from there
+            follower.stop()
+            follower.deleteLater()
+        self.editor_y_axis.setFollowing(fn, False)
+    
+    
+    @pyqtSlot(str)
+    def onFollowTruncated(self, fn):
+        self.stopFollowing(fn)
+        self.statusBar().showMessage('File got shorter, stop following: %s' % fn, 8000)
+    
+    
+    @pyqtSlot(str, str)
+    def onFollowFailed(self, fn, msg):
+        self.stopFollowing(fn)
+        self.statusBar().showMessage('Read appended rows failed, stop following: %s' % msg, 8000)
+    
+    
+    @pyqtSlot(str, object) # (fn, DataFrame of appended rows)
+    def onRowsAppended(self, fn, rows):
+        """ append the new rows to the followed frame and extend its plotted lines,
+            the cost is of the new rows, not of the whole frame
+        """
+        followed = self.followed_rows.get(fn)
+        if followed is None or fn not in self.dataframes:
+            return
+        idxName = followed.columns[0] # row number column added by reset_index()
+        start = int(followed.last(idxName)) + 1 if len(followed) else 0
+        rows.insert(0, idxName, np.arange(start, start + len(rows)))
+        followed.window = self.config['FollowWindowRows'] # rolling window
+        dropped = followed.append(rows)
+        self.dataframes[fn] = followed.frame()
+        if dropped:
+            self.dropFrameCaches(fn)
+        else:
+            self.extendSortedX(fn, len(rows))
+        self.extendFileLines(fn, len(rows), dropped)
+    
+    
+    def extendSortedX(self, fn, nNew):
+        """ keep the sorted x of fn valid after nNew rows were appended, only the new rows are checked """
+        for key, x in list(self.sorted_x.items()):
+            if key[0] != fn or x is None:
+                continue
+            x = self.dataframes[fn][self.column_aliases.source(fn, key[1])].to_numpy()
+            tail = x[max(len(x) - nNew - 1, 0):] # new rows & the last old one
+            self.sorted_x[key] = x if x.dtype.kind in 'biuf' and IsSorted(tail) else None
+    
+    
+    def extendFileLines(self, fn, nNew, dropped=0):
+        """ extend the plotted lines of fn by the nNew appended rows, without a full plot().
+            Strided lines are views on the grown columns, decimated lines get only the new rows
+            decimated and merged (decimated again once they gather too many points).
+            If rows were dropped by the rolling window, the lines are decimated anew from the window.
+        """
+        model = self.plot_model
+        keys = [k for k in model.lines if k[0]==fn]
+        if not keys or not model.data_key:
+            return
+        from data_loader import FrameColumns
+        xName, sampling, rowSkip = model.data_key
+        source = self.column_aliases.source
+        df = FrameColumns(self.dataframes[fn], [source(fn, xName)] + [source(fn, y) for _, y in keys])
+        x = df[source(fn, xName)].to_numpy()
+        n0 = len(x) - nNew # rows before the append
+        relimAxes = set() # axes whose data limits are computed anew from all their lines
+        for key in keys:
+            line = model.lines[key]
+            y = df[source(fn, key[1])].to_numpy()
+            if dropped or n0 <= 0 or x.dtype.kind not in 'biuf' or y.dtype.kind not in 'biuf':
+                relimAxes.add(line.axes)
+            else: # the limits only grow by the new rows
+                line.axes.update_datalim(np.column_stack([x[n0:], y[n0:]]))
+            nPixels = int(line.axes.bbox.width)
+            if sampling == SAMPLING_STRIDE:
+                step = max(rowSkip, 1)
+                line.set_data(x[::step], y[::step])
+            elif dropped or n0 <= 0:
+                idx = DecimateIndex(x, y, nPixels, mode=sampling)
+                line.set_data(x[idx], y[idx])
+            else: # the new rows get their share of the pixels
+                idx = DecimateIndex(x[n0:], y[n0:], nPixels * nNew // len(x), mode=sampling)
+                lx = np.concatenate([np.asarray(line.get_xdata()), x[n0:][idx]])
+                ly = np.concatenate([np.asarray(line.get_ydata()), y[n0:][idx]])
+                if len(lx) > FOLLOW_LINE_POINTS * nPixels:
+                    idx = DecimateIndex(lx, ly, nPixels, mode=sampling)
+                    lx, ly = lx[idx], ly[idx]
+                line.set_data(lx, ly)
+        for ax in {model.lines[key].axes for key in keys}:
+            if ax in relimAxes:
+                ax.relim()
+            ax.autoscale_view() # only moves if the user has not zoomed in
+        self.refreshCanvas()
+    
+    
+    def dialogFollowSettings(self):
+        interval, ok = QtWidgets.QInputDialog.getInt(self, 'Follow Settings', 'Refresh interval (ms):',
+                                                     self.config['FollowInterval'], 50, 3600000, 100)
+        if not ok:
+            return
+        window, ok = QtWidgets.QInputDialog.getInt(self, 'Follow Settings', 
+                                                   'Rolling window, keep last n rows (0 keeps all):',
+                                                   self.config['FollowWindowRows'], 0, 2**31-1, 1000)
+        if not ok:
+            return
+        self.config['FollowInterval'], self.config['FollowWindowRows'] = interval, window
+        for follower in self.followers.values():
+            follower.setInterval(interval)
+    
+    
+    def loadFile(self, fn:str=None, compact=None, lazy=None):
+        """ load data into dataFrame in background, the dfTree node is added when loaded
+            - compact, lazy: load options, those of the check boxes by default
+        """
         if fn is None:
             fn = os.path.abspath(self.editor_datafile.getValue())
         if os.path.isfile(fn):
-            df = None
-            tryFuncs = (pd.read_csv, pd.read_excel, pd.read_pickle, pd.read_table)
-            tryFuncArgvs = [
-                {'index_col': False }, # read_csv
-                {}, # read_excel
-                {}, # read_pickle
-                {} # read_table
-            ]
-            for readfunc, argDict in zip(tryFuncs, tryFuncArgvs):
-                try:
-                    df = readfunc(fn, **argDict)
-                    break 
-                except:
-                    pass
-            
-            if df is None or df.empty:
-                self.statusBar().showMessage('Read data file failed! (supported formats: CSV, Pickle, Excel)', 8000)
-            else:
-                df.reset_index(level=None, inplace=True) # in case the header column does not math data column number
-                df.columns = df.columns.str.strip() # strip column names
-                # print(df)
-                self.dataframes[fn] = df
-                colNames = df.columns.tolist()
-                # update y-axis dfTree
-                self.editor_y_axis.addDataFrame(datafn=fn, columns=colNames)
-                # update x-axis common columns
-                self.updateXAxisNames()        
-                self.statusBar().showMessage('Data loaded successfully.', 5000)
+            if PROFILER.enabled:
+                self._load_started[fn] = PROFILER.now()
+            compact = self.chkbox_compact.isChecked() if compact is None else compact
+            lazy = self.chkbox_lazy.isChecked() if lazy is None else lazy
+            self.load_options[fn] = (compact, lazy)
+            self.loader.load(fn, compact=compact, lazy=lazy)
         else:
             self.statusBar().showMessage('File does not exist', 5000)
+    
+    
+    def openFiles(self):
+        """ select and load multiple files in parallel """
+        fns, _ = QtWidgets.QFileDialog.getOpenFileNames(self, 'Select data files', 
+                                                        os.path.dirname(self.config['DataFile']), '(*.*)')
+        for fn in fns:
+            self.loadFile(os.path.abspath(fn))
+        if fns:
+            self.editor_datafile.setValue(os.path.abspath(fns[-1]))
+    
+    
+    @pyqtSlot(str, object) # (fn, LoadResult)
+    def onFileLoaded(self, fn:str, result):
+        from data_loader import DescribeSkipped, FormatSize, LazyFrame, READERS
+        df = result.df
+        status = self.statusBar()
+        status.setToolTip(DescribeSkipped(result.skipped))
+        if df is None or df.empty:
+            status.showMessage('Read data file failed! (supported formats: %s)' % ', '.join(READERS), 8000)
+            if self._restore is not None:
+                self._restore.fileDone(fn, ok=False)
+            return
+        started = self._load_started.pop(fn, None)
+        with PROFILER.frame('load', start=started, file=os.path.basename(fn)):
+            if started is not None:
+                PROFILER.addTime('read', PROFILER.now() - started) # in the pool thread, incl. queueing
+            self.stopFollowing(fn)
+            self.dataframes[fn] = df
+            self.parsed_bytes[fn] = result.end_offset
+            self.dropFrameCaches(fn)
+            self.plot_model.removeFile(fn) # stale lines of the reloaded file
+            self.column_aliases.removeFile(fn) # the tree shows the names of the reloaded file
+            colNames = df.columns.tolist()
+            self.column_index.addFile(fn, colNames)
+            # update y-axis dfTree
+            with PROFILER.span('tree'):
+                dfnode = self.editor_y_axis.addDataFrame(datafn=fn, columns=colNames)
+            if isinstance(df, LazyFrame):
+                df.cache_limit = self.config['LazyCacheMB'] * 2**20
+                dfnode.setInfo('%d columns, lazy: columns are read on first plot' % len(colNames))
+            else:
+                dfnode.setInfo('%d rows x %d columns, memory: %s%s' % (len(df), len(colNames), FormatSize(result.nbytes),
+                                                                        ' (mapped from cache)' if result.reader=='cache' else ''))
+            # update x-axis common columns
+            with PROFILER.span('xnames'):
+                self.updateXAxisNames()        
+        status.showMessage('Data loaded successfully. (reader: %s, %s)' % (result.reader, result.reason), 5000)
+        self.showProfile()
+        if self._restore is not None:
+            self._restore.fileDone(fn)
+    
+    @pyqtSlot(str, str) # (fn, message)
+    def onFileLoadFailed(self, fn:str, msg:str):
+        self._load_started.pop(fn, None)
+        self.statusBar().showMessage('Read data file failed! %s' % msg, 8000)
+        if self._restore is not None:
+            self._restore.fileDone(fn, ok=False)
+    
+    @pyqtSlot(int, 'qint64', 'qint64', 'qint64') # (nFiles, bytesRead, totalBytes, rowsParsed)
+    def onLoadProgress(self, nFiles, bytesRead, totalBytes, rowsParsed):
+        if nFiles:
+            self.pbar_load.setVisible(True)
+            self.button_cancel_load.setVisible(True)
+            self.pbar_load.setMaximum(1000)
+            self.pbar_load.setValue(int(1000 * bytesRead / totalBytes) if totalBytes else 0)
+            self.statusBar().showMessage('Loading %d file(s): %.1f / %.1f MB, %d rows parsed' % (
+                nFiles, bytesRead / 2**20, totalBytes / 2**20, rowsParsed))
+    
+    def clearFileCache(self):
+        self.file_cache.clear()
+        self.statusBar().showMessage('File cache cleared', 5000)
+    
+    def cancelLoading(self):
+        self.loader.cancelAll()
+        self.statusBar().showMessage('Loading cancelled', 5000)
+    
+    @pyqtSlot()
+    def onLoadIdle(self):
+        self.pbar_load.setVisible(False)
+        self.button_cancel_load.setVisible(False)
+        self.pbar_load.reset()
+        if self._restore is not None:
+            self._restore.dropWaiting() # cancelled loads
+            if self.fig is not None: # else applied once the figure panel is built
+                self.applySession()
 
     
+    def sessionState(self):
+        """ the loaded files, their renames, styles & selected columns and the figure settings """
+        selected = self.editor_y_axis.getSelectedColumns()
+        files = []
+        for fn, dfnode in self.editor_y_axis.df_nodes.items(): # tree order is the plotting order
+            if fn not in self.dataframes:
+                continue
+            compact, lazy = self.load_options.get(fn, (False, False))
+            files.append({
+                'path'      : fn,
+                'stamp'     : FileStamp(fn),
+                'compact'   : compact,
+                'lazy'      : lazy,
+                'renames'   : self.column_aliases.renames(fn), # stored => displayed name
+                'styles'    : {col.column_name: col.style.toDict() for col in dfnode.column_nodes if col.style},
+                'selected'  : [col.column_name for col in selected.get(fn, [])],
+                'following' : fn in self.followers,
+            })
+        state = {'files': files, 'x': self.editor_x_axis.getValue()}
+        if self.fig is not None:
+            state['figure'] = {
+                'Style'     : self.combo_style.getValue(),
+                'FigWidth'  : self.editor_fig_width.getValue(),
+                'FigHeight' : self.editor_fig_height.getValue(),
+                'FigAlpha'  : self.editor_fig_alpha.getValue(),
+                'FlagClear' : self.chkbox_clear.isChecked(),
+                'FlagGrid'  : self.chkbox_grid.isChecked(),
+                'FlagLegend': self.chkbox_legend.isChecked(),
+                'FontSize'  : self.editor_fontsz.getValue(),
+                'Sampling'  : self.combo_sampling.getValue(),
+                'DataSkip'  : self.editor_skip.getValue(),
+                'Canvas'    : self.combo_canvas.getValue(),
+                'XTitle'    : self.editor_xtitle.getValue(),
+                'YTitle'    : self.editor_ytitle.getValue(),
+                'Legend'    : self.editor_legend.getValue(),
+                'Layout'    : self.combo_layout.getValue(),
+                # zoomed view, None while autoscaled (y per subplot, then per secondary y axis)
+                'XLim'      : None if self.axes.get_autoscalex_on() else list(self.axes.get_xlim()),
+                'YLims'     : [None if ax.get_autoscaley_on() else list(ax.get_ylim()) for ax in self.axes_layout.allAxes()],
+            }
+        return state
+    
+    
+    def saveSession(self, fn=None):
+        if not fn:
+            fn, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Save session', os.path.dirname(self.config['DataFile']),
+                                                          'Session files (*.json)')
+            if not fn:
+                return
+        try:
+            SaveSession(fn, self.sessionState())
+        except (OSError, TypeError, ValueError) as e:
+            self.statusBar().showMessage('Save session failed! %s' % e, 8000)
+        else:
+            self.statusBar().showMessage('Session saved to %s' % fn, 5000)
+    
+    
+    def openSession(self, fn=None):
+        """ close the loaded files, reopen those of the session, then restore its selection & figure """
+        if not fn:
+            fn, _ = QtWidgets.QFileDialog.getOpenFileName(self, 'Open session', os.path.dirname(self.config['DataFile']),
+                                                          'Session files (*.json)')
+            if not fn:
+                return
+        try:
+            state = LoadSession(fn)
+        except (OSError, ValueError) as e:
+            self.statusBar().showMessage('Open session failed! %s' % e, 8000)
+            return
+        for loaded in list(self.dataframes):
+            self.editor_y_axis.removeDataFrame(loaded)
+            self.onDataFrameDeleted(loaded)
+        restore = PendingRestore(state)
+        self._restore = restore
+        for path, entry in restore.start():
+            self.editor_y_axis.addDataFrame(path, []).setInfo('loading...') # keeps the session order of files
+            self.loadFile(path, compact=entry.get('compact', False), lazy=entry.get('lazy', False))
+        if restore.isDone() and self.fig is not None: # nothing to load
+            self.applySession()
+    
+    
+    def applySession(self):
+        """ apply the renames, styles, selection & figure of the restored session to the loaded files """
+        from plot_api import UserDefinedStyle
+        restore, self._restore = self._restore, None
+        tree = self.editor_y_axis
+        for fn, entry in restore.files.items():
+            if fn not in self.dataframes:
+                tree.removeDataFrame(fn) # placeholder of a failed load
+                continue
+            restore.renamesRefused(fn, tree.renameColumns(fn, entry.get('renames', {})))
+            for name, sty in entry.get('styles', {}).items():
+                tree.setColumnStyle(fn, name, UserDefinedStyle.fromDict(sty))
+            if entry.get('following'):
+                self.onDataFrameFollow(fn, True)
+        
+        figure = restore.state.get('figure') or {}
+        for key, editor in (('Style', self.combo_style), ('FigWidth', self.editor_fig_width),
+                            ('FigHeight', self.editor_fig_height), ('FigAlpha', self.editor_fig_alpha),
+                            ('FlagClear', self.chkbox_clear), ('FlagGrid', self.chkbox_grid),
+                            ('FlagLegend', self.chkbox_legend), ('FontSize', self.editor_fontsz),
+                            ('Sampling', self.combo_sampling), ('DataSkip', self.editor_skip),
+                            ('Canvas', self.combo_canvas), ('XTitle', self.editor_xtitle),
+                            ('YTitle', self.editor_ytitle), ('Legend', self.editor_legend),
+                            ('Layout', self.combo_layout)):
+            value = figure.get(key)
+            if value is None or (isinstance(editor, gui.ComboBox) and value not in editor.valueList):
+                continue
+            editor.setValue(value)
+        
+        if restore.state.get('x') in self.editor_x_axis.valueList: # gone if no longer shared by the files
+            self.editor_x_axis.setValue(restore.state['x'])
+        tree.selectionModel().clearSelection()
+        for fn, entry in restore.files.items():
+            if fn in self.dataframes:
+                tree.selectColumns(fn, entry.get('selected', []))
+        self.plot_model.data_key = None # plot anew with the restored settings
+        self.plot_scheduler.request()
+        self.plot_scheduler.flush()
+        yLims = figure.get('YLims') or []
+        if self.plot_model.lines and (figure.get('XLim') or any(yLims)):
+            if figure.get('XLim'):
+                self.axes.set_xlim(*figure['XLim']) # subplots share x, re-decimated to the view by onXLimChanged
+            for ax, yLim in zip(self.axes_layout.allAxes(), yLims):
+                if yLim:
+                    ax.set_ylim(*yLim)
+            self.refreshCanvas()
+        self.statusBar().showMessage(restore.summary(), 8000)
+    
+    
+    def warmUp(self):
+        """ import the plotting stack in a pool thread, then build the figure panel """
+        self.statusBar().showMessage('Loading plotting libraries...')
+        self._warm_up = WarmUpTask()
+        self._warm_up.signals.finished.connect(self.onWarmedUp)
+        self._warm_up.signals.failed.connect(self.onWarmUpFailed)
+        QtCore.QThreadPool.globalInstance().start(self._warm_up)
+    
+    
+    @pyqtSlot(object)
+    def onWarmedUp(self, timings):
+        self._warm_up = None
+        placeholder = self.panel_figure
+        self.createPlottingPanel()
+        self.main_frame.replaceWidget(1, self.panel_figure)
+        placeholder.deleteLater()
+        fsize = self.fig.get_size_inches()
+        self.setEditorFigureSize(fsize[0], fsize[1])
+        self.statusBar().showMessage('Ready', 3000)
+        if self._restore is not None and self._restore.isDone():
+            self.applySession()
+        elif self.dataframes: # files loaded meanwhile
+            self.plot_scheduler.request()
+    
+    
+    @pyqtSlot(str)
+    def onWarmUpFailed(self, msg):
+        warnings.warn('background import failed, retry in GUI thread. \n%s' % msg)
+        self.onWarmedUp(None) # the import error is raised again here
+    
+    
+    def createPlottingPanel(self):
+        self.createFigurePanel()
+        self.applyPlotStyle()
+        self.signal_ready.emit()
+    
+    
     def createFigurePanel(self):
         """ create matplotlib figure panel """
+        from matplotlib import style
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
         self.panel_figure = QtWidgets.QWidget()
         
         # Create the mpl Figure and FigCanvas objects.
@@ -278,10 +802,21 @@ class EzPlot(QtWidgets.QMainWindow):
         self.canvas = FigureCanvas(figure=self.fig)
         self.canvas.setParent(self.panel_figure)
         self.canvas.setStyleSheet("background-color:transparent;")
-        self.axes = self.fig.add_subplot(111)
+        self.axes = self.fig.add_subplot(111) # first subplot of the layout
+        self.axes_layout = AxesLayout(self.fig, self.axes)
+        self.blit = BlitManager(self.canvas) # fast path for style-only changes
+        
+        # fast QPainter view of the same axes for interactive work on long traces
+        self.fast_canvas = FastLineCanvas(self.axes)
+        self.stack_canvas = QtWidgets.QStackedWidget()
+        self.stack_canvas.addWidget(self.canvas)
+        self.stack_canvas.addWidget(self.fast_canvas)
         
-        # Create the navigation toolbar, tied to the canvas
-        toolbar = NavigationToolbar(self.canvas, self.panel_figure)
+        # Create the navigation toolbar, tied to the canvas (its save button exports the figure)
+        class ExportToolbar(NavigationToolbar):
+            def save_figure(toolbar, *args):
+                self.exportFigure()
+        toolbar = ExportToolbar(self.canvas, self.panel_figure)
 
         # figure control widgets
         self.botton_draw = gui.MakePushButton('Plot', minWidth=120, clickFunc=self.plot)
@@ -296,56 +831,236 @@ class EzPlot(QtWidgets.QMainWindow):
                                            low=1, high=64, step=0.01, digits=2, default=figsize[1])
         self.editor_fig_alpha  = gui.Float(label="Alpha", tooltip='figure background alpha', 
                                            low=0, high=1, step=0.1, digits=1, default=self.config['FigAlpha'])
+        self.editor_fig_alpha.valueChanged.connect(self.onAlphaChanged)
         
         self.editor_fontsz = gui.Float(low=6, high=64, step=1.0, digits=1, default=self.config['FontSize'], label="FontSize")
-        self.editor_fontsz.valueChanged.connect(self.plot)
-        self.editor_skip = gui.Int(low=0, high=100, step=1, default=0, label='DataSkip', tooltip='plot every nth data row')
-        self.editor_skip.valueChanged.connect(self.plot)
+        self.editor_fontsz.valueChanged.connect(self.plot_scheduler.request)
+        self.editor_skip = gui.Int(low=0, high=1000000, step=1, default=0, label='DataSkip', tooltip='plot every nth data row')
+        self.editor_skip.valueChanged.connect(self.plot_scheduler.request)
+        self.combo_sampling = gui.ComboBox(textList=SAMPLING_MODES, label='Sampling', minWidth=60,
+                                           default=self.config['Sampling'], connectFunc=self.onSamplingChanged,
+                                           tooltip='Stride: plot every nth row (DataSkip)\n'
+                                                   'MinMax: keep min & max per pixel column\n'
+                                                   'LTTB: largest-triangle-three-buckets, to canvas width')
+        self.editor_skip.setEnabled(self.config['Sampling'] == SAMPLING_STRIDE)
+        self.combo_layout = gui.ComboBox(textList=LAYOUT_MODES, label='Layout', minWidth=60,
+                                         default=self.config['Layout'], connectFunc=self.plot_scheduler.request,
+                                         tooltip='Single: all lines in one plot\n'
+                                                 'Per file / Per column: a grid of subplots sharing the x axis\n'
+                                                 '(a column style can put its line on a secondary y axis)')
+        self.combo_canvas = gui.ComboBox(textList=CANVAS_BACKENDS, label='Canvas', minWidth=60,
+                                         default=self.config['Canvas'], connectFunc=self.onCanvasChanged,
+                                         tooltip='Matplotlib: full quality rendering\n'
+                                                 'Fast: QPainter lines reduced per pixel, for long traces\n'
+                                                 '(drag to pan, wheel to zoom, ctrl+wheel for y, double click to autoscale)\n'
+                                                 'saved images are always rendered by matplotlib')
         
         styles = GetPlotThemeSyles()
         self.combo_style = gui.ComboBox(textList=styles, valueList=styles, label='Style',
                                         default=self.config['Style'],
                                         connectFunc=self.applyPlotStyle)
+        self.button_themes = gui.MakePushButton('Preview', clickFunc=self.previewThemes,
+                                                tooltip='thumbnails of the plotted data in every theme')
         
         hbox1 = gui.MakeHBoxLayout([
-            gui.MakeHBoxLayout([self.combo_style.labelText, self.combo_style]),
+            gui.MakeHBoxLayout([self.combo_style.labelText, self.combo_style, self.button_themes]),
             gui.MakeHBoxLayout([self.editor_fig_width.labelText, self.editor_fig_width]),
             gui.MakeHBoxLayout([self.editor_fig_height.labelText, self.editor_fig_height]),
-            gui.MakeHBoxLayout([self.editor_fig_alpha.labelText, self.editor_fig_alpha])
+            gui.MakeHBoxLayout([self.editor_fig_alpha.labelText, self.editor_fig_alpha]),
+            gui.MakeHBoxLayout([self.combo_canvas.labelText, self.combo_canvas])
         ])
         hbox2 = gui.MakeHBoxLayout([
             self.botton_draw, 
             gui.MakeHBoxLayout([self.chkbox_clear, self.chkbox_grid, self.chkbox_legend]),
             gui.MakeHBoxLayout([self.editor_fontsz.labelText, self.editor_fontsz]),
-            gui.MakeHBoxLayout([self.editor_skip.labelText, self.editor_skip])
+            gui.MakeHBoxLayout([self.combo_sampling.labelText, self.combo_sampling]),
+            gui.MakeHBoxLayout([self.editor_skip.labelText, self.editor_skip]),
+            gui.MakeHBoxLayout([self.combo_layout.labelText, self.combo_layout])
         ])
-        vbox = gui.MakeVBoxLayout([self.canvas, toolbar, hbox1, hbox2])
+        vbox = gui.MakeVBoxLayout([self.stack_canvas, toolbar, hbox1, hbox2])
         self.panel_figure.setLayout(vbox)
+        self.onCanvasChanged()
 
     
+    def isFastCanvas(self):
+        return self.stack_canvas.currentWidget() is self.fast_canvas
+    
+    
+    def onCanvasChanged(self):
+        """ the fast canvas shows a single axes, subplots & secondary y axes need matplotlib """
+        fast = self.combo_canvas.getValue() == CANVAS_FAST and self.axes_layout.isSingle()
+        self.stack_canvas.setCurrentWidget(self.fast_canvas if fast else self.canvas)
+        self.refreshCanvas()
+    
+    
+    def refreshCanvas(self):
+        """ redraw the active canvas, the matplotlib one lazily """
+        if self.fig is None:
+            return
+        with PROFILER.span('draw'):
+            if PROFILER.enabled: # drawn right away, so the draw is timed within the frame
+                self.fast_canvas.repaint() if self.isFastCanvas() else self.canvas.draw()
+            elif self.isFastCanvas():
+                self.fast_canvas.refresh()
+            else:
+                self.canvas.draw_idle()
+    
+    
+    def refreshTouchedAxes(self, touched, limits, legendTexts, regions):
+        """ redraw only the subplots of the touched axes over the last frame, if the others look the same:
+            same limits (x is shared) & legend texts (custom texts follow the subplot order),
+            else the whole figure is drawn.
+            - limits: axes => (xlim, ylim), legendTexts: axes => texts, as before the changes
+            - regions: axes => tight bbox before the changes
+        """
+        from matplotlib.transforms import Bbox
+        renderer = self.canvas.get_renderer()
+        newLegendTexts = self.legendTexts()
+        redrawn, boxes = [], []
+        for axes in self.axes_layout.colorGroups():
+            if touched.intersection(axes):
+                redrawn.extend(axes)
+                boxes.append(Bbox.union([ax.get_tightbbox(renderer) for ax in axes] +
+                                        [regions[ax] for ax in axes if ax in regions]))
+            elif any((ax.get_xlim(), ax.get_ylim()) != limits.get(ax) or
+                     newLegendTexts.get(ax) != legendTexts.get(ax) for ax in axes):
+                self.refreshCanvas()
+                return
+        with PROFILER.span('draw', axes=len(redrawn)):
+            if redrawn:
+                self.blit.redrawAxes(redrawn, boxes)
+    
+    
+    def refreshArtists(self):
+        """ redraw after in-place artist changes, blitted on the matplotlib canvas """
+        if self.fig is None:
+            return
+        with PROFILER.span('blit'):
+            if self.isFastCanvas():
+                self.fast_canvas.refresh()
+            else:
+                self.blit.update()
+    
+    
+    def onSamplingChanged(self):
+        self.editor_skip.setEnabled(self.combo_sampling.getValue() == SAMPLING_STRIDE)
+        self.plot_scheduler.request()
+    
+    
+    def sortedX(self, fn, xName):
+        """ x column as array if it is numeric & sorted (so searchsorted applies), else None """
+        key = (fn, xName)
+        if key not in self.sorted_x:
+            x = self.dataframes[fn][self.column_aliases.source(fn, xName)].to_numpy()
+            self.sorted_x[key] = x if x.dtype.kind in 'biuf' and IsSorted(x) else None
+        return self.sorted_x[key]
+    
+    
+    def connectAxesCallbacks(self):
+        """ (re)connect axes callbacks of the subplots, axes.clear() drops them """
+        for ax, cid in self._xlim_cids:
+            ax.callbacks.disconnect(cid)
+        self._xlim_cids = [(ax, ax.callbacks.connect('xlim_changed', self.onXLimChanged))
+                           for ax in self.axes_layout.primary.values()]
+    
+    
+    def onXLimChanged(self, ax):
+        if self.combo_sampling.getValue() != SAMPLING_STRIDE:
+            self.zoom_scheduler.request() # pan/zoom fires this many times per frame
+    
+    
+    def redecimateVisible(self):
+        """ re-decimate the lines to the visible x-range at full pixel resolution,
+            visible rows are found by binary search on the sorted x, so it costs O(visible) 
+            (a lazy file reads only the visible rows of the columns it does not keep)
+        """
+        from data_loader import ColumnRange
+        mode = self.combo_sampling.getValue()
+        if mode == SAMPLING_STRIDE or not self.plot_model.data_key:
+            return
+        xName = self.plot_model.data_key[0]
+        for (fn, yName), line in self.plot_model.lines.items():
+            x = self.sortedX(fn, xName)
+            if x is None:
+                continue
+            lo, hi = line.axes.get_xlim() # subplots share x, but may differ in width
+            nPixels = int(line.axes.bbox.width)
+            i0 = max(int(np.searchsorted(x, lo, side='left')) - 1, 0) # one point beyond each edge
+            i1 = min(int(np.searchsorted(x, hi, side='right')) + 1, len(x))
+            y = ColumnRange(self.dataframes[fn], self.column_aliases.source(fn, yName), i0, i1)
+            idx = DecimateIndex(x[i0:i1], y, nPixels, mode=mode)
+            line.set_data(x[i0:i1][idx], y[idx])
+        self.refreshCanvas()
+    
+    
     def setEditorFigureSize(self, w, h):
         self.editor_fig_width.setValue(w)
         self.editor_fig_height.setValue(h)
         
     
     def applyPlotStyle(self):
-        plt.rcdefaults()
-        style.use(self.combo_style.getValue())
-        self.fig.set_facecolor(plt.rcParams['figure.facecolor'])
-        self.fig.set_edgecolor(plt.rcParams['figure.edgecolor'])
-        self.axes.set_facecolor(plt.rcParams['axes.facecolor'])
-        
-        for axsp in self.axes.spines.values():
-            axsp.set_edgecolor(plt.rcParams['axes.edgecolor'])
-            axsp.set_linewidth(1.0)
-            axsp.set_alpha(1.0)
-
-        self.plot()
+        """ switch the theme in place: the cached theme params restyle the existing artists,
+            the data is not re-plotted
+        """
+        with PROFILER.frame('style', style=self.combo_style.getValue()):
+            params = ApplyTheme(self.fig, self.axes_layout.colorGroups(), self.combo_style.getValue())
+            self.axes_layout.resetColors()
+            self.plot_model.setBaseStyles(ThemeLineProps(params))
+            self.applyColumnStyles()
+            if self.legends() and self.chkbox_legend.getValue():
+                self.blit.reset()
+                self.makeLegend() # legend colors come from the theme
+            self.refreshCanvas()
+        self.showProfile()
+    
+    
+    def previewThemes(self):
+        """ thumbnails of the plotted data in every theme, rendered in the background """
+        series = []
+        for line in [line for ax in self.axes_layout.allAxes() for line in ax.get_lines()][:8]:
+            x, y = np.asarray(line.get_xdata()), np.asarray(line.get_ydata())
+            if len(x) > 1000: # a thumbnail needs a few hundred points
+                if x.dtype.kind in 'biuf' and y.dtype.kind in 'biuf':
+                    idx = DecimateIndex(x, y, 200, mode=SAMPLING_MINMAX)
+                else:
+                    idx = slice(None, None, len(x) // 500)
+                x, y = x[idx], y[idx]
+            series.append((x.copy(), y.copy())) # the lines may change while rendering
+        if not series: # nothing plotted, show sample curves
+            x = np.linspace(0, 2 * np.pi, 100)
+            series = [(x, np.sin(x + k)) for k in range(4)]
+        dialog = ThemePreview(GetPlotThemeSyles(), series, current=self.combo_style.getValue(), parent=self)
+        dialog.signal_theme_selected.connect(self.combo_style.setValue)
+        dialog.setAttribute(QtCore.Qt.WA_DeleteOnClose)
+        dialog.show()
+    
+    
+    def applyColumnStyles(self, ySelectedNodes=None):
+        """ reset the plotted lines to their base style, then apply the user style of their columns,
+            return the axes of the lines that look different
+        """
+        if ySelectedNodes is None:
+            ySelectedNodes = self.editor_y_axis.getSelectedColumns()
+        model = self.plot_model
+        restyled = set()
+        for fn, nodes in ySelectedNodes.items():
+            for colNode in nodes:
+                key = (fn, colNode.column_name)
+                if key in model and model.restyle(key, colNode.getStyle()):
+                    restyled.add(model.lines[key].axes)
+        return restyled
     
     
     def plot(self):
-        """ Redraws the figure
+        """ Redraws the figure, UI signals go through self.plot_scheduler to merge bursts of changes
         """
+        with PROFILER.frame('plot'):
+            self.plotSelection()
+        self.showProfile()
+    
+    
+    def plotSelection(self):
+        """ plot the selected y-axis columns over the x-axis column, only changed lines are re-plotted """
         def colNamesFormColNodes(colNodes, excludeName=None):
             if excludeName:
                 return [col.column_name for col in colNodes if col.column_name!=excludeName]
@@ -353,19 +1068,34 @@ class EzPlot(QtWidgets.QMainWindow):
                 return [col.column_name for col in colNodes]
         
         xSelectedName = self.editor_x_axis.getValue() # selected x-axis column name
-        if xSelectedName is None:
+        if xSelectedName is None or self.fig is None: # plotted once the figure panel is built
             return 
         
-        ySelectedNodes = self.editor_y_axis.getSelectedColumns() # fn => [selected column nodes]
-        ySelectedNames = {} # fn => [selected y-axis column names]
-        for fn, nodes in ySelectedNodes.items():
-            names = colNamesFormColNodes(nodes, excludeName=xSelectedName) 
-            if names:
-                ySelectedNames[fn] = names
+        with PROFILER.span('selection'):
+            ySelectedNodes = self.editor_y_axis.getSelectedColumns() # fn => [selected column nodes]
+            ySelectedNames = {} # fn => [selected y-axis column names]
+            for fn, nodes in ySelectedNodes.items():
+                if fn not in self.column_index.filesOf(xSelectedName): # x column shared by some files only
+                    continue
+                names = colNamesFormColNodes(nodes, excludeName=xSelectedName) 
+                if names:
+                    ySelectedNames[fn] = names
                 
         if self.dataframes and ySelectedNames:
-            if self.chkbox_clear.isChecked(): # clear the axes and redraw the plot anew
-                self.axes.clear()
+            # the canvas shows the last frame in full, so the axes that change can be redrawn over it
+            drawn = self.blit.background is not None and not self.isFastCanvas()
+            self.blit.reset() # artists may be added/removed, back to full drawing
+            sampling = self.combo_sampling.getValue()
+            dataKey = (xSelectedName, sampling, self.editor_skip.getValue() if sampling==SAMPLING_STRIDE else 0)
+            model = self.plot_model
+            layout = self.axes_layout
+            if not self.chkbox_clear.isChecked(): # keep the plotted lines & plot the selection over them
+                model.reset()
+            elif model.data_key != dataKey: # lines were prepared differently, plot anew
+                layout.clear()
+                model.reset()
+                model.data_key = dataKey
+                drawn = False
             
             customFigW = self.editor_fig_width.getValue()
             customFigH = self.editor_fig_height.getValue()            
@@ -375,84 +1105,305 @@ class EzPlot(QtWidgets.QMainWindow):
             elif currentFigSize[0]!=customFigW or currentFigSize[1]!=customFigH: # set to custom fig size
                 self.fig.set_size_inches(self.editor_fig_width.getValue(), self.editor_fig_height.getValue(), forward=True)
             
-            fontSz = self.editor_fontsz.getValue()
             legnON = self.chkbox_legend.getValue()
-            gridON = self.chkbox_grid.isChecked()
-            rowSkip = self.editor_skip.getValue()
             
-            for fn, ys in ySelectedNames.items():
-                lineSet = set(self.axes.get_lines())
-                df = self.dataframes[fn]
-                if rowSkip>0:
-                     df = df.iloc[::rowSkip, :]
-                ax = df.plot(x=xSelectedName, 
-                             y=ys,
-                             ax=self.axes,
-                             fontsize=fontSz,
-                             grid=gridON,
-                             legend=legnON)
-                
-                # apply individual user-custom styles (to newly plotted lines)
-                newLines = set(ax.get_lines()) - lineSet # this avoid apply style to lines with same label
-                for colNode in ySelectedNodes[fn]:
-                    usersty = colNode.getStyle()
-                    if usersty: # will be True if non-default
-                        for line in newLines:
-                            if line.get_label() == colNode.column_name:
-                                usersty.apply(line)
-                                break
-        
-            # axis grid
-            if gridON:
-                self.axes.grid(linestyle='--')
-            
-            # axis label
-            ylabel = self.editor_ytitle.getValue()
-            if ylabel: 
-                self.axes.set_ylabel(ylabel)
-            
-            xlabel = self.editor_xtitle.getValue()
-            if xlabel:
-                self.axes.set_xlabel(xlabel)
-                
-            # axis alpha
-            self.axes.patch.set_alpha(self.editor_fig_alpha.getValue())
-            
-            # axis label font size
-            for item in [self.axes.title, self.axes.xaxis.label, self.axes.yaxis.label]:
-                item.set_fontsize(fontSz)
-            
-            if legnON: # legend font & transparency
-                self.axes.legend(borderpad=0.2, labelspacing=0.2, framealpha=0.8, fontsize=fontSz)
-                legn = self.axes.get_legend()
-                if legn is not None: 
-                    self.setCustomLegend(canvasDraw=False)
-                    legn.draggable(True)
-        
-            self.canvas.draw()
+            # one subplot per group, the series of unchanged subplots keep their lines
+            wanted = [(fn, y) for fn, ys in ySelectedNames.items() for y in ys]
+            secondary = {(fn, col.column_name) for fn, nodes in ySelectedNodes.items() for col in nodes
+                         if col.style is not None and col.style.secondary_y}
+            groups = GroupSeries(self.combo_layout.getValue(), wanted)
+            wasSingle = layout.isSingle()
+            with PROFILER.span('layout', subplots=len(groups)):
+                removedAxes = layout.arrange(groups)
+                if removedAxes is not None: # grid changed
+                    model.removeLines([k for k, line in model.lines.items() if line.axes in removedAxes])
+                    self.axes = layout.first()
+                    self.fast_canvas.setAxes(self.axes)
+                drawn = drawn and removedAxes is None
+                if drawn: # what the axes left alone must keep, else the whole figure is drawn
+                    limits = {ax: (ax.get_xlim(), ax.get_ylim()) for ax in layout.allAxes()}
+                    legendTexts = self.legendTexts()
+                target = {} # series => its axes
+                for group, keys in groups.items():
+                    for key in keys:
+                        target[key] = layout.axesOf(group, key in secondary)
+                # series moved to/from a secondary y axes are plotted anew
+                moved = [k for k, line in model.lines.items() if k in target and line.axes is not target[k]]
+                touched = {model.lines[k].axes for k in moved}
+                model.removeLines(moved)
+
+            # only add/remove the lines of changed selection, the data of all added lines is prepared in parallel
+            added, removed = model.diff(wanted)
+            touched.update(model.lines[k].axes for k in removed)
+            with PROFILER.span('prepare', lines=len(added)):
+                source = self.column_aliases.source
+                series = [(key, self.dataframes[key[0]], source(key[0], xSelectedName), source(*key),
+                           id(target[key]), int(target[key].bbox.width)) for key in added]
+                prepared = PreparePlotData(series, sampling, self.editor_skip.getValue())
+            with PROFILER.span('lines', added=len(added), removed=len(removed)):
+                model.removeLines(removed)
+                for key in added:
+                    if key in prepared:
+                        ax = target[key]
+                        x, y = prepared[key]
+                        line, = ax.plot(x, y, label=str(key[1]), color=layout.nextColor(layout.groupOf(ax)))
+                        model.addLine(key, line)
+                        touched.add(ax)
+                layout.dropEmptySecondary()
+                if drawn: # what the changed axes showed, their ticks & legends may shrink
+                    renderer = self.canvas.get_renderer()
+                    regions = {ax: ax.get_tightbbox(renderer) for axes in layout.colorGroups()
+                               if touched.intersection(axes) for ax in axes}
+                for ax in touched:
+                    ax.relim()
+                    ax.autoscale_view()
+
+            # apply individual user-custom styles in place
+            with PROFILER.span('styles'):
+                touched.update(self.applyColumnStyles(ySelectedNodes))
+
+            with PROFILER.span('decorate'):
+                if self.decorateLayout(xSelectedName):
+                    drawn = False
+
+            with PROFILER.span('legend'):
+                if legnON: # legend font & transparency
+                    self.makeLegend()
+                else:
+                    for legn in self.legends():
+                        legn.remove()
+
+            if removedAxes is not None or layout.isSingle() != wasSingle:
+                self.onCanvasChanged() # the fast canvas shows a single plot only
+                drawn = False
+            self.connectAxesCallbacks()
+            if drawn:
+                self.refreshTouchedAxes(touched, limits, legendTexts, regions)
+            else:
+                self.refreshCanvas()
             
         else:
             self.statusBar().showMessage('Nothing to plot', 2000)
 
+    def showProfile(self):
+        """ breakdown of the last frame, plotted points & process memory in the status bar """
+        if not PROFILER.enabled:
+            return
+        rss = ProcessRSS()
+        points = self.plot_model.pointCount()
+        PROFILER.counter('points', points=points)
+        texts = [PROFILER.frameSummary(), '{:,} points'.format(points)]
+        if rss is not None:
+            PROFILER.counter('memory', rss_mb=rss / 2**20)
+            texts.append('RSS %.0f MB' % (rss / 2**20))
+        self.label_profile.setText(' | '.join(t for t in texts if t))
+    
+    
+    def setProfiling(self, on):
+        PROFILER.setEnabled(on)
+        self.label_profile.setVisible(on)
+        self.label_profile.setText('Profiling: load or plot to see the timings')
+        self.action_save_trace.setEnabled(on or bool(PROFILER.events))
+    
+    
+    def saveTrace(self):
+        fn, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Save trace', 'ezplot_trace.json', 'Trace files (*.json)')
+        if fn:
+            n = PROFILER.writeTrace(fn)
+            self.statusBar().showMessage('%d trace events saved, open in chrome://tracing or ui.perfetto.dev' % n, 5000)
+    
+    
+    def decorateLayout(self, xName):
+        """ fonts, grid, titles & background of the subplots in place, the x label under the bottom ones,
+            the grid spacing is fitted again only if the subplots or their texts changed.
+            Return True if the decorations may differ from the last ones applied.
+        """
+        fontSz = self.editor_fontsz.getValue()
+        layout = self.axes_layout
+        spacingKey = (tuple(layout.primary), tuple(layout.secondary), tuple(self.fig.get_size_inches()), fontSz,
+                      self.editor_xtitle.getValue() or xName, self.editor_ytitle.getValue())
+        perFile = self.combo_layout.getValue() == LAYOUT_PER_FILE
+        decorationKey = spacingKey + (self.chkbox_grid.isChecked(), self.editor_fig_alpha.getValue(), perFile)
+        for group, ax in layout.primary.items():
+            DecorateAxes(ax, fontSz, self.chkbox_grid.isChecked(),
+                         xlabel=(self.editor_xtitle.getValue() or xName) if layout.isBottom(group) else '',
+                         ylabel=self.editor_ytitle.getValue(),
+                         alpha=self.editor_fig_alpha.getValue())
+            title = '' if group is None else os.path.basename(group) if perFile else str(group)
+            ax.set_title(title, fontsize=fontSz)
+        for ax in layout.secondary.values(): # its grid would cross the primary one
+            DecorateAxes(ax, fontSz, False)
+        if spacingKey != self._spacing_key:
+            self._spacing_key = spacingKey
+            layout.fitSpacing()
+        changed, self._decoration_key = decorationKey != self._decoration_key, decorationKey
+        return changed
+    
+    
+    def legends(self):
+        """ legends of the subplots in layout order """
+        return [ax.get_legend() for axes in self.axes_layout.colorGroups() for ax in axes if ax.get_legend() is not None]
+    
+    
+    def legendTexts(self):
+        """ axes => texts of its legend """
+        return {legn.axes: [t.get_text() for t in legn.get_texts()] for legn in self.legends()}
+    
+    
+    def makeLegend(self):
+        """ (re)create a legend per subplot from its lines (secondary y included), return the legends """
+        fontSz = self.editor_fontsz.getValue()
+        for legn in self.legends():
+            legn.remove()
+        legends = []
+        for axes in self.axes_layout.colorGroups():
+            lines = [line for ax in axes for line in ax.get_lines()]
+            if lines: # on the top axes, so the secondary y lines do not cover it
+                legn = MakeLegend(axes[-1], fontSz, handles=lines)
+                legn.set_draggable(True)
+                legends.append(legn)
+        self.setLegendTexts(legends)
+        return legends
+    
+    
+    def setLegendTexts(self, legends):
+        """ custom legend texts (comma separated) go to the legend entries in subplot order """
+        texts = self.editor_legend.getValue().split(',') if self.editor_legend.getValue() else []
+        for legn in legends:
+            n = len(legn.get_texts())
+            SetLegendTexts(legn, ','.join(texts[:n]))
+            texts = texts[n:]
+    
+    
     def setCustomLegend(self, canvasDraw=True):
         ''' set legend from custom input text, seperated by comma'''
-        legnStr = self.editor_legend.getValue()
-        if legnStr:
-            legn = self.axes.get_legend()
-            if legn is not None:
-                for lt, ls in zip(legn.get_texts(), legnStr.split(',')):
-                    lt.set_text(ls)
-                if canvasDraw:
-                    self.canvas.draw_idle() # refresh
+        if self.fig is None:
+            return
+        legends = self.legends()
+        if not legends:
+            return
+        if self.editor_legend.getValue():
+            self.setLegendTexts(legends)
+            if canvasDraw:
+                for legn in legends:
+                    self.blit.addArtist(legn)
+                self.refreshArtists() # only the legends are redrawn
+        elif canvasDraw: # custom text cleared, back to line labels
+            self.refreshLegend()
+            self.refreshArtists()
+    
+    
+    def refreshLegend(self):
+        """ rebuild the legends to pick up line style changes, keep them animated for blitting """
+        oldLegends = self.legends()
+        if oldLegends and self.chkbox_legend.getValue():
+            for legn in oldLegends:
+                self.blit.replaceArtist(legn, None)
+            for legn in self.makeLegend():
+                self.blit.replaceArtist(None, legn)
+    
+    
+    @pyqtSlot(object) # DataColumnNode
+    def onColumnStyleChanged(self, colNode):
+        """ style-only change of a plotted column: restyle its line in place and blit it,
+            no re-plot of data (a move to/from the secondary y axis is re-plotted)
+        """
+        key = (colNode.dfnode.datafile, colNode.column_name)
+        if self.fig is None or self.plot_scheduler.isPending() or key not in self.plot_model:
+            self.plot_scheduler.request()
+            return
+        line = self.plot_model.lines[key]
+        if colNode.getStyle().secondary_y != self.axes_layout.isSecondary(line.axes):
+            self.plot_scheduler.request()
+            return
+        self.plot_model.restyle(key, colNode.getStyle())
+        self.blit.addArtist(line)
+        self.refreshLegend()
+        self.refreshArtists()
+    
+    
+    def onAlphaChanged(self):
+        """ axes background alpha, applied in place without re-plotting """
+        for ax in self.axes_layout.primary.values():
+            ax.patch.set_alpha(self.editor_fig_alpha.getValue())
+        self.refreshCanvas()
 
 
-    # def savePlot(self):
-    #     path = str(QtWidgets.QFileDialog.getSaveFileName(self, 'Save Image', '',
-    #                                                "Image files (*.png *.eps *.pdf *.jpg *.tif *.tiff)"))
-    #     if path:
-    #         # self.canvas.print_figure(path, dpi=300, transparent=True)
-    #         self.fig.savefig(path, dpi=300, bbox_inches='tight', transparent=True, pad_inches=0.2)
-    #         self.statusBar().showMessage('Saved to %s' % path, 2000)
+    def exportSources(self):
+        """ {(axes index, line index): (x, y)} full column data of the lines decimated to the screen,
+            so the export is decimated to its own resolution
+        """
+        from data_loader import FrameColumns
+        from plot_api import ColumnArray
+        model = self.plot_model
+        if not model.data_key or model.data_key[1] == SAMPLING_STRIDE: # strided lines are exported as shown
+            return {}
+        xName = model.data_key[0]
+        source = self.column_aliases.source
+        positions = {line: (k, i) for k, ax in enumerate(self.fig.get_axes()) for i, line in enumerate(ax.get_lines())}
+        sources = {}
+        for (fn, yName), line in model.lines.items():
+            if line in positions and fn in self.dataframes:
+                df = FrameColumns(self.dataframes[fn], [source(fn, xName), source(fn, yName)])
+                sources[positions[line]] = (ColumnArray(df[source(fn, xName)]), ColumnArray(df[source(fn, yName)]))
+        return sources
+    
+    
+    def exportFigure(self, fn=None):
+        """ save the figure in the background, dense lines are decimated to the output resolution
+            and rasterized in vector formats
+        """
+        if self.fig is None:
+            return
+        if not fn:
+            fn, _ = QtWidgets.QFileDialog.getSaveFileName(self, 'Export figure', 
+                                                          os.path.splitext(self.config['DataFile'])[0] + '.png',
+                                                          ExportFilters())
+            if not fn:
+                return
+        if not os.path.splitext(fn)[1]:
+            fn += '.png'
+        if self._export is not None:
+            self._export.cancel()
+        task = ExportTask(FigureSnapshot(self.fig), fn, dpi=self.config['ExportDPI'],
+                          sources=self.exportSources(), sampling=self.combo_sampling.getValue())
+        task.signals.progress.connect(self.onExportProgress)
+        task.signals.finished.connect(self.onExportFinished)
+        task.signals.failed.connect(self.onExportFailed)
+        task.signals.cancelled.connect(self.onExportEnded)
+        self._export = task
+        self.pbar_export.setValue(0)
+        self.pbar_export.setVisible(True)
+        StartExport(task)
+    
+    
+    @pyqtSlot(int, str) # (percent, stage)
+    def onExportProgress(self, percent, stage):
+        if self._export is not None and self.sender() is self._export.signals:
+            self.pbar_export.setValue(percent)
+            self.statusBar().showMessage('Exporting figure: %s...' % stage)
+    
+    
+    @pyqtSlot(str, object) # (fn, stats)
+    def onExportFinished(self, fn, stats):
+        self.onExportEnded(fn)
+        self.statusBar().showMessage('Figure exported to %s in %.1f s (%s points -> %s, %d lines rasterized)' % (
+            fn, stats['seconds'], '{:,}'.format(stats['points']), '{:,}'.format(stats['points_out']), 
+            stats['rasterized']), 8000)
+    
+    
+    @pyqtSlot(str, str) # (fn, message)
+    def onExportFailed(self, fn, msg):
+        self.onExportEnded(fn)
+        self.statusBar().showMessage('Export failed! %s' % msg, 8000)
+    
+    
+    @pyqtSlot(str) # fn
+    def onExportEnded(self, fn):
+        """ drop the ended task, the progress bar goes with the latest export """
+        if self._export is not None and self.sender() is self._export.signals:
+            self._export = None
+            self.pbar_export.setVisible(False)
 
     
     def createMenu(self):
@@ -465,12 +1416,29 @@ class EzPlot(QtWidgets.QMainWindow):
                     target.addAction(action)
                 
         fileMenu = self.menuBar().addMenu("&File")
-        # action_save = self.createAction("&Save plot",
-        #                                 slot=self.savePlot, shortcut="Ctrl+S", tip="Save the plot")
+        action_clear_cache = self.createAction("&Clear file cache", slot=self.clearFileCache,
+                                               tip="Remove the binary cache of parsed files")
+        action_open = self.createAction("&Open files", slot=self.openFiles,
+                                        shortcut="Ctrl+O", tip="Load one or more data files")
+        action_open_session = self.createAction("Open s&ession...", slot=lambda: self.openSession(),
+                                                tip="Reopen the files, selection & figure of a saved session")
+        action_save_session = self.createAction("&Save session...", slot=lambda: self.saveSession(),
+                                                shortcut="Ctrl+Shift+S", tip="Save the loaded files, selection & figure settings")
+        self.action_restore_session = self.createAction("&Restore last session on startup", checkable=True,
+                                                        tip="Save the session on exit and reopen it on startup")
+        action_export = self.createAction("&Export figure...", slot=lambda: self.exportFigure(),
+                                          shortcut="Ctrl+E", tip="Save the figure as image or vector file")
         action_quit = self.createAction("&Quit", slot=self.close,
                                         shortcut="Ctrl+Q", tip="Close the application")
-        # addActions(fileMenu, (action_save, None, action_quit))
-        addActions(fileMenu, (None, action_quit))
+        addActions(fileMenu, (action_open, action_clear_cache, None, action_export, None,
+                              action_open_session, action_save_session, self.action_restore_session, None, action_quit))
+
+        toolsMenu = self.menuBar().addMenu("&Tools")
+        self.action_profile = self.createAction("&Profile", slot=self.setProfiling, checkable=True,
+                                                tip="Time the load & redraw stages, show the last breakdown in the status bar")
+        self.action_save_trace = self.createAction("Save &trace", slot=self.saveTrace,
+                                                   tip="Save the timings for the Chrome trace viewer")
+        addActions(toolsMenu, (self.action_profile, self.action_save_trace))
 
         helpMenu = self.menuBar().addMenu("&Help")
         action_about = self.createAction("&About",
@@ -529,11 +1497,13 @@ def main():
 
     curFd = os.path.dirname(os.path.realpath(__file__))
     app.setWindowIcon(QtGui.QIcon(os.path.join(curFd, 'icons', 'logo.png')))
+    splash = MakeSplash(os.path.join(curFd, 'icon.png'), 'Loading %s...' % __appname__)
     
     try:
         config = json.load(open(__config__))
         if 'Style' in config and config['Style']=='dark_background':
             # SetDarkUI(app) # if figure use dark theme, we make gui dark too ;)
+            import qdarkstyle
             app.setStyleSheet(qdarkstyle.load_stylesheet_pyqt5())
     except Exception as e:
         warnings.warn('load config file failed, use default config. \n%r'%e)
@@ -541,8 +1511,11 @@ def main():
         w, h = resolution.width(), resolution.height()
         config = { 'WindowSize' : (int(0.382*w), int(0.5*h)) }
         
-    window = EzPlot(config)
+    window = EzPlot(config, deferPlotting=True)
     window.show()
+    splash.finish(window)
+    if window.config['FlagRestoreSession'] and os.path.isfile(__session__):
+        window.openSession(__session__) # files load while the plotting stack is imported
     app.exec_()
 
 
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: ezplot_batch.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Headless batch rendering of plot jobs, no QApplication needed.
+
+usage: python ezplot_batch.py jobs.json [-j 4] [--outdir out] [--format png]
+
+A job file is a JSON list of jobs, or {"defaults": {...}, "jobs": [...]}, e.g.
+    {
+        "defaults": {"style": "ggplot", "width": 8, "height": 4, "dpi": 150},
+        "jobs": [
+            {"files": ["run1.csv"], "x": "time", "y": ["speed", "rpm"], "output": "run1.png"},
+            {"files": ["run1.csv", "run2.csv"], "x": "time", "y": ["speed"], "output": "speed.pdf",
+             "sampling": "MinMax", "styles": {"speed": {"line_style": "--"}}}
+        ]
+    }
+See plot_api.PlotJob for all job options.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import matplotlib
+matplotlib.use('Agg') # before anything imports pyplot
+
+
+def LoadJobFile(fn):
+    """ return (defaults dict, [job dicts]) """
+    with open(fn, 'r') as f:
+        spec = json.load(f)
+    if isinstance(spec, list):
+        return {}, spec
+    return spec.get('defaults', {}), spec.get('jobs', [])
+
+
+def RunJob(spec, defaults, cacheDir=None):
+    """ render one job in a worker process, return (output, timings or None, error or None) """
+    from plot_api import PlotJob, RenderJob
+    from file_cache import FileCache
+    output = spec.get('output', '?')
+    try:
+        job = PlotJob(spec, defaults)
+        cache = FileCache(cacheDir) if cacheDir else None
+        return job.output, RenderJob(job, cache=cache), None
+    except Exception:
+        return output, None, traceback.format_exc(limit=3)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Render ezPlot plot jobs headless.')
+    parser.add_argument('jobfile', help='JSON job file')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='parallel worker processes')
+    parser.add_argument('--outdir', default=None, help='prefix relative output paths with this folder')
+    parser.add_argument('--format', default=None, choices=['png', 'pdf', 'svg', 'eps', 'jpg', 'tif'],
+                        help='override the output file format')
+    parser.add_argument('--cache', default=None, help='binary file cache folder, off if not given')
+    args = parser.parse_args(argv)
+
+    defaults, specs = LoadJobFile(args.jobfile)
+    baseDir = os.path.dirname(os.path.abspath(args.jobfile))
+    for spec in specs: # resolve paths relative to the job file
+        if 'files' in spec:
+            files = [spec['files']] if isinstance(spec['files'], str) else spec['files']
+            spec['files'] = [os.path.join(baseDir, f) for f in files]
+        if 'output' in spec:
+            out = spec['output']
+            if args.format:
+                out = os.path.splitext(out)[0] + '.' + args.format
+            spec['output'] = os.path.join(args.outdir or baseDir, out)
+
+    t0 = time.perf_counter()
+    nFailed = 0
+    with ProcessPoolExecutor(max_workers=max(args.jobs, 1)) as pool:
+        futures = [pool.submit(RunJob, spec, defaults, args.cache) for spec in specs]
+        for future in as_completed(futures):
+            output, timings, error = future.result()
+            if error:
+                nFailed += 1
+                print('FAILED %s\n%s' % (output, error), file=sys.stderr)
+            else:
+                print('%-40s %s' % (output, '  '.join('%s %.3fs' % kv for kv in timings.items())))
+    print('%d jobs, %d failed, %.3fs wall time' % (len(specs), nFailed, time.perf_counter() - t0))
+    return 1 if nFailed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
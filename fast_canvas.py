@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: fast_canvas.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Interactive line renderer on QPainter, an alternative view of a matplotlib Axes.
+
+The matplotlib figure stays the model & the export path: this canvas only reads
+the lines, limits, labels and colors of the Axes and paints them on the CPU.
+Each line is reduced to the min & max of every pixel column of the visible
+x-range before painting, so a frame costs O(visible points) in numpy plus
+O(canvas width) in QPainter, however long the trace is.
+Pan (left drag), zoom (wheel, ctrl+wheel for y) and autoscale (double click)
+write the new limits back to the Axes, so both views stay in sync.
+"""
+import weakref
+
+import numpy as np
+from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5.QtCore import Qt
+
+from decimation import IsSorted, MinMaxIndex
+
+
+CANVAS_MATPLOTLIB = 'Matplotlib'
+CANVAS_FAST       = 'Fast'
+CANVAS_BACKENDS   = [CANVAS_MATPLOTLIB, CANVAS_FAST]
+
+MAX_MARKERS = 5000 # markers are skipped beyond this many visible points
+
+_PEN_STYLES = {'-': Qt.SolidLine, '--': Qt.DashLine, '-.': Qt.DashDotLine, ':': Qt.DotLine}
+
+
+def ToQColor(c, alpha=None):
+    from matplotlib import colors
+    r, g, b, a = colors.to_rgba(c, alpha)
+    return QtGui.QColor.fromRgbF(r, g, b, a)
+
+
+def ArrayToPolygon(px, py):
+    """ QPolygonF of pixel coordinates, filled through its buffer without a python loop """
+    n = len(px)
+    poly = QtGui.QPolygonF()
+    poly.fill(QtCore.QPointF(), n)
+    if n:
+        ptr = poly.data()
+        ptr.setsize(n * 2 * 8) # n QPointF of 2 doubles
+        buf = np.frombuffer(ptr, dtype=np.float64).reshape(n, 2)
+        buf[:, 0] = px
+        buf[:, 1] = py
+    return poly
+
+
+def ArrayToSegments(px, py):
+    """ QPolygonF of point pairs (p0,p1, p1,p2, ...) for QPainter.drawLines """
+    idx = np.repeat(np.arange(len(px)), 2)[1:-1]
+    return ArrayToPolygon(px[idx], py[idx])
+
+
+def FiniteRuns(mask):
+    """ [(start, stop)] of the runs of True in mask """
+    if mask.all():
+        return [(0, len(mask))]
+    edges = np.flatnonzero(np.diff(np.concatenate(([False], mask, [False])).astype(np.int8)))
+    return list(zip(edges[::2], edges[1::2]))
+
+
+class FastLineCanvas(QtWidgets.QWidget):
+    """ Paint the lines of a matplotlib Axes with QPainter polylines """
+
+    def __init__(self, axes, parent=None):
+        super().__init__(parent)
+        self.axes = axes
+        self._sorted = weakref.WeakKeyDictionary() # Line2D => (xy array, x is sorted)
+        self._drag = None # (mouse pos, xlim, ylim) when panning
+        self.setAutoFillBackground(True)
+        self.setMouseTracking(False)
+        self.setFocusPolicy(Qt.ClickFocus)
+        self.setMinimumSize(200, 150)
+        self.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Expanding)
+
+    def setAxes(self, axes):
+        self.axes = axes
+        self._sorted.clear()
+        self.update()
+
+    def refresh(self):
+        """ schedule a repaint, Qt merges repeated calls into one frame """
+        self.update()
+
+    ###########################################################################
+    # coordinates
+
+    def plotRect(self):
+        """ the axes area in widget pixels, margins leave room for ticks & labels """
+        fm = self.fontMetrics()
+        h = fm.height()
+        left = fm.width('-0.000e+00') + h
+        top = h * (2 if self.axes.get_title() else 1)
+        bottom = h * (3 if self.axes.get_xlabel() else 2)
+        rect = QtCore.QRectF(self.rect()).adjusted(left, top, -h, -bottom)
+        if self.axes.get_ylabel():
+            rect.adjust(h, 0, 0, 0)
+        return rect
+
+    def _transform(self, rect):
+        """ scale & offset mapping data to pixels: px = x*sx + ox """
+        (x0, x1), (y0, y1) = self.axes.get_xlim(), self.axes.get_ylim()
+        sx = rect.width() / ((x1 - x0) or 1.0)
+        sy = -rect.height() / ((y1 - y0) or 1.0)
+        return sx, rect.left() - x0 * sx, sy, rect.bottom() - y0 * sy
+
+    def toData(self, pos, rect):
+        sx, ox, sy, oy = self._transform(rect)
+        return (pos.x() - ox) / sx, (pos.y() - oy) / sy
+
+    ###########################################################################
+    # painting
+
+    def _visibleXY(self, line, width):
+        """ the line points to paint: the visible x-range, min/max-reduced per pixel column """
+        xy = line.get_xydata() # unit-converted floats, same space as the axes limits
+        if len(xy) == 0:
+            return xy[:, 0], xy[:, 1]
+        cached = self._sorted.get(line)
+        if cached is None or cached[0] is not xy:
+            cached = (xy, IsSorted(xy[:, 0]))
+            self._sorted[line] = cached
+        x, y = xy[:, 0], xy[:, 1]
+        if not cached[1]: # unordered x, nothing to cull
+            return x, y
+        lo, hi = self.axes.get_xlim()
+        if lo > hi:
+            lo, hi = hi, lo
+        i0 = max(int(np.searchsorted(x, lo, side='left')) - 1, 0)
+        i1 = min(int(np.searchsorted(x, hi, side='right')) + 1, len(x))
+        x, y = x[i0:i1], y[i0:i1]
+        if len(x) > 4 * width:
+            idx = MinMaxIndex(y, width, x=x)
+            x, y = x[idx], y[idx]
+        return x, y
+
+    def _paintLine(self, painter, line, rect, transform, ppi):
+        sx, ox, sy, oy = transform
+        x, y = self._visibleXY(line, max(int(rect.width()), 2))
+        if len(x) == 0:
+            return
+        px, py = x * sx + ox, y * sy + oy
+        runs = FiniteRuns(np.isfinite(px) & np.isfinite(py))
+        color = ToQColor(line.get_color(), line.get_alpha())
+
+        penStyle = _PEN_STYLES.get(line.get_linestyle())
+        if penStyle is not None:
+            width = max(line.get_linewidth() * ppi, 1.0)
+            pen = QtGui.QPen(color, width)
+            pen.setStyle(penStyle)
+            pen.setCapStyle(Qt.FlatCap) # round caps cost 10x on dense segments
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            for i0, i1 in runs:
+                if i1 - i0 < 2:
+                    continue
+                if width <= 1.0: # thin lines take the fast rasterizer path
+                    painter.drawPolyline(ArrayToPolygon(px[i0:i1], py[i0:i1]))
+                else: # a wide polyline is stroked as one self-overlapping outline, ~100x slower
+                    painter.drawLines(ArrayToSegments(px[i0:i1], py[i0:i1]))
+
+        if line.get_marker() not in (None, '', ' ', 'None') and len(px) <= MAX_MARKERS:
+            r = max(line.get_markersize() * ppi / 2.0, 1.0)
+            painter.setPen(QtGui.QPen(ToQColor(line.get_markeredgecolor()), 1.0))
+            painter.setBrush(ToQColor(line.get_markerfacecolor()))
+            for i0, i1 in runs:
+                for xp, yp in zip(px[i0:i1], py[i0:i1]):
+                    painter.drawEllipse(QtCore.QPointF(xp, yp), r, r)
+
+    def _ticks(self, axis, lo, hi):
+        """ [(value, label)] of the major ticks, from the axis' own locator & formatter """
+        try:
+            locs = np.asarray(axis.get_major_locator().tick_values(lo, hi))
+            locs = locs[(locs >= min(lo, hi)) & (locs <= max(lo, hi))]
+            labels = axis.get_major_formatter().format_ticks(locs)
+        except Exception: # e.g. a locator tied to the (hidden) mpl canvas
+            from matplotlib.ticker import MaxNLocator
+            locs = MaxNLocator().tick_values(lo, hi)
+            labels = ['%g' % v for v in locs]
+        return list(zip(locs, labels))
+
+    def _paintAxes(self, painter, rect, transform, textColor, gridOn):
+        sx, ox, sy, oy = transform
+        ax = self.axes
+        fm = painter.fontMetrics()
+        tickLen = fm.height() / 3.0
+        gridPen = QtGui.QPen(QtGui.QColor(textColor), 0.5, Qt.DashLine)
+        gridPen.setColor(QtGui.QColor(textColor.red(), textColor.green(), textColor.blue(), 64))
+        textPen = QtGui.QPen(textColor)
+
+        for v, label in self._ticks(ax.xaxis, *ax.get_xlim()):
+            xp = v * sx + ox
+            if gridOn:
+                painter.setPen(gridPen)
+                painter.drawLine(QtCore.QPointF(xp, rect.top()), QtCore.QPointF(xp, rect.bottom()))
+            painter.setPen(textPen)
+            painter.drawLine(QtCore.QPointF(xp, rect.bottom()), QtCore.QPointF(xp, rect.bottom() + tickLen))
+            painter.drawText(QtCore.QPointF(xp - fm.width(label) / 2.0, rect.bottom() + tickLen + fm.ascent()), label)
+
+        for v, label in self._ticks(ax.yaxis, *ax.get_ylim()):
+            yp = v * sy + oy
+            if gridOn:
+                painter.setPen(gridPen)
+                painter.drawLine(QtCore.QPointF(rect.left(), yp), QtCore.QPointF(rect.right(), yp))
+            painter.setPen(textPen)
+            painter.drawLine(QtCore.QPointF(rect.left() - tickLen, yp), QtCore.QPointF(rect.left(), yp))
+            painter.drawText(QtCore.QPointF(rect.left() - tickLen - fm.width(label) - 2, yp + fm.ascent() / 2.0), label)
+
+        painter.setPen(textPen)
+        if ax.get_title():
+            painter.drawText(QtCore.QRectF(rect.left(), 0, rect.width(), rect.top()), Qt.AlignCenter, ax.get_title())
+        if ax.get_xlabel():
+            painter.drawText(QtCore.QRectF(rect.left(), self.height() - fm.height() - 2, rect.width(), fm.height()),
+                             Qt.AlignCenter, ax.get_xlabel())
+        if ax.get_ylabel():
+            painter.save()
+            painter.translate(fm.height(), rect.center().y())
+            painter.rotate(-90)
+            painter.drawText(QtCore.QRectF(-rect.height() / 2.0, -fm.height(), rect.height(), fm.height()),
+                             Qt.AlignCenter, ax.get_ylabel())
+            painter.restore()
+
+    def _paintLegend(self, painter, rect, lines, textColor, ppi):
+        legn = self.axes.get_legend()
+        if legn is None:
+            return
+        entries = [(line, line.get_label()) for line in lines if not line.get_label().startswith('_')]
+        texts = [t.get_text() for t in legn.get_texts()]
+        if len(texts) == len(entries): # custom legend texts
+            entries = [(line, text) for (line, _), text in zip(entries, texts)]
+        if not entries:
+            return
+        fm = painter.fontMetrics()
+        h = fm.height()
+        sample = 2 * h
+        w = max(fm.width(text) for _, text in entries) + sample + h
+        box = QtCore.QRectF(rect.right() - w - h / 2.0, rect.top() + h / 2.0, w, h * len(entries) + h / 2.0)
+        painter.setPen(QtGui.QPen(QtGui.QColor(textColor.red(), textColor.green(), textColor.blue(), 96)))
+        painter.setBrush(ToQColor(self.axes.get_facecolor(), 0.8))
+        painter.drawRect(box)
+        for i, (line, text) in enumerate(entries):
+            y = box.top() + h / 4.0 + h * i + h / 2.0
+            pen = QtGui.QPen(ToQColor(line.get_color()), max(line.get_linewidth() * ppi, 1.0))
+            pen.setStyle(_PEN_STYLES.get(line.get_linestyle(), Qt.SolidLine))
+            painter.setPen(pen)
+            painter.drawLine(QtCore.QPointF(box.left() + h / 2.0, y), QtCore.QPointF(box.left() + h / 2.0 + sample, y))
+            painter.setPen(QtGui.QPen(textColor))
+            painter.drawText(QtCore.QPointF(box.left() + sample + h, y + fm.ascent() / 2.5), text)
+
+    def paintEvent(self, event):
+        ax = self.axes
+        painter = QtGui.QPainter(self)
+        try:
+            painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
+            fig = ax.figure
+            if fig.patch.get_alpha() != 0.0:
+                painter.fillRect(self.rect(), ToQColor(fig.get_facecolor()))
+            rect = self.plotRect()
+            if rect.width() < 2 or rect.height() < 2:
+                return
+            ppi = self.logicalDpiX() / 72.0 # pixels per point
+            transform = self._transform(rect)
+            textColor = ToQColor(ax.xaxis.label.get_color())
+            gridOn = any(gl.get_visible() for gl in ax.get_xgridlines())
+
+            painter.fillRect(rect, ToQColor(ax.get_facecolor(), ax.patch.get_alpha()))
+            self._paintAxes(painter, rect, transform, textColor, gridOn)
+
+            lines = [line for line in ax.get_lines() if line.get_visible()]
+            painter.save()
+            painter.setClipRect(rect)
+            for line in lines:
+                self._paintLine(painter, line, rect, transform, ppi)
+            painter.restore()
+
+            painter.setPen(QtGui.QPen(ToQColor(ax.spines['left'].get_edgecolor()), 1.0))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(rect)
+            self._paintLegend(painter, rect, lines, textColor, ppi)
+        finally:
+            painter.end()
+
+    ###########################################################################
+    # pan & zoom
+
+    def setLimits(self, xlim=None, ylim=None):
+        if xlim is not None:
+            self.axes.set_xlim(*xlim)
+        if ylim is not None:
+            self.axes.set_ylim(*ylim)
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag = (event.pos(), self.axes.get_xlim(), self.axes.get_ylim())
+            self.setCursor(Qt.ClosedHandCursor)
+
+    def mouseMoveEvent(self, event):
+        if self._drag is None:
+            return
+        pos0, (x0, x1), (y0, y1) = self._drag
+        rect = self.plotRect()
+        dx = (event.pos().x() - pos0.x()) * (x1 - x0) / rect.width()
+        dy = (event.pos().y() - pos0.y()) * (y1 - y0) / rect.height()
+        self.setLimits((x0 - dx, x1 - dx), (y0 + dy, y1 + dy))
+
+    def mouseReleaseEvent(self, event):
+        self._drag = None
+        self.unsetCursor()
+
+    def mouseDoubleClickEvent(self, event):
+        """ autoscale to the data """
+        self.axes.relim()
+        self.axes.autoscale()
+        self.update()
+
+    def wheelEvent(self, event):
+        """ zoom about the cursor, x by default, y with ctrl, both with shift """
+        steps = event.angleDelta().y() / 120.0
+        if not steps:
+            return
+        factor = 0.8 ** steps
+        rect = self.plotRect()
+        xc, yc = self.toData(event.pos(), rect)
+        mods = event.modifiers()
+        zoomX = not (mods & Qt.ControlModifier) or bool(mods & Qt.ShiftModifier)
+        zoomY = bool(mods & (Qt.ControlModifier | Qt.ShiftModifier))
+        xlim = ylim = None
+        if zoomX:
+            x0, x1 = self.axes.get_xlim()
+            xlim = (xc - (xc - x0) * factor, xc + (x1 - xc) * factor)
+        if zoomY:
+            y0, y1 = self.axes.get_ylim()
+            ylim = (yc - (yc - y0) * factor, yc + (y1 - yc) * factor)
+        self.setLimits(xlim, ylim)
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: figure_export.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Figure export on the Qt thread pool. The figure is copied on the main thread
+(its arrays are shared, not copied), then the copy is fitted to the output
+resolution and saved in a pool thread, so the window stays responsive.
+"""
+import io
+import time
+import pickle
+import threading
+
+import numpy as np
+from PyQt5 import QtCore
+
+from plot_api import FitLinesToOutput, OutputFormat, VECTOR_FORMATS
+
+
+EXPORT_FORMATS = [('png', 'PNG image'), ('pdf', 'PDF document'), ('svg', 'SVG vector image'),
+                  ('eps', 'Encapsulated PostScript'), ('jpg', 'JPEG image'), ('tif', 'TIFF image')]
+SHARED_ARRAY_SIZE = 4096 # arrays from this size are shared with the copy instead of pickled
+_running = set() # started tasks, referenced until they end
+
+
+def ExportFilters():
+    """ file dialog filters of the export formats """
+    return ';;'.join('%s (*.%s)' % (desc, ext) for ext, desc in EXPORT_FORMATS)
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+class _SharingPickler(pickle.Pickler):
+    """ pickles large arrays by reference, they are only read by the export """
+    def __init__(self, file, arrays):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.arrays = arrays
+
+    def persistent_id(self, obj):
+        if isinstance(obj, np.ndarray) and obj.size >= SHARED_ARRAY_SIZE:
+            self.arrays.append(obj)
+            return len(self.arrays) - 1
+        return None
+
+
+class _SharingUnpickler(pickle.Unpickler):
+    def __init__(self, file, arrays):
+        super().__init__(file)
+        self.arrays = arrays
+
+    def persistent_load(self, pid):
+        return self.arrays[pid]
+
+
+class FigureSnapshot(object):
+    """ a copy of a figure to render in another thread, taken on the main thread """
+    def __init__(self, fig):
+        super().__init__()
+        self.arrays = [] # shared with the live figure, which replaces its line data instead of writing into it
+        buf = io.BytesIO()
+        _SharingPickler(buf, self.arrays).dump(fig)
+        self.data = buf.getvalue()
+
+    def restore(self):
+        """ the figure copy on an Agg canvas, artists animated for blitting are drawn normally """
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        fig = _SharingUnpickler(io.BytesIO(self.data), self.arrays).load()
+        FigureCanvasAgg(fig)
+        for art in fig.findobj(lambda a: a.get_animated()):
+            art.set_animated(False)
+        return fig
+
+
+def ExportFigure(snapshot:FigureSnapshot, fn, dpi=300, sources=None, sampling=None,
+                 progressFunc=None, isCancelled=None):
+    """ save the figure snapshot to fn (format by extension), return a dict of export stats.
+        - sources: {(axes index, line index): (x, y)} full data of lines decimated to the screen
+        - progressFunc: called as func(percent, stage)
+        - isCancelled: polled between lines, raise ExportCancelled when True
+    """
+    def progress(percent, stage):
+        if isCancelled and isCancelled():
+            raise ExportCancelled(fn)
+        if progressFunc:
+            progressFunc(percent, stage)
+
+    t0 = time.perf_counter()
+    progress(0, 'copy')
+    fig = snapshot.restore()
+    vector = OutputFormat(fn) in VECTOR_FORMATS
+    axes = fig.get_axes()
+    stats = {'format': OutputFormat(fn), 'dpi': dpi, 'points': 0, 'points_out': 0, 'rasterized': 0}
+    for k, ax in enumerate(axes):
+        lineSources = {i: xy for (a, i), xy in (sources or {}).items() if a == k}
+        kwargs = {'sampling': sampling} if sampling else {}
+        before, after, nRaster = FitLinesToOutput(
+            ax, dpi, vector=vector, sources=lineSources,
+            progressFunc=lambda done, n: progress(int(80 * (k + done / max(n, 1)) / len(axes)), 'decimate'),
+            **kwargs)
+        stats['points'] += before
+        stats['points_out'] += after
+        stats['rasterized'] += nRaster
+    progress(80, 'render')
+    # tight box from the artist extents, bbox_inches='tight' would render the figure one extra time
+    bbox = fig.get_tightbbox(fig.canvas.get_renderer()).padded(0.2)
+    fig.savefig(fn, dpi=dpi, bbox_inches=bbox)
+    stats['seconds'] = time.perf_counter() - t0
+    progress(100, 'done')
+    return stats
+
+
+class ExportSignals(QtCore.QObject):
+    progress  = QtCore.pyqtSignal(int, str) # (percent, stage)
+    finished  = QtCore.pyqtSignal(str, object) # (fn, stats dict)
+    cancelled = QtCore.pyqtSignal(str) # fn
+    failed    = QtCore.pyqtSignal(str, str) # (fn, error message)
+    ended     = QtCore.pyqtSignal() # after any of the above
+
+
+class ExportTask(QtCore.QRunnable):
+    """ export a figure snapshot in a pool thread """
+    def __init__(self, snapshot, fn, dpi=300, sources=None, sampling=None):
+        super().__init__()
+        self.setAutoDelete(False) # owner keeps the reference until finished
+        self.snapshot = snapshot
+        self.filename = fn
+        self.dpi = dpi
+        self.sources = sources
+        self.sampling = sampling
+        self.signals = ExportSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def isCancelled(self):
+        return self._cancel.is_set()
+
+    def run(self):
+        try:
+            stats = ExportFigure(self.snapshot, self.filename, self.dpi, self.sources, self.sampling,
+                                 progressFunc=self.signals.progress.emit, isCancelled=self.isCancelled)
+        except ExportCancelled:
+            self.signals.cancelled.emit(self.filename)
+        except Exception as e:
+            self.signals.failed.emit(self.filename, repr(e))
+        else:
+            self.signals.finished.emit(self.filename, stats)
+        finally:
+            self.signals.ended.emit()
+
+
+def StartExport(task:ExportTask):
+    """ run the task on the global thread pool, it is referenced until it ends """
+    _running.add(task)
+    task.signals.ended.connect(lambda: _running.discard(task))
+    QtCore.QThreadPool.globalInstance().start(task)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: file_cache.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Binary cache of parsed data files.
+
+Each parsed file is stored as one .npy file per column, keyed by the file's path,
+mtime and size. A cached file is opened with mmap, so it loads in milliseconds and
+its pages are only read when they are touched. The least recently used entries
+are evicted when the cache grows over its size cap.
+"""
+import os
+import json
+import shutil
+import hashlib
+import threading
+
+import numpy as np
+
+
+CACHE_VERSION = 1
+META_FILE = 'meta.json'
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.ezplot', 'cache')
+
+_lock = threading.Lock() # store/evict may run from several loader threads
+
+
+def _DirSize(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+
+class FileCache(object):
+    """ mmap-able columnar cache of parsed dataFrames
+        - cacheDir: cache root folder, one sub folder per cached file
+        - maxBytes: size cap, least recently used entries are evicted beyond it
+    """
+    def __init__(self, cacheDir=DEFAULT_CACHE_DIR, maxBytes=2*2**30):
+        super().__init__()
+        self.cache_dir = cacheDir
+        self.max_bytes = maxBytes
+
+    def entryKey(self, fn, variant=''):
+        """ cache key of the current file state, changes when the file is modified """
+        st = os.stat(fn)
+        ident = '%s|%d|%d|%s|%d' % (os.path.abspath(fn), st.st_mtime_ns, st.st_size, variant, CACHE_VERSION)
+        return hashlib.sha1(ident.encode('utf-8')).hexdigest()
+
+    def entryDir(self, fn, variant=''):
+        return os.path.join(self.cache_dir, self.entryKey(fn, variant))
+
+    def load(self, fn, variant=''):
+        """ return the cached dataFrame (memory mapped) or None if not cached / file changed """
+        import pandas as pd
+        try:
+            entry = self.entryDir(fn, variant)
+            metaFile = os.path.join(entry, META_FILE)
+            with open(metaFile, 'r') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            cols = {}
+            for col in meta['columns']:
+                path = os.path.join(entry, col['file'])
+                if col['kind'] == 'npy':
+                    cols[col['name']] = np.load(path, mmap_mode='r')
+                elif col['kind'] == 'category':
+                    codes = np.load(path, mmap_mode='r')
+                    cols[col['name']] = pd.Categorical.from_codes(codes, categories=col['categories'])
+                else: # pickled object column
+                    cols[col['name']] = pd.read_pickle(path)
+            df = pd.DataFrame(cols, index=pd.RangeIndex(meta['nrows']), columns=[c['name'] for c in meta['columns']],
+                              copy=False)
+        except Exception: # broken entry
+            shutil.rmtree(entry, ignore_errors=True)
+            return None
+        os.utime(metaFile) # mark as recently used for LRU
+        return df
+
+    def store(self, fn, df, variant=''):
+        """ write the dataFrame to cache, return False if it can not be cached """
+        import pandas as pd
+        if not isinstance(df.index, pd.RangeIndex) or df.columns.has_duplicates:
+            return False
+        entry = self.entryDir(fn, variant)
+        tmp = '%s.%d.%d.tmp' % (entry, os.getpid(), threading.get_ident())
+        try:
+            os.makedirs(tmp, exist_ok=True)
+            columns = []
+            for i, name in enumerate(df.columns):
+                col = df[name]
+                meta = {'name': name, 'file': 'c%d' % i}
+                if isinstance(col.dtype, np.dtype) and col.dtype.kind in 'biufmM':
+                    meta.update(kind='npy', file=meta['file'] + '.npy')
+                    np.save(os.path.join(tmp, meta['file']), np.ascontiguousarray(col.to_numpy()))
+                elif isinstance(col.dtype, pd.CategoricalDtype):
+                    meta.update(kind='category', file=meta['file'] + '.npy', categories=col.cat.categories.tolist())
+                    np.save(os.path.join(tmp, meta['file']), col.cat.codes.to_numpy())
+                else:
+                    meta.update(kind='pickle', file=meta['file'] + '.pkl')
+                    col.to_pickle(os.path.join(tmp, meta['file']))
+                columns.append(meta)
+            with open(os.path.join(tmp, META_FILE), 'w') as f:
+                json.dump({'source': os.path.abspath(fn), 'nrows': len(df), 'columns': columns}, f)
+            with _lock:
+                if os.path.isdir(entry):
+                    shutil.rmtree(entry, ignore_errors=True)
+                os.replace(tmp, entry)
+        except (OSError, TypeError, ValueError):
+            shutil.rmtree(tmp, ignore_errors=True)
+            return False
+        self.evict(keep=entry)
+        return True
+
+    def entries(self):
+        """ [(lastUsedTime, size, path)] of all cache entries """
+        result = []
+        if not os.path.isdir(self.cache_dir):
+            return result
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            metaFile = os.path.join(path, META_FILE)
+            if name.endswith('.tmp') or not os.path.isfile(metaFile):
+                continue
+            result.append((os.path.getmtime(metaFile), _DirSize(path), path))
+        return result
+
+    def evict(self, keep=None):
+        """ remove least recently used entries until the cache fits in max_bytes """
+        with _lock:
+            entries = sorted(self.entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                shutil.rmtree(path, ignore_errors=True) # mapped files stay readable on posix
+                total -= size
+
+    def clear(self):
+        with _lock:
+            for _, _, path in self.entries():
+                shutil.rmtree(path, ignore_errors=True)
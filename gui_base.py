@@ -13,6 +13,7 @@ Python 3 only.
 
 import os
 import sys
+import difflib
 import numpy as np
 from os.path import split, abspath, exists
 from collections import OrderedDict, Iterable, Mapping
@@ -22,34 +23,28 @@ from PyQt5.QtGui import QPalette, QTextCursor
 from PyQt5.QtWidgets import QCheckBox, QComboBox, QDoubleSpinBox, QFileDialog, QFormLayout, QFrame, \
     QGroupBox, QHBoxLayout, QHeaderView, QLabel, QLayout, QLineEdit, QMessageBox, \
     QPushButton, QSpinBox, QTabWidget, QTableWidget, QTableWidgetItem, \
-    QTextEdit, QVBoxLayout, QWidget, QListWidget, QAbstractItemView, QSizePolicy, QListWidgetItem
+    QTextEdit, QVBoxLayout, QWidget, QListWidget, QAbstractItemView, QSizePolicy, QListWidgetItem, QProgressBar
 
 
 ###############################################################################
-# TODO
-# def makeProgressBar(self):
-#     pbar = QProgressBar(self)
-#     style ="""
-#     QProgressBar {
-#         border: 2px solid grey;
-#         border-radius: 5px;
-#         text-align: center;
-#     }
-#     QProgressBar::chunk {
-#         background-color: #37DA7E;
-#         width: 20px;
-#     }"""
-#     pbar.setStyleSheet(style)
-#     # self.pbar.setMaximumHeight(10)
-#     # self.pbar.setMinimumWidth(400)
-#     return pbar
-#
-# def addProgressBar(self, num):
-#     self.pbar.setValue(self.pbar.value()+num)
-#
-# # def expandProgressBarMax(self, num):
-# #     """ expand progress bar range. """
-# #     self.pbar.setMaximum(self.pbar.maximum()+num)
+
+def MakeProgressBar(minWidth=None, maxWidth=None, maxHeight=None, tooltip=None):
+    pbar = QProgressBar()
+    style ="""
+    QProgressBar {
+        border: 1px solid grey;
+        border-radius: 3px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        background-color: #37DA7E;
+    }"""
+    pbar.setStyleSheet(style)
+    if tooltip : pbar.setToolTip(tooltip)
+    if minWidth is not None  : pbar.setMinimumWidth(minWidth)
+    if maxWidth is not None  : pbar.setMaximumWidth(maxWidth)
+    if maxHeight is not None : pbar.setMaximumHeight(maxHeight)
+    return pbar
 
 
 def absjoin(path, *paths):
@@ -603,8 +598,42 @@ class ComboBox(QComboBox):
         if default in self.valueList:
             self._default = default
             self.setDefault()
-        
-    
+
+
+    def updateItems(self, textList, valueList=None):
+        """ change the items with the fewest inserts/removes, unlike resetItems the
+            selected value is kept if still listed, and the connectFunc is only called
+            if the selected value changed
+        """
+        valueList = list(valueList) if valueList else list(textList)
+        textList = list(textList)
+        assert len(textList)==len(valueList)
+        oldValue = self.getValue()
+
+        self.blockSignals(True)
+        matcher = difflib.SequenceMatcher(None, self.valueList, valueList, autojunk=False)
+        for tag, i1, i2, j1, j2 in reversed(matcher.get_opcodes()): # from the end, indexes stay valid
+            if tag == 'equal':
+                for i, j in zip(range(i1, i2), range(j1, j2)):
+                    if self.itemText(i) != textList[j]:
+                        self.setItemText(i, textList[j])
+                continue
+            for i in reversed(range(i1, i2)): # delete / replace
+                self.removeItem(i)
+            for k, j in enumerate(range(j1, j2)): # insert / replace
+                self.insertItem(i1 + k, textList[j])
+        self.textList = textList
+        self.valueList = valueList
+        if oldValue in valueList:
+            self.setCurrentIndex(valueList.index(oldValue))
+        elif valueList:
+            self.setCurrentIndex(0)
+        self.blockSignals(False)
+
+        if self.getValue() != oldValue:
+            self.currentIndexChanged.emit(self.currentIndex())
+
+
     def setConnectFunc(self, func):
         self.currentIndexChanged.connect(func)
 
@@ -0,0 +1,218 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: load_worker.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Background data file loading on the Qt thread pool, and the reads of followed files.
+"""
+import os
+import threading
+
+from PyQt5 import QtCore
+
+from profiler import PROFILER
+
+
+class LoadSignals(QtCore.QObject):
+    """ signals of a LoadTask, QRunnable is not a QObject so signals live here """
+    progress  = QtCore.pyqtSignal(str, 'qint64', 'qint64', 'qint64') # (fn, bytesRead, totalBytes, rowsParsed), 64 bit for files over 2 GB
+    finished  = QtCore.pyqtSignal(str, object) # (fn, LoadResult)
+    cancelled = QtCore.pyqtSignal(str) # fn
+    failed    = QtCore.pyqtSignal(str, str) # (fn, error message)
+
+
+class LoadTask(QtCore.QRunnable):
+    """ load one data file in a pool thread, text files are parsed chunk by chunk
+        so the progress can be reported and the task can be cancelled in between.
+    """
+    def __init__(self, fn, compact=False, lazy=False, cache=None):
+        super().__init__()
+        self.setAutoDelete(False) # owner keeps the reference until finished
+        self.datafile = fn
+        self.compact = compact
+        self.lazy = lazy
+        self.cache = cache
+        self.signals = LoadSignals()
+        self.bytes_total = os.path.getsize(fn)
+        self.bytes_read = 0
+        self.rows_parsed = 0
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def isCancelled(self):
+        return self._cancel.is_set()
+
+    def onProgress(self, bytesRead, totalBytes, rowsParsed):
+        self.bytes_read, self.bytes_total, self.rows_parsed = bytesRead, totalBytes, rowsParsed
+        self.signals.progress.emit(self.datafile, bytesRead, totalBytes, rowsParsed)
+
+    def run(self):
+        from data_loader import LoadDataFrame, LoadCancelled # pandas is imported in the pool thread
+        try:
+            with PROFILER.span('read', file=os.path.basename(self.datafile)):
+                result = LoadDataFrame(self.datafile, progressFunc=self.onProgress, isCancelled=self.isCancelled,
+                                       compact=self.compact, lazy=self.lazy, cache=self.cache)
+        except LoadCancelled:
+            self.signals.cancelled.emit(self.datafile)
+        except Exception as e:
+            self.signals.failed.emit(self.datafile, repr(e))
+        else:
+            if self.isCancelled():
+                self.signals.cancelled.emit(self.datafile)
+            else:
+                self.signals.finished.emit(self.datafile, result)
+
+
+class FollowSignals(QtCore.QObject):
+    """ signals of a FollowTask """
+    read      = QtCore.pyqtSignal(str, 'qint64', 'qint64', object) # (fn, offset, endOffset, DataFrame or None)
+    truncated = QtCore.pyqtSignal(str) # fn
+    failed    = QtCore.pyqtSignal(str, str) # (fn, error message)
+
+
+class FollowTask(QtCore.QRunnable):
+    """ read & parse the lines appended to a followed file in a pool thread """
+    def __init__(self, fn, offset, columnNames, sep=','):
+        super().__init__()
+        self.setAutoDelete(False) # owner keeps the reference until finished
+        self.datafile = fn
+        self.offset = offset
+        self.column_names = list(columnNames)
+        self.sep = sep
+        self.signals = FollowSignals()
+
+    def run(self):
+        from log_follower import ReadAppended, FileTruncated # pandas is imported in the pool thread
+        try:
+            endOffset, df = ReadAppended(self.datafile, self.offset, self.column_names, self.sep)
+        except FileTruncated:
+            self.signals.truncated.emit(self.datafile)
+        except Exception as e:
+            self.signals.failed.emit(self.datafile, repr(e))
+        else:
+            self.signals.read.emit(self.datafile, self.offset, endOffset, df)
+
+
+class LoadManager(QtCore.QObject):
+    """ run LoadTasks in parallel on the global thread pool and keep track of them """
+
+    signal_progress = QtCore.pyqtSignal(int, 'qint64', 'qint64', 'qint64') # (nFiles, bytesRead, totalBytes, rowsParsed) of all tasks
+    signal_loaded = QtCore.pyqtSignal(str, object) # (fn, LoadResult)
+    signal_load_failed = QtCore.pyqtSignal(str, str) # (fn, message)
+    signal_idle = QtCore.pyqtSignal() # all tasks done
+    signal_follow_read = QtCore.pyqtSignal(str, 'qint64', 'qint64', object) # (fn, offset, endOffset, DataFrame or None)
+    signal_follow_truncated = QtCore.pyqtSignal(str) # fn
+    signal_follow_failed = QtCore.pyqtSignal(str, str) # (fn, message)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QtCore.QThreadPool.globalInstance()
+        self.pool.setMaxThreadCount(max(os.cpu_count() or 1, 2))
+        self.cache = None # FileCache shared by all tasks, None to disable
+        self.tasks = {} # fn => LoadTask, the active tasks
+        self.reads = {} # fn => FollowTask, the reads of followed files going on
+        self._running = set() # all started tasks incl. cancelled ones, keep refs alive until they end
+
+    def isBusy(self):
+        return bool(self.tasks)
+
+    def load(self, fn, compact=False, lazy=False):
+        """ start loading file in background, a file being loaded is restarted """
+        if fn in self.tasks:
+            self.tasks.pop(fn).cancel()
+        task = LoadTask(fn, compact=compact, lazy=lazy, cache=self.cache)
+        task.signals.progress.connect(self.onTaskProgress)
+        task.signals.finished.connect(self.onTaskFinished)
+        task.signals.cancelled.connect(self.onTaskCancelled)
+        task.signals.failed.connect(self.onTaskFailed)
+        self.tasks[fn] = task
+        self._running.add(task)
+        self.pool.start(task)
+        self.onTaskProgress(fn, 0, task.bytes_total, 0)
+
+    def readAppended(self, fn, offset, columnNames, sep=','):
+        """ start reading the lines of a followed file past offset, one read per file at a time,
+            return False if the file is still being read
+        """
+        if fn in self.reads:
+            return False
+        task = FollowTask(fn, offset, columnNames, sep)
+        task.signals.read.connect(self.onReadDone)
+        task.signals.truncated.connect(self.onReadTruncated)
+        task.signals.failed.connect(self.onReadFailed)
+        self.reads[fn] = task
+        self._running.add(task)
+        self.pool.start(task)
+        return True
+
+    def cancelAll(self):
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+        self.signal_idle.emit()
+
+    def _popTask(self, fn):
+        """ drop the ended task, return False if it has been cancelled or replaced """
+        signals = self.sender()
+        self._running = {t for t in self._running if t.signals is not signals}
+        task = self.tasks.get(fn)
+        if task is None or task.signals is not signals:
+            return False
+        del self.tasks[fn]
+        return not task.isCancelled()
+
+    def _popRead(self, fn):
+        signals = self.sender()
+        self._running = {t for t in self._running if t.signals is not signals}
+        if fn in self.reads and self.reads[fn].signals is signals:
+            del self.reads[fn]
+
+    def _checkIdle(self):
+        if not self.tasks:
+            self.signal_idle.emit()
+        else:
+            self.onTaskProgress()
+
+    @QtCore.pyqtSlot(str, 'qint64', 'qint64', 'qint64')
+    def onTaskProgress(self, *args):
+        tasks = self.tasks.values()
+        self.signal_progress.emit(len(self.tasks),
+                                  sum(t.bytes_read for t in tasks),
+                                  sum(t.bytes_total for t in tasks),
+                                  sum(t.rows_parsed for t in tasks))
+
+    @QtCore.pyqtSlot(str, object)
+    def onTaskFinished(self, fn, result):
+        if self._popTask(fn):
+            self.signal_loaded.emit(fn, result)
+        self._checkIdle()
+
+    @QtCore.pyqtSlot(str)
+    def onTaskCancelled(self, fn):
+        self._popTask(fn)
+        self._checkIdle()
+
+    @QtCore.pyqtSlot(str, str)
+    def onTaskFailed(self, fn, msg):
+        if self._popTask(fn):
+            self.signal_load_failed.emit(fn, msg)
+        self._checkIdle()
+
+    @QtCore.pyqtSlot(str, 'qint64', 'qint64', object)
+    def onReadDone(self, fn, offset, endOffset, df):
+        self._popRead(fn)
+        self.signal_follow_read.emit(fn, offset, endOffset, df)
+
+    @QtCore.pyqtSlot(str)
+    def onReadTruncated(self, fn):
+        self._popRead(fn)
+        self.signal_follow_truncated.emit(fn)
+
+    @QtCore.pyqtSlot(str, str)
+    def onReadFailed(self, fn, msg):
+        self._popRead(fn)
+        self.signal_follow_failed.emit(fn, msg)
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: log_follower.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Follow a growing text log file, parsing only the bytes appended since last read.
+"""
+import io
+import os
+
+import numpy as np
+from PyQt5 import QtCore
+
+
+GROW_MIN_ROWS = 4096 # initial rows of the column buffers of a followed file
+
+
+def _ColumnValues(col):
+    """ the column as a numpy array, text & categoricals as objects """
+    values = col.to_numpy()
+    return values if values.dtype.kind in 'biufcmM' else col.to_numpy(dtype=object)
+
+
+def _CommonDtype(a, b):
+    try:
+        return np.result_type(a, b)
+    except TypeError: # e.g. datetime & float
+        return np.dtype(object)
+
+
+class GrowingFrame(object):
+    """ The rows of a followed file in column buffers that grow by doubling, so appending costs
+        O(new rows) amortized instead of copying the whole frame on every poll.
+        frame() is a DataFrame of views on the buffers. Appends only write past the rows already
+        in a view and a full buffer is replaced, not rewritten, so earlier views (e.g. the data of
+        plotted lines) stay valid. Text & categorical columns are kept as object arrays.
+        - window: keep the last n rows only, 0 keeps all
+    """
+    def __init__(self, df, window=0):
+        super().__init__()
+        self.columns = list(df.columns)
+        self.window = window
+        self.start, self.stop = 0, len(df)
+        self.buffers = {}
+        self._realloc({name: _ColumnValues(df[name]) for name in self.columns}, 2 * len(df))
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def last(self, name):
+        """ value of the column in the last row """
+        return self.buffers[name][self.stop - 1]
+
+    def _realloc(self, values, capacity):
+        """ new buffers holding the values (name => array) at their head """
+        capacity = max(capacity, GROW_MIN_ROWS)
+        for name, arr in values.items():
+            buf = np.empty(capacity, dtype=arr.dtype)
+            buf[:len(arr)] = arr
+            self.buffers[name] = buf
+        self.start, self.stop = 0, len(next(iter(values.values()), ()))
+
+    def append(self, rows):
+        """ append the rows of a DataFrame (missing columns are NaN),
+            return the number of rows dropped from the head by the window
+        """
+        n = len(rows)
+        new = {name: _ColumnValues(rows[name]) if name in rows.columns else np.full(n, np.nan)
+               for name in self.columns}
+        start = self.start
+        if self.window and len(self) + n > self.window:
+            start = self.stop + n - self.window
+        dropped = start - self.start
+        dtypes = {name: _CommonDtype(self.buffers[name].dtype, arr.dtype) for name, arr in new.items()}
+        capacity = len(self.buffers[self.columns[0]]) if self.columns else 0
+        if self.stop + n > capacity or any(dtypes[name] != self.buffers[name].dtype for name in self.columns):
+            # new buffers of the kept rows & the new ones, the window's rows only
+            kept = max(start, self.start)
+            values = {}
+            for name, arr in new.items():
+                old = self.buffers[name][kept:self.stop]
+                values[name] = np.concatenate([old.astype(dtypes[name], copy=False),
+                                               arr[max(start - self.stop, 0):].astype(dtypes[name], copy=False)])
+            self._realloc(values, 2 * len(next(iter(values.values()), ())))
+            return dropped
+        for name, arr in new.items():
+            self.buffers[name][self.stop:self.stop + n] = arr
+        self.start, self.stop = start, self.stop + n
+        return dropped
+
+    def frame(self):
+        """ DataFrame of the rows, the columns are views on the buffers (no copy) """
+        import pandas as pd
+        return pd.DataFrame({name: pd.Series(self.buffers[name][self.start:self.stop],
+                                             dtype=self.buffers[name].dtype, copy=False)
+                             for name in self.columns}, copy=False)
+
+
+class FileTruncated(Exception):
+    """ a followed file got shorter than the bytes already read (rewritten/rotated) """
+
+
+def ReadAppended(fn, offset, columnNames, sep=','):
+    """ parse the complete lines of a text table file past offset,
+        return (offset past the lines parsed, DataFrame of their rows or None if none).
+        A partially written last line is left for the next read.
+        Raise FileTruncated if the file got shorter than offset.
+    """
+    try:
+        size = os.path.getsize(fn)
+    except OSError: # e.g. being replaced, try again next time
+        return offset, None
+    if size < offset:
+        raise FileTruncated(fn)
+    if size == offset:
+        return offset, None
+    with open(fn, 'rb') as f:
+        f.seek(offset)
+        data = f.read(size - offset)
+    end = data.rfind(b'\n')
+    if end < 0: # no complete line yet
+        return offset, None
+    data = data[:end + 1]
+    if not data.strip():
+        return offset + len(data), None
+    import pandas as pd
+    return offset + len(data), pd.read_csv(io.BytesIO(data), header=None, names=list(columnNames), sep=sep,
+                                           index_col=False)
+
+
+class FileFollower(QtCore.QObject):
+    """ Poll a text table file and emit the rows appended to it.
+        The appended lines are read & parsed in a pool thread by the LoadManager, one read at a time.
+        Only complete lines are parsed, a partially written last line waits for the next poll.
+    """
+    signal_appended = QtCore.pyqtSignal(str, object) # (fn, DataFrame of new rows)
+    signal_truncated = QtCore.pyqtSignal(str) # fn, file got shorter (rewritten/rotated)
+    signal_failed = QtCore.pyqtSignal(str, str) # (fn, error message)
+
+    def __init__(self, fn, columnNames, offset, loader, interval=1000, sep=',', parent=None):
+        """ - columnNames: names of the file columns in order
+            - offset: byte offset to start reading from, i.e. the line end where the loader stopped parsing
+            - loader: the LoadManager running the reads
+            - interval: poll interval in ms
+        """
+        super().__init__(parent)
+        self.datafile = fn
+        self.column_names = list(columnNames)
+        self.offset = offset
+        self.sep = sep
+        self.loader = loader
+        loader.signal_follow_read.connect(self.onRead)
+        loader.signal_follow_truncated.connect(self.onTruncated)
+        loader.signal_follow_failed.connect(self.onFailed)
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.poll)
+        self.setInterval(interval)
+
+    def setInterval(self, interval):
+        self._timer.setInterval(max(int(interval), 50))
+
+    def start(self):
+        self._timer.start()
+
+    def stop(self):
+        self._timer.stop()
+
+    def isActive(self):
+        return self._timer.isActive()
+
+    def renameColumn(self, oldName, newName):
+        self.column_names = [newName if n==oldName else n for n in self.column_names]
+
+    @QtCore.pyqtSlot()
+    def poll(self):
+        """ start reading the appended lines, unless the previous read is still going """
+        self.loader.readAppended(self.datafile, self.offset, self.column_names, self.sep)
+
+    @QtCore.pyqtSlot(str, 'qint64', 'qint64', object) # (fn, offset, endOffset, DataFrame or None)
+    def onRead(self, fn, offset, endOffset, df):
+        if fn != self.datafile or offset != self.offset or not self.isActive(): # stopped while reading
+            return
+        self.offset = endOffset
+        if df is not None and not df.empty:
+            df.columns = self.column_names # renamed while reading
+            self.signal_appended.emit(fn, df)
+
+    @QtCore.pyqtSlot(str)
+    def onTruncated(self, fn):
+        if fn == self.datafile and self.isActive():
+            self.stop()
+            self.signal_truncated.emit(fn)
+
+    @QtCore.pyqtSlot(str, str)
+    def onFailed(self, fn, msg):
+        if fn == self.datafile and self.isActive():
+            self.stop()
+            self.signal_failed.emit(fn, msg)
@@ -0,0 +1,500 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: plot_api.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+The load -> select -> style -> render pipeline without any Qt widget, shared by
+the GUI (EzPlot.plot) and the headless batch renderer (ezplot_batch.py).
+matplotlib & pandas are imported at first use, importing this module is cheap.
+"""
+import os
+import time
+from collections import OrderedDict
+
+from decimation import DecimateIndex, SAMPLING_STRIDE, SAMPLING_MINMAX
+
+
+_theme_styles = None # style names, listing them parses the whole matplotlib style library
+_theme_params = {} # style name => resolved rcParams dict
+_plot_pool = None # ThreadPoolExecutor of PreparePlotData
+THEME_SKIP_PARAMS = ('backend', 'backend_fallback', 'interactive', 'toolbar', 'timezone', 'date.epoch',
+                     'figure.max_open_warning', 'figure.raise_window', 'savefig.directory',
+                     'tk.window_focus', 'docstring.hardcopy') # not style, as style sheets ignore them
+THEME_LINE_PARAMS = (('linestyle', 'lines.linestyle'), ('linewidth', 'lines.linewidth'),
+                     ('marker', 'lines.marker'), ('markersize', 'lines.markersize'))
+VECTOR_FORMATS = ('pdf', 'svg', 'svgz', 'eps', 'ps')
+DECIMATE_POINTS_PER_PIXEL = 4 # output lines denser than this are decimated (min & max per pixel column stay)
+
+
+class UserDefinedStyle(object):
+
+    def __init__(self):
+        super().__init__()
+        self.line_style         = ''
+        self.line_width_offset  = 0
+        self.marker             = ''
+        self.marker_size_offset = 0
+        self.secondary_y        = False # plotted on the secondary y axes of its subplot
+        # self.line_color         = None
+        # self.marker_facecolor   = None
+        # self.marker_edgecolor   = None
+
+    def __bool__(self):
+        """ return True if any of the styles is given """
+        return bool(
+            self.line_style or self.line_width_offset or self.marker or self.marker_size_offset or
+            self.secondary_y )
+
+
+    def apply(self, line):
+        """ apply user defined plot style to given line"""
+        if self.line_style:
+            line.set_linestyle(self.line_style)
+        if self.line_width_offset:
+            line.set_linewidth(self.line_width_offset + line.get_linewidth())
+        if self.marker:
+            line.set_marker(self.marker)
+        if self.marker_size_offset:
+            line.set_markersize(self.marker_size_offset + line.get_markersize())
+        # if self.line_color is not None:
+        #     line.set_color(self.line_color)
+        # if self.marker_facecolor is not None:
+        #     line.set_markerfacecolor(self.marker_facecolor)
+        # if self.marker_edgecolor is not None:
+        #     line.set_markeredgecolor(self.marker_edgecolor)
+
+    def toDict(self):
+        return {k: getattr(self, k) for k in ('line_style', 'line_width_offset', 'marker', 'marker_size_offset',
+                                              'secondary_y')}
+
+    @classmethod
+    def fromDict(cls, d):
+        sty = cls()
+        for k, v in (d or {}).items():
+            if hasattr(sty, k):
+                setattr(sty, k, v)
+        return sty
+
+
+###############################################################################
+# pipeline stages
+
+def GetPlotThemeSyles():
+    global _theme_styles
+    if _theme_styles is None:
+        from matplotlib import style
+        _theme_styles = ['default', 'classic'] + sorted(
+            sty for sty in style.available if sty != 'classic')
+    return _theme_styles
+
+
+def ThemeParams(styleName):
+    """ rcParams of the theme (defaults + style sheet), resolved once then cached.
+        Resolving goes through the global rcParams, so call it from the main thread first.
+    """
+    params = _theme_params.get(styleName)
+    if params is None:
+        import matplotlib as plt
+        from matplotlib import style
+        with plt.rc_context():
+            plt.rcdefaults()
+            style.use(styleName)
+            params = {k: v for k, v in plt.rcParams.items() if k not in THEME_SKIP_PARAMS}
+        _theme_params[styleName] = params
+    return params
+
+
+def ThemeLineProps(params):
+    """ {line property: value} of plain lines in the theme """
+    return {prop: params[key] for prop, key in THEME_LINE_PARAMS}
+
+
+def ThemeArtists(fig, axes, params):
+    """ re-color & re-size the existing figure, axes, ticks, labels and lines by theme params,
+        without touching the global rcParams. Lines get the theme's colors in plot order
+        and the axes color cycle continues after them.
+        - axes: an Axes, or a list of color groups, each an Axes or a list of Axes whose lines
+                share one color cycle (e.g. a subplot & its secondary y axes)
+    """
+    fig.set_facecolor(params['figure.facecolor'])
+    fig.set_edgecolor(params['figure.edgecolor'])
+    for group in (axes if isinstance(axes, list) else [axes]):
+        group = group if isinstance(group, list) else [group]
+        for ax in group:
+            _ThemeAxes(ax, params)
+        _ThemeLines(group, params)
+
+
+def _ThemeAxes(axes, params):
+    axes.set_facecolor(params['axes.facecolor'])
+    axes.set_axisbelow(params['axes.axisbelow'])
+    for side, axsp in axes.spines.items():
+        axsp.set_edgecolor(params['axes.edgecolor'])
+        axsp.set_linewidth(params['axes.linewidth'])
+        axsp.set_alpha(1.0)
+        axsp.set_visible(params.get('axes.spines.' + side, True))
+    for ax in ('x', 'y'):
+        color = params[ax + 'tick.color']
+        labelColor = params[ax + 'tick.labelcolor']
+        axes.tick_params(axis=ax, which='major', color=color,
+                         labelcolor=color if labelColor == 'inherit' else labelColor,
+                         direction=params[ax + 'tick.direction'],
+                         length=params[ax + 'tick.major.size'], width=params[ax + 'tick.major.width'],
+                         grid_color=params['grid.color'], grid_linewidth=params['grid.linewidth'],
+                         grid_alpha=params['grid.alpha'])
+    axes.xaxis.label.set_color(params['axes.labelcolor'])
+    axes.yaxis.label.set_color(params['axes.labelcolor'])
+    titleColor = params['axes.titlecolor']
+    axes.title.set_color(params['text.color'] if titleColor == 'auto' else titleColor)
+
+
+def _ThemeLines(group, params):
+    """ color the lines of the axes group in one cycle, lines plotted later continue it """
+    from cycler import cycler
+    cycle = list(params['axes.prop_cycle'])
+    lineProps = ThemeLineProps(params)
+    lines = [line for ax in group for line in ax.get_lines()]
+    for i, line in enumerate(lines):
+        line.set(**lineProps)
+        if cycle and 'color' in cycle[i % len(cycle)]:
+            line.set_color(cycle[i % len(cycle)]['color'])
+    if cycle:
+        n = len(lines) % len(cycle)
+        rotated = cycle[n:] + cycle[:n]
+        for ax in group:
+            ax.set_prop_cycle(cycler(**{k: [entry[k] for entry in rotated] for k in rotated[0]}))
+
+
+def ApplyTheme(fig, axes, styleName):
+    """ make the theme current (for the artists created later) and restyle the existing ones,
+        return the theme params
+    """
+    import matplotlib as plt
+    params = ThemeParams(styleName)
+    plt.rcParams.update(params)
+    ThemeArtists(fig, axes, params)
+    return params
+
+
+def RenderThemeThumbnail(styleName, series, width=180, height=120, dpi=60):
+    """ render [(x, y)] series with the theme to RGBA bytes, return (width, height, bytes).
+        The global rcParams are not touched, so it runs off the main thread once
+        ThemeParams(styleName) is cached.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    params = ThemeParams(styleName)
+    fig = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes((0.1, 0.1, 0.86, 0.76))
+    for x, y in series:
+        ax.plot(x, y)
+    ax.set_title(styleName, fontsize=9)
+    ax.tick_params(labelsize=6)
+    ax.margins(x=0)
+    if params['axes.grid']:
+        ax.grid(True)
+    ThemeArtists(fig, ax, params)
+    canvas.draw()
+    w, h = canvas.get_width_height()
+    return w, h, bytes(canvas.buffer_rgba())
+
+
+def ColumnArray(col):
+    """ the values of a column as a numpy array, a view of the stored data where possible.
+        Nullable (extension) numbers become float with NaN, other non-numeric columns object arrays.
+    """
+    values = col.to_numpy()
+    if values.dtype == object and col.dtype.kind in 'biuf': # e.g. Int64 with <NA>
+        values = col.to_numpy(dtype='float64', na_value=float('nan'))
+    return values
+
+
+def IsPlottable(values):
+    return values.dtype.kind in 'biufmM'
+
+
+def SampleArrays(x, y, sampling=SAMPLING_STRIDE, rowSkip=0, nPixels=800):
+    """ the (x, y) to plot by the sampling mode: a strided view in stride mode (no copy),
+        else the decimated points kept for the canvas width (extremes are kept).
+    """
+    if sampling == SAMPLING_STRIDE:
+        return (x[::rowSkip], y[::rowSkip]) if rowSkip > 1 else (x, y)
+    idx = DecimateIndex(x, y, nPixels, mode=sampling)
+    return x[idx], y[idx]
+
+
+def ReadColumns(frame, names):
+    """ {name: array} of the columns of a (lazy) frame, lazy columns are read here """
+    from data_loader import FrameColumns
+    df = FrameColumns(frame, names)
+    return {name: ColumnArray(df[name]) for name in names}
+
+
+def PlotPool():
+    """ worker threads of the plot data preparation, numpy releases the GIL in the heavy parts """
+    global _plot_pool
+    if _plot_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _plot_pool = ThreadPoolExecutor(max_workers=max(os.cpu_count() or 1, 2), thread_name_prefix='plot')
+    return _plot_pool
+
+
+def _MapTasks(func, items):
+    """ [func(item)] computed in the plot pool, in the calling thread if there is a single item """
+    items = list(items)
+    if len(items) < 2:
+        return [func(item) for item in items]
+    return list(PlotPool().map(func, items))
+
+
+def PreparePlotData(series, sampling=SAMPLING_STRIDE, rowSkip=0):
+    """ the (x, y) arrays to plot of many series, prepared concurrently: one task reads the columns
+        of each frame (a frame is only used by its task), then one task samples the series of each axes.
+        Non-numeric y columns are left out.
+        - series: [(key, frame, xName, yName, axes key, nPixels)]
+        return {key: (x, y)}
+    """
+    frames = OrderedDict() # id => (frame, column names)
+    for key, frame, xName, yName, _, _ in series:
+        names = frames.setdefault(id(frame), (frame, []))[1]
+        names.extend(n for n in (xName, yName) if n not in names)
+    columns = dict(zip(frames, _MapTasks(lambda item: ReadColumns(*item), frames.values())))
+
+    perAxes = OrderedDict() # axes key => [(key, x, y, nPixels)]
+    for key, frame, xName, yName, axesKey, nPixels in series:
+        arrays = columns[id(frame)]
+        if IsPlottable(arrays[yName]):
+            perAxes.setdefault(axesKey, []).append((key, arrays[xName], arrays[yName], nPixels))
+
+    def sampleAxes(items):
+        return [(key, SampleArrays(x, y, sampling, rowSkip, nPixels)) for key, x, y, nPixels in items]
+    return OrderedDict(kv for result in _MapTasks(sampleAxes, perAxes.values()) for kv in result)
+
+
+def PlotColumns(ax, frame, xName, ys, sampling=SAMPLING_STRIDE, rowSkip=0, nPixels=None, labels=None):
+    """ plot the y columns of a (lazy) frame against column xName on ax,
+        the column arrays go to Line2D as they are, without pandas plotting.
+        Non-numeric y columns are skipped. Return [(yName, Line2D)] of the new lines.
+        - labels: {yName: line label} for the columns not labeled by their name
+    """
+    if nPixels is None:
+        nPixels = int(ax.bbox.width) # axes width in canvas pixels
+    arrays = ReadColumns(frame, [xName] + [y for y in ys if y != xName])
+    x = arrays[xName]
+    result = []
+    for y in ys:
+        yv = arrays[y]
+        if not IsPlottable(yv):
+            continue
+        xs, yvs = SampleArrays(x, yv, sampling, rowSkip, nPixels)
+        line, = ax.plot(xs, yvs, label=str(labels.get(y, y) if labels else y))
+        result.append((y, line))
+    ax.set_xmargin(0) # x-range tight to the data
+    return result
+
+
+def DecorateAxes(ax, fontSz=11, gridON=True, xlabel='', ylabel='', alpha=1.0):
+    """ tick & label fonts, grid, axis titles and background alpha, all in place """
+    # tick label font size
+    ax.tick_params(labelsize=fontSz)
+
+    # axis grid
+    if gridON:
+        ax.grid(True, linestyle='--')
+    else:
+        ax.grid(False)
+
+    # axis label
+    ax.set_ylabel(ylabel or '')
+    ax.set_xlabel(xlabel or '')
+
+    # axis alpha
+    ax.patch.set_alpha(alpha)
+
+    # axis label font size
+    for item in [ax.title, ax.xaxis.label, ax.yaxis.label]:
+        item.set_fontsize(fontSz)
+
+
+def SetLegendTexts(legn, legnStr):
+    """ set legend from custom text, seperated by comma """
+    if legn is not None and legnStr:
+        for lt, ls in zip(legn.get_texts(), legnStr.split(',')):
+            lt.set_text(ls)
+
+
+def MakeLegend(ax, fontSz=11, legnStr='', handles=None):
+    """ (re)create the legend with font & transparency, return it or None.
+        - handles: the lines to list if not the axes' own (e.g. with those of its secondary y axes)
+    """
+    kwargs = {} if handles is None else {'handles': handles}
+    ax.legend(borderpad=0.2, labelspacing=0.2, framealpha=0.8, fontsize=fontSz, **kwargs)
+    legn = ax.get_legend()
+    SetLegendTexts(legn, legnStr)
+    return legn
+
+
+###############################################################################
+# output resolution
+
+def OutputFormat(fn):
+    return os.path.splitext(fn)[1][1:].lower()
+
+
+def AxesPixelWidth(ax, dpi):
+    """ width of the axes in pixels of an output rendered at dpi """
+    return max(int(ax.get_position().width * ax.figure.get_figwidth() * dpi), 2)
+
+
+def VisibleRows(x, lo, hi):
+    """ (start, stop) rows of a sorted x within the x-limits (one point beyond each edge), None if unsorted """
+    import numpy as np
+    from decimation import IsSorted
+    if x.dtype.kind == 'M': # x-limits are matplotlib date numbers
+        from matplotlib import dates
+        lo, hi = (np.datetime64(dates.num2date(v).replace(tzinfo=None)) for v in (lo, hi))
+    elif x.dtype.kind not in 'biuf':
+        return None
+    if not IsSorted(x):
+        return None
+    i0 = max(int(np.searchsorted(x, lo, side='left')) - 1, 0)
+    i1 = min(int(np.searchsorted(x, hi, side='right')) + 1, len(x))
+    return i0, i1
+
+
+def FitLinesToOutput(ax, dpi, vector=False, sources=None, sampling=SAMPLING_MINMAX, progressFunc=None):
+    """ fit the lines of ax to an output rendered at dpi, return (points before, points after, rasterized lines).
+        Lines without markers that are denser than the output pixel columns are decimated to them within
+        the visible x-range, from the full data of sources when given; in vector output the lines still
+        denser than the pixel columns are rasterized, axes & text stay vectors.
+        - sources: {line index: (x, y)} full column data, e.g. of lines decimated to the screen
+        - progressFunc: called as func(linesDone, nLines)
+    """
+    import numpy as np
+    nPixels = AxesPixelWidth(ax, dpi)
+    lo, hi = ax.get_xlim()
+    mode = sampling if sampling != SAMPLING_STRIDE else SAMPLING_MINMAX
+    lines = ax.get_lines()
+    before = after = nRaster = 0
+    for i, line in enumerate(lines):
+        x, y = sources[i] if sources and i in sources else (line.get_xdata(orig=True), line.get_ydata(orig=True))
+        x, y = np.asarray(x), np.asarray(y)
+        before += len(x)
+        if len(x) > DECIMATE_POINTS_PER_PIXEL * nPixels and line.get_marker() in ('None', 'none', '', ' ', None):
+            rows = VisibleRows(x, lo, hi)
+            if rows is not None:
+                x, y = x[rows[0]:rows[1]], y[rows[0]:rows[1]]
+            idx = DecimateIndex(x, y, nPixels, mode=mode)
+            x, y = x[idx], y[idx]
+            line.set_data(x, y)
+        elif sources and i in sources:
+            line.set_data(x, y)
+        after += len(x)
+        if vector and len(x) > nPixels:
+            line.set_rasterized(True)
+            nRaster += 1
+        if progressFunc:
+            progressFunc(i + 1, len(lines))
+    return before, after, nRaster
+
+
+###############################################################################
+# headless rendering
+
+class PlotJob(object):
+    """ a plot to render headless, built from a dict (e.g. an entry of a job file):
+        - files: data files; x: x column; y: y columns (of every file, or {file: [columns]})
+        - output: output image path, format by extension (png/pdf/svg/...)
+        - optional: style, width, height, dpi, fontsize, grid, legend, legend_text, title,
+                    xlabel, ylabel, alpha, sampling, skip, styles {column: UserDefinedStyle dict},
+                    compact
+    """
+    defaults = {
+        'style': 'default', 'width': 8.0, 'height': 4.5, 'dpi': 150,
+        'fontsize': 11, 'grid': True, 'legend': True, 'legend_text': '',
+        'title': '', 'xlabel': '', 'ylabel': '', 'alpha': 1.0,
+        'sampling': SAMPLING_STRIDE, 'skip': 0, 'styles': {}, 'compact': False,
+    }
+
+    def __init__(self, spec:dict, defaults:dict=None):
+        super().__init__()
+        opts = dict(self.defaults)
+        opts.update(defaults or {})
+        opts.update(spec)
+        missing = [k for k in ('files', 'x', 'y', 'output') if k not in opts]
+        if missing:
+            raise ValueError('plot job misses %s' % ', '.join(missing))
+        if isinstance(opts['files'], str):
+            opts['files'] = [opts['files']]
+        self.opts = opts
+
+    def __getattr__(self, name):
+        try:
+            return self.__dict__['opts'][name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def columnsOf(self, fn):
+        ys = self.opts['y']
+        if isinstance(ys, dict):
+            ys = ys.get(fn, [])
+        elif isinstance(ys, str):
+            ys = [ys]
+        return [y for y in ys if y != self.opts['x']]
+
+
+def RenderJob(job:PlotJob, cache=None):
+    """ render a PlotJob to its output file on the Agg backend (no QApplication),
+        return OrderedDict of stage timings in seconds
+    """
+    import matplotlib as plt
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from data_loader import LoadDataFrame
+
+    timings = OrderedDict()
+    t0 = time.perf_counter()
+
+    frames = OrderedDict()
+    for fn in job.files:
+        result = LoadDataFrame(fn, compact=job.compact, lazy=True, cache=cache)
+        if result.df is None:
+            raise IOError('can not read data file: %s' % fn)
+        frames[fn] = result.df
+    timings['load'] = time.perf_counter() - t0
+
+    t = time.perf_counter()
+    with plt.rc_context():
+        fig = Figure(figsize=(job.width, job.height), dpi=job.dpi)
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        ApplyTheme(fig, ax, job.style)
+        styles = {col: UserDefinedStyle.fromDict(d) for col, d in job.styles.items()}
+        for fn, frame in frames.items():
+            ys = [y for y in job.columnsOf(fn) if y in frame.columns]
+            if not ys or job.x not in frame.columns:
+                continue
+            for y, line in PlotColumns(ax, frame, job.x, ys, job.sampling, job.skip):
+                usersty = styles.get(y)
+                if usersty:
+                    usersty.apply(line)
+        if not ax.get_lines():
+            raise ValueError('nothing to plot for %s' % job.output)
+        DecorateAxes(ax, job.fontsize, job.grid, job.xlabel or job.x, job.ylabel, job.alpha)
+        if job.title:
+            ax.set_title(job.title, fontsize=job.fontsize)
+        if job.legend:
+            MakeLegend(ax, job.fontsize, job.legend_text)
+        timings['plot'] = time.perf_counter() - t
+
+        t = time.perf_counter()
+        FitLinesToOutput(ax, job.dpi, vector=OutputFormat(job.output) in VECTOR_FORMATS)
+        outDir = os.path.dirname(os.path.abspath(job.output))
+        os.makedirs(outDir, exist_ok=True)
+        fig.savefig(job.output, dpi=job.dpi, bbox_inches='tight', pad_inches=0.2)
+        timings['render'] = time.perf_counter() - t
+    timings['total'] = time.perf_counter() - t0
+    return timings
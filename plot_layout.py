@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: plot_layout.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Subplot layouts: the plotted series are grouped (one group per file or per
+column), each group gets a subplot of a grid sharing the x axis, and a secondary
+y axis on demand. Kept groups keep their axes and lines when the grid changes.
+"""
+from collections import OrderedDict
+
+
+LAYOUT_SINGLE     = 'Single'
+LAYOUT_PER_FILE   = 'Per file'
+LAYOUT_PER_COLUMN = 'Per column'
+LAYOUT_MODES      = [LAYOUT_SINGLE, LAYOUT_PER_FILE, LAYOUT_PER_COLUMN]
+
+
+def GroupSeries(mode, keys):
+    """ OrderedDict group => [(fn, yName)] of the series in the given order, one group per subplot.
+        Group is None in single layout, the file in per file layout and the column name in per column layout.
+    """
+    groups = OrderedDict()
+    for fn, y in keys:
+        group = None if mode == LAYOUT_SINGLE else fn if mode == LAYOUT_PER_FILE else y
+        groups.setdefault(group, []).append((fn, y))
+    return groups
+
+
+def GridShape(n):
+    """ (rows, columns) of n subplots, stacked in one column as long as they stay readable """
+    cols = 1 if n <= 4 else 2 if n <= 12 else 3
+    return (n + cols - 1) // cols, cols
+
+
+class AxesLayout(object):
+    """ primary axes per group in a grid sharing x (zoom & pan move them together),
+        a group's secondary y axes (twinx) is made when a series goes there.
+        Lines of a group (primary & secondary) take the colors of one cycle.
+    """
+    def __init__(self, fig, axes):
+        super().__init__()
+        self.fig = fig
+        self.primary = OrderedDict([(None, axes)]) # group => axes
+        self.secondary = {} # group => twin axes
+        self.color_index = {} # group => lines colored so far
+
+    def __len__(self):
+        return len(self.primary)
+
+    def first(self):
+        return next(iter(self.primary.values()))
+
+    def isSingle(self):
+        """ one axes without secondary y, as the fast canvas can show it """
+        return len(self.primary) == 1 and not self.secondary
+
+    def allAxes(self):
+        return list(self.primary.values()) + list(self.secondary.values())
+
+    def colorGroups(self):
+        """ [[primary, secondary]] axes sharing a color cycle """
+        return [[ax] + ([self.secondary[g]] if g in self.secondary else []) for g, ax in self.primary.items()]
+
+    def groupOf(self, axes):
+        for group, ax in self.primary.items():
+            if axes is ax or axes is self.secondary.get(group):
+                return group
+        raise KeyError(axes)
+
+    def isSecondary(self, axes):
+        return any(axes is ax for ax in self.secondary.values())
+
+    def isBottom(self, group):
+        """ True if no subplot is below the group's """
+        groups = list(self.primary)
+        return groups.index(group) + GridShape(len(groups))[1] >= len(groups)
+
+    def arrange(self, groups):
+        """ one subplot per group, kept groups keep their axes (moved to their new cell),
+            return the removed axes (their lines are gone with them), None if the grid is unchanged
+        """
+        from matplotlib.gridspec import GridSpec
+        groups = list(groups) or [None]
+        if groups == list(self.primary):
+            return None
+        removed = []
+        for group in list(self.primary):
+            if group not in groups:
+                removed.append(self.primary.pop(group))
+                if group in self.secondary:
+                    removed.append(self.secondary.pop(group))
+                self.color_index.pop(group, None)
+        for ax in removed:
+            ax.remove()
+        rows, cols = GridShape(len(groups))
+        grid = GridSpec(rows, cols, figure=self.fig)
+        shared = next(iter(self.primary.values()), None)
+        primary = OrderedDict()
+        for i, group in enumerate(groups):
+            ax = self.primary.get(group)
+            if ax is None:
+                ax = self.fig.add_subplot(grid[i], sharex=shared)
+                ax.set_xmargin(0)
+                shared = shared or ax
+            else:
+                ax.set_subplotspec(grid[i])
+                if group in self.secondary:
+                    self.secondary[group].set_subplotspec(grid[i])
+            primary[group] = ax
+        self.primary = primary
+        self.showTickLabels()
+        return removed
+
+    def fitSpacing(self):
+        """ grid spacing fitted to the subplot titles & labels, a single plot has the default margins """
+        import matplotlib as plt
+        if len(self.primary) > 1:
+            self.fig.tight_layout()
+        else:
+            self.fig.subplots_adjust(**{k: plt.rcParams['figure.subplot.' + k]
+                                        for k in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+
+    def showTickLabels(self):
+        """ x tick labels on the lowest subplot of each grid column only """
+        for group, ax in self.primary.items():
+            ax.xaxis.set_tick_params(labelbottom=self.isBottom(group))
+
+    def axesOf(self, group, secondary=False):
+        """ the axes of a group's series, its secondary y axes is made on first use """
+        if not secondary:
+            return self.primary[group]
+        if group not in self.secondary:
+            self.secondary[group] = self.primary[group].twinx()
+        return self.secondary[group]
+
+    def dropEmptySecondary(self):
+        for group, ax in list(self.secondary.items()):
+            if not ax.get_lines():
+                ax.remove()
+                del self.secondary[group]
+
+    def nextColor(self, group):
+        """ next color of the group's cycle in the current theme """
+        import matplotlib as plt
+        colors = plt.rcParams['axes.prop_cycle'].by_key().get('color') or ['C0']
+        n = self.color_index.get(group, 0)
+        self.color_index[group] = n + 1
+        return colors[n % len(colors)]
+
+    def resetColors(self):
+        """ the lines were recolored from the start of the cycle (e.g. by a theme) """
+        self.color_index = {g: sum(len(ax.get_lines()) for ax in axes)
+                            for g, axes in zip(self.primary, self.colorGroups())}
+
+    def clear(self):
+        """ remove all lines & secondary axes, the subplots stay """
+        for ax in self.secondary.values():
+            ax.remove()
+        self.secondary.clear()
+        for ax in self.primary.values():
+            ax.clear()
+            ax.set_xmargin(0)
+        self.color_index.clear()
+        self.showTickLabels()
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: plot_model.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Bookkeeping of the plotted lines, so a new selection only adds/removes the lines
+that changed and styles are updated in place.
+"""
+from collections import OrderedDict
+
+
+BASE_STYLE_PROPS = ('linestyle', 'linewidth', 'marker', 'markersize')
+
+
+class PlotModel(object):
+    """ (fn, column) series => Line2D of one axes.
+        - data_key: signature of the data preparation (x column, sampling, ...), lines
+                    plotted under another data_key are stale and must be re-plotted.
+    """
+    def __init__(self):
+        super().__init__()
+        self.lines = OrderedDict() # (fn, yName) => Line2D
+        self.base_styles = {} # (fn, yName) => {prop: value} as first plotted, before user styles
+        self.data_key = None
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __contains__(self, key):
+        return key in self.lines
+
+    def pointCount(self):
+        """ number of points held by the lines """
+        return sum(len(line.get_xdata()) for line in self.lines.values())
+
+    def reset(self):
+        """ forget all lines, the lines are left in the axes """
+        self.lines.clear()
+        self.base_styles.clear()
+        self.data_key = None
+
+    def diff(self, wantedKeys):
+        """ return (added keys, removed keys) to go from current to wanted series """
+        wanted = set(wantedKeys)
+        added = [k for k in wantedKeys if k not in self.lines]
+        removed = [k for k in self.lines if k not in wanted]
+        return added, removed
+
+    def addLine(self, key, line):
+        from matplotlib.artist import getp
+        self.lines[key] = line
+        self.base_styles[key] = {p: getp(line, p) for p in BASE_STYLE_PROPS}
+
+    def removeLines(self, keys):
+        """ remove the lines from the model & the axes """
+        for key in keys:
+            line = self.lines.pop(key, None)
+            self.base_styles.pop(key, None)
+            if line is not None and line.axes is not None:
+                line.remove()
+
+    def removeFile(self, fn):
+        self.removeLines([k for k in self.lines if k[0]==fn])
+
+    def renameSeries(self, fn, oldName, newName):
+        """ the line data is unchanged by a column rename, just re-key & re-label it """
+        key = (fn, oldName)
+        if key in self.lines:
+            newKey = (fn, newName)
+            self.lines = OrderedDict((newKey if k==key else k, v) for k, v in self.lines.items())
+            self.base_styles[newKey] = self.base_styles.pop(key)
+            self.lines[newKey].set_label(newName)
+
+    def setBaseStyles(self, props):
+        """ change the base style of all lines (e.g. to a new theme), call restyle to apply it """
+        for base in self.base_styles.values():
+            base.update(props)
+
+    def restyle(self, key, usersty):
+        """ reset the line to its base style then apply the user defined style (if any),
+            return True if the line looks different
+        """
+        from matplotlib.artist import getp
+        line = self.lines[key]
+        before = [getp(line, p) for p in BASE_STYLE_PROPS]
+        line.set(**self.base_styles[key])
+        if usersty:
+            usersty.apply(line)
+        return [getp(line, p) for p in BASE_STYLE_PROPS] != before
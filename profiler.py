@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: profiler.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Optional timing spans & counters, shown as the breakdown of the last frame and
+written as a trace file for the Chrome trace viewer (chrome://tracing, Perfetto).
+"""
+import os
+import sys
+import json
+import time
+import threading
+import contextlib
+from collections import OrderedDict, deque
+
+
+NULL_SPAN = contextlib.nullcontext() # returned while disabled, so spans cost next to nothing
+
+
+def ProcessRSS():
+    """ resident memory of this process in bytes, None if unknown """
+    if sys.platform.startswith('linux'):
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+        except (OSError, ValueError, IndexError):
+            return None
+    if sys.platform == 'win32':
+        import ctypes
+        from ctypes import wintypes
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.WorkingSetSize
+        return None
+    try: # other unix: peak rss only
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        return None
+
+
+class Profiler(object):
+    """ Timing spans of any thread, recorded as trace events while enabled.
+        A frame is a top level span (one plot, one style change, ...): the time of its
+        direct child spans is kept as the breakdown of the last frame.
+    """
+    def __init__(self, maxEvents=200000):
+        super().__init__()
+        self.enabled = False
+        self.events = deque(maxlen=maxEvents) # oldest events are dropped
+        self.frame_name = None
+        self.frame_total = 0.0 # seconds
+        self.frame_parts = OrderedDict() # child span => seconds, of the last frame
+        self.counters = OrderedDict() # counter => {series: value}, last values
+        self._frame = None # (name, child depth, thread id, parts) of the frame being recorded
+        self._threads = {} # thread id => name
+        self._local = threading.local()
+        self._origin = time.perf_counter()
+        self._async_id = 0
+
+    def setEnabled(self, on):
+        self.enabled = bool(on)
+
+    def clear(self):
+        self.events.clear()
+        self.counters.clear()
+        self.frame_name = None
+        self.frame_total = 0.0
+        self.frame_parts = OrderedDict()
+
+    def now(self):
+        return time.perf_counter()
+
+    def _event(self, ph, name, t, **fields):
+        tid = threading.get_ident()
+        if tid not in self._threads:
+            self._threads[tid] = threading.current_thread().name
+        event = {'name': name, 'ph': ph, 'ts': (t - self._origin) * 1e6, 'pid': os.getpid(), 'tid': tid}
+        event.update(fields)
+        self.events.append(event)
+
+    def _complete(self, name, t0, t1, args):
+        fields = {'dur': (t1 - t0) * 1e6}
+        if args:
+            fields['args'] = args
+        self._event('X', name, t0, **fields)
+
+    def span(self, name, **args):
+        """ context manager timing a block, a no-op when disabled """
+        return self._span(name, args) if self.enabled else NULL_SPAN
+
+    @contextlib.contextmanager
+    def _span(self, name, args):
+        depth = getattr(self._local, 'depth', 0)
+        self._local.depth = depth + 1
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            t1 = time.perf_counter()
+            self._local.depth = depth
+            self._complete(name, t0, t1, args)
+            frame = self._frame
+            if frame is not None and frame[1] == depth and frame[2] == threading.get_ident():
+                frame[3][name] = frame[3].get(name, 0.0) + (t1 - t0)
+
+    def frame(self, name, start=None, **args):
+        """ context manager of a top level span, its breakdown becomes the last frame.
+            - start: perf_counter time the frame began at, for work that started earlier
+                     (e.g. in a pool thread), the wait is recorded as an async trace event
+        """
+        return self._frameSpan(name, start, args) if self.enabled else NULL_SPAN
+
+    @contextlib.contextmanager
+    def _frameSpan(self, name, start, args):
+        depth = getattr(self._local, 'depth', 0)
+        parts = OrderedDict()
+        outer = self._frame
+        self._frame = (name, depth + 1, threading.get_ident(), parts)
+        self._local.depth = depth + 1
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            t1 = time.perf_counter()
+            self._local.depth = depth
+            self._frame = outer
+            if start is None:
+                self._complete(name, t0, t1, args)
+            else: # overlaps other spans of this thread, so not a nested 'X' event
+                self._async_id += 1
+                self._event('b', name, start, cat='frame', id=self._async_id, args=args)
+                self._event('e', name, t1, cat='frame', id=self._async_id)
+            self.frame_name = name
+            self.frame_total = t1 - (t0 if start is None else start)
+            self.frame_parts = parts
+
+    def addTime(self, name, seconds):
+        """ add time measured elsewhere to the breakdown of the current frame """
+        frame = self._frame
+        if self.enabled and frame is not None:
+            frame[3][name] = frame[3].get(name, 0.0) + seconds
+
+    def counter(self, name, **values):
+        """ record counter values, shown as a track in the trace """
+        if self.enabled:
+            self.counters[name] = values
+            self._event('C', name, time.perf_counter(), args=values)
+
+    def frameSummary(self):
+        """ 'plot 120.3 ms: lines 40.1, draw 70.0' of the last frame """
+        if self.frame_name is None:
+            return ''
+        parts = ', '.join('%s %.1f' % (k, v * 1e3) for k, v in self.frame_parts.items())
+        return '%s %.1f ms%s' % (self.frame_name, self.frame_total * 1e3, ': ' + parts if parts else '')
+
+    def writeTrace(self, fn):
+        """ write the events as Chrome trace json, return the number of events """
+        events = list(self.events)
+        pid = os.getpid()
+        meta = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': 'ezplot'}}]
+        meta += [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in self._threads.items()]
+        with open(fn, 'w') as f:
+            json.dump({'traceEvents': meta + events, 'displayTimeUnit': 'ms'}, f)
+        return len(events)
+
+
+PROFILER = Profiler() # shared by the window & the load workers
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: redraw_scheduler.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+"""
+from PyQt5 import QtCore
+
+
+class RedrawScheduler(QtCore.QObject):
+    """ Coalesce bursts of redraw requests into a single call per frame interval.
+        Requests arriving while one is pending are merged into it, so stale
+        requests never pile up behind a slow render.
+    """
+    def __init__(self, func, interval=16, parent=None):
+        """ - func: the render function, called without arguments
+            - interval: frame interval in ms, the first request of a burst waits this long
+        """
+        super().__init__(parent)
+        self._func = func
+        self._pending = False
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._fire)
+
+    def isPending(self):
+        return self._pending
+
+    @QtCore.pyqtSlot()
+    def request(self, *args):
+        """ schedule a render, signal arguments are ignored """
+        self._pending = True
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def cancel(self):
+        self._timer.stop()
+        self._pending = False
+
+    def flush(self):
+        """ render now if a request is pending """
+        if self._pending:
+            self._timer.stop()
+            self._fire()
+
+    def _fire(self):
+        self._pending = False
+        self._func()
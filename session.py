@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: session.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Session file: the loaded files with their load options, column renames & styles,
+the selection and the figure settings, as json. Restoring reopens the files
+(unchanged ones are memory mapped from the binary cache) and re-applies the rest
+once they are loaded.
+"""
+import os
+import json
+from collections import OrderedDict
+
+
+SESSION_VERSION = 1
+
+
+def FileStamp(fn):
+    """ [size, mtime ns] of a file, None if it is gone """
+    try:
+        st = os.stat(fn)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def SaveSession(fn, state:dict):
+    """ write the session atomically, an interrupted save keeps the previous file """
+    state = dict(state, version=SESSION_VERSION)
+    tmp = fn + '.partial'
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=4)
+    os.replace(tmp, fn)
+
+
+def LoadSession(fn) -> dict:
+    with open(fn) as f:
+        state = json.load(f)
+    if not isinstance(state, dict) or state.get('version') != SESSION_VERSION:
+        raise ValueError('not a session file of version %d: %s' % (SESSION_VERSION, fn))
+    return state
+
+
+class PendingRestore(object):
+    """ a session being restored: its files load in the background,
+        the selection & figure are applied when they are all done
+    """
+    def __init__(self, state:dict):
+        super().__init__()
+        self.state = state
+        self.files = OrderedDict((f['path'], f) for f in state.get('files', [])) # fn => file entry
+        self.waiting = set() # files still loading
+        self.missing = [] # gone since the session was saved
+        self.changed = [] # modified since saved, parsed again instead of mapped from cache
+        self.failed = []
+        self.refused = [] # (fn, stored name, display name) of renames that could not be applied
+
+    def start(self):
+        """ return [(fn, file entry)] of the files to load, in session order """
+        toLoad = []
+        for fn, entry in self.files.items():
+            stamp = FileStamp(fn)
+            if stamp is None:
+                self.missing.append(fn)
+                continue
+            if entry.get('stamp') and list(entry['stamp']) != stamp:
+                self.changed.append(fn)
+            self.waiting.add(fn)
+            toLoad.append((fn, entry))
+        return toLoad
+
+    def fileDone(self, fn, ok=True):
+        if fn in self.waiting:
+            self.waiting.discard(fn)
+            if not ok:
+                self.failed.append(fn)
+
+    def dropWaiting(self):
+        """ the loads still waited for were cancelled """
+        self.failed.extend(sorted(self.waiting))
+        self.waiting.clear()
+
+    def renamesRefused(self, fn, renames):
+        """ renames {stored: display name} of fn the tree refused (e.g. duplicate names) """
+        self.refused.extend((fn, old, new) for old, new in renames.items())
+
+    def isDone(self):
+        return not self.waiting
+
+    def summary(self):
+        """ 'session restored: 3 files (1 changed, 1 missing), 1 rename refused: a -> b' """
+        n = len(self.files) - len(self.missing) - len(self.failed)
+        notes = ['%d %s' % (len(fns), what) for fns, what in
+                 ((self.changed, 'changed'), (self.missing, 'missing'), (self.failed, 'failed')) if fns]
+        text = 'Session restored: %d file(s)%s' % (n, ' (%s)' % ', '.join(notes) if notes else '')
+        if self.refused:
+            text += ', %d rename(s) refused: %s' % (len(self.refused),
+                                                   ', '.join('%s -> %s' % (old, new) for _, old, new in self.refused))
+        return text
@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: startup.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Fast start: a splash right after QApplication, and the heavy plotting stack
+imported on a pool thread while the main window is already on screen.
+"""
+import time
+import importlib
+from collections import OrderedDict
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+# heavy modules the figure panel needs, in import order
+PLOTTING_MODULES = (
+    'pandas',
+    'matplotlib',
+    'matplotlib.style', # parses the style library
+    'matplotlib.figure',
+    'matplotlib.backends.backend_qt5agg',
+    'data_loader',
+)
+
+
+def ImportModules(names):
+    """ import the modules, return OrderedDict of name => seconds (0 if already imported) """
+    timings = OrderedDict()
+    for name in names:
+        t = time.perf_counter()
+        importlib.import_module(name)
+        timings[name] = time.perf_counter() - t
+    return timings
+
+
+def MakeSplash(iconPath, message='Loading...'):
+    """ show a splash screen at once, before any heavy import """
+    pixmap = QtGui.QPixmap(iconPath)
+    if pixmap.isNull():
+        pixmap = QtGui.QPixmap(320, 120)
+        pixmap.fill(QtGui.QColor(53, 53, 53))
+    splash = QtWidgets.QSplashScreen(pixmap)
+    splash.showMessage(message, QtCore.Qt.AlignBottom | QtCore.Qt.AlignHCenter, QtCore.Qt.white)
+    splash.show()
+    QtWidgets.QApplication.processEvents()
+    return splash
+
+
+class WarmUpSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(object) # OrderedDict of import timings
+    failed   = QtCore.pyqtSignal(str) # error message
+
+
+class WarmUpTask(QtCore.QRunnable):
+    """ import modules in a pool thread, widgets are still created by the GUI thread """
+    def __init__(self, names=PLOTTING_MODULES):
+        super().__init__()
+        self.setAutoDelete(False) # owner keeps the reference until finished
+        self.names = names
+        self.signals = WarmUpSignals()
+
+    def run(self):
+        try:
+            timings = ImportModules(self.names)
+        except Exception as e:
+            self.signals.failed.emit(repr(e))
+        else:
+            self.signals.finished.emit(timings)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+******************************
+* Filename: theme_preview.py
+* Author: RayN
+* Created on 10/18/2026
+******************************
+Thumbnails of the plotted data in every theme, rendered on a pool thread,
+click one to switch the figure to that theme.
+"""
+import threading
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+from PyQt5.QtCore import pyqtSlot
+
+from plot_api import ThemeParams, RenderThemeThumbnail
+
+
+THUMBNAIL_SIZE = (180, 120) # pixels
+_running = set() # started tasks, referenced until they end even if their dialog is gone
+
+
+class ThumbnailSignals(QtCore.QObject):
+    rendered = QtCore.pyqtSignal(str, QtGui.QImage) # (style name, thumbnail)
+    finished = QtCore.pyqtSignal()
+
+
+class ThumbnailTask(QtCore.QRunnable):
+    """ render the theme thumbnails one by one, the theme params must be cached already """
+    def __init__(self, styles, series, size=THUMBNAIL_SIZE):
+        super().__init__()
+        self.setAutoDelete(False) # owner keeps the reference until finished
+        self.styles = list(styles)
+        self.series = series
+        self.size = size
+        self.signals = ThumbnailSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        for name in self.styles:
+            if self._cancel.is_set():
+                break
+            try:
+                w, h, buf = RenderThemeThumbnail(name, self.series, *self.size)
+            except Exception: # a broken style sheet only misses its thumbnail
+                continue
+            self.signals.rendered.emit(name, QtGui.QImage(buf, w, h, QtGui.QImage.Format_RGBA8888).copy())
+        self.signals.finished.emit()
+
+
+class ThemePreview(QtWidgets.QDialog):
+    """ grid of theme thumbnails, emits signal_theme_selected when one is clicked """
+
+    signal_theme_selected = QtCore.pyqtSignal(str) # style name
+
+    def __init__(self, styles, series, current=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('Themes')
+        self.styles = list(styles)
+        self.series = series # [(x, y)] small copies of the plotted data
+        self.task = None
+
+        self.list_themes = QtWidgets.QListWidget()
+        self.list_themes.setViewMode(QtWidgets.QListView.IconMode)
+        self.list_themes.setIconSize(QtCore.QSize(*THUMBNAIL_SIZE))
+        self.list_themes.setResizeMode(QtWidgets.QListView.Adjust)
+        self.list_themes.setMovement(QtWidgets.QListView.Static)
+        self.list_themes.setGridSize(QtCore.QSize(THUMBNAIL_SIZE[0] + 16, THUMBNAIL_SIZE[1] + 28))
+        self.list_themes.setWordWrap(True)
+        self.items = {}
+        for name in self.styles:
+            item = QtWidgets.QListWidgetItem(name)
+            self.list_themes.addItem(item)
+            self.items[name] = item
+            if name == current:
+                self.list_themes.setCurrentItem(item)
+        self.list_themes.itemClicked.connect(self.onItemClicked)
+
+        layout = QtWidgets.QVBoxLayout()
+        layout.addWidget(self.list_themes)
+        self.setLayout(layout)
+        self.resize(4 * (THUMBNAIL_SIZE[0] + 24), 3 * (THUMBNAIL_SIZE[1] + 40))
+        QtCore.QTimer.singleShot(0, self.startRendering) # after the dialog shows
+
+    def startRendering(self):
+        for name in self.styles: # resolved on this thread, rendering does not touch rcParams
+            ThemeParams(name)
+        self.task = ThumbnailTask(self.styles, self.series)
+        self.task.signals.rendered.connect(self.onRendered)
+        self.task.signals.finished.connect(lambda task=self.task: _running.discard(task))
+        _running.add(self.task)
+        QtCore.QThreadPool.globalInstance().start(self.task)
+
+    @pyqtSlot(str, QtGui.QImage)
+    def onRendered(self, name, image):
+        item = self.items.get(name)
+        if item is not None:
+            item.setIcon(QtGui.QIcon(QtGui.QPixmap.fromImage(image)))
+
+    def onItemClicked(self, item):
+        self.signal_theme_selected.emit(item.text())
+
+    def done(self, result):
+        if self.task is not None:
+            self.task.cancel()
+        super().done(result)
@@ -5,6 +5,12 @@
 * Author: RayN
 * Created on 1/30/18
 ******************************
+Model/view tree of the loaded dataFrames and their columns.
+
+Nodes are plain python objects, the view only asks the model for the visible rows,
+so a file with thousands of columns costs no widgets. A column's style editor is a
+persistent editor of its single child row, created when the column is expanded
+and destroyed when collapsed.
 """
 import os
 from collections import OrderedDict
@@ -13,44 +19,9 @@ from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import Qt, pyqtSlot
 
 import gui_base as gui
+from plot_api import UserDefinedStyle
 
 
-class UserDefinedStyle(object):
-    
-    def __init__(self):
-        super().__init__()
-        self.line_style         = ''
-        self.line_width_offset  = 0
-        self.marker             = ''
-        self.marker_size_offset = 0
-        # self.line_color         = None
-        # self.marker_facecolor   = None
-        # self.marker_edgecolor   = None
-    
-    def __bool__(self):
-        """ return True if any of the styles is given """
-        return bool(
-            self.line_style or self.line_width_offset or self.marker or self.marker_size_offset )
-    
-    
-    def apply(self, line):
-        """ apply user defined plot style to given line"""
-        if self.line_style:     
-            line.set_linestyle(self.line_style)
-        if self.line_width_offset:     
-            line.set_linewidth(self.line_width_offset + line.get_linewidth())
-        if self.marker:         
-            line.set_marker(self.marker)
-        if self.marker_size_offset:    
-            line.set_markersize(self.marker_size_offset + line.get_markersize())
-        # if self.line_color is not None:     
-        #     line.set_color(self.line_color)
-        # if self.marker_facecolor is not None: 
-        #     line.set_markerfacecolor(self.marker_facecolor)
-        # if self.marker_edgecolor is not None: 
-        #     line.set_markeredgecolor(self.marker_edgecolor)
-    
-
 class StyleModifier(QtWidgets.QWidget):
     
     signal_style_changed = QtCore.pyqtSignal()
@@ -79,19 +50,26 @@ class StyleModifier(QtWidgets.QWidget):
             label='MarkerSize(+/-)', 
             low=-50, high=50, step=0.2, 
             default=self.style.marker_size_offset, digits=1)
+        self.chkbox_secondary_y = gui.CheckBox(
+            label='Secondary Y',
+            default=self.style.secondary_y,
+            tooltip='plot on the y axis at the right of its subplot')
         
         self.editor_line_style.currentIndexChanged.connect(self.valueModified)
         self.editor_line_width_offset.valueChanged.connect(self.valueModified)
         self.editor_marker.currentIndexChanged.connect(self.valueModified)
         self.editor_marker_size_offset.valueChanged.connect(self.valueModified)
+        self.chkbox_secondary_y.stateChanged.connect(self.valueModified)
 
         self.setLayout(
             gui.MakeFormLayout([
                 self.editor_line_style, 
                 self.editor_line_width_offset, 
                 self.editor_marker, 
-                self.editor_marker_size_offset ])
+                self.editor_marker_size_offset,
+                self.chkbox_secondary_y ])
         )
+        self.setAutoFillBackground(True)
     
     @pyqtSlot()
     def valueModified(self):
@@ -99,20 +77,278 @@ class StyleModifier(QtWidgets.QWidget):
         self.style.line_width_offset = self.editor_line_width_offset.getValue()
         self.style.marker = self.editor_marker.getValue()
         self.style.marker_size_offset = self.editor_marker_size_offset.getValue()
+        self.style.secondary_y = self.chkbox_secondary_y.isChecked()
         self.signal_style_changed.emit()
     
+    def setStyle(self, style:UserDefinedStyle):
+        """ edit the given style object, the editors are set without emitting changes """
+        self.style = style
+        editors = (self.editor_line_style, self.editor_line_width_offset,
+                   self.editor_marker, self.editor_marker_size_offset, self.chkbox_secondary_y)
+        for editor in editors:
+            editor.blockSignals(True)
+        self.editor_line_style.setValue(style.line_style)
+        self.editor_line_width_offset.setValue(style.line_width_offset)
+        self.editor_marker.setValue(style.marker)
+        self.editor_marker_size_offset.setValue(style.marker_size_offset)
+        self.chkbox_secondary_y.setValue(style.secondary_y)
+        for editor in editors:
+            editor.blockSignals(False)
+    
     def getStyle(self) -> UserDefinedStyle:
         return self.style
 
 
 
-class DataFrameTree(QtWidgets.QTreeWidget):
-    
-    signal_column_renamed = QtCore.pyqtSignal(tuple) # (fn, oldName, newName) 
-    signal_active_style_changed = QtCore.pyqtSignal() 
+class DataFrameNode(object):
+    """ A dataframe node, with multiple column names as sub-node,
+        column sub-node's child is customs style widgets
+    """
+    def __init__(self, datafn, columnNames, model):
+        super().__init__()
+        self.datafile = datafn
+        self.dfname = os.path.basename(datafn) # can be renamed by user
+        self.following = False
+        self.info = ''
+        self.model = model
+        self.column_nodes = [ DataColumnNode(colname=cn, parent=self, row=i) for i, cn in enumerate(columnNames) ]
+
+    def text(self):
+        return self.dfname + ('  [following]' if self.following else '')
+
+    def setFollowing(self, following):
+        self.following = following
+        self.model.nodeChanged(self)
+
+    def setInfo(self, text):
+        """ extra info shown in tooltip, e.g. size & memory usage """
+        self.info = text
+        self.model.nodeChanged(self)
+
+    def deleteColumns(self):
+        self.updateColumns([])
+
+    def updateColumns(self, columnNames):
+        self.model.setColumns(self, columnNames)
+
+    def getColumnNamesSet(self):
+        return { col.column_name for col in self.column_nodes }
+
+
+
+class DataColumnNode(object):
+    """A column name node, and its style modifier """
+    def __init__(self, colname, parent:DataFrameNode, row):
+        super().__init__()
+        self.dfnode = parent
+        self.column_name = colname
+        self.row = row # position in dfnode.column_nodes
+        self.style = None # UserDefinedStyle, created on first edit
+        self.style_item = StyleItem(self) # child row holding the style editor
+
+    def getStyle(self):
+        if self.style is None:
+            self.style = UserDefinedStyle()
+        return self.style
+
+
+
+class StyleItem(object):
+    """ the child row of a column, its persistent editor is a StyleModifier """
+    __slots__ = ('column_node',)
+
+    def __init__(self, columnNode):
+        self.column_node = columnNode
+
+
+
+class DataFrameModel(QtCore.QAbstractItemModel):
+    """ dataFrame => column => style rows, one column of data """
+
+    signal_column_renamed = QtCore.pyqtSignal(tuple) # (fn, oldName, newName)
+    signal_style_changed = QtCore.pyqtSignal(object) # DataColumnNode
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.df_nodes = OrderedDict() # fn => DataFrameNode
+
+    def dfRow(self, dfnode):
+        return list(self.df_nodes.values()).index(dfnode)
+
+    def nodeIndex(self, node):
+        if isinstance(node, DataFrameNode):
+            return self.createIndex(self.dfRow(node), 0, node)
+        if isinstance(node, DataColumnNode):
+            return self.createIndex(node.row, 0, node)
+        return QtCore.QModelIndex()
+
+    def nodeChanged(self, node):
+        index = self.nodeIndex(node)
+        self.dataChanged.emit(index, index)
+
+    # QAbstractItemModel interface
+
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        if column != 0 or row < 0:
+            return QtCore.QModelIndex()
+        if not parent.isValid():
+            if row < len(self.df_nodes):
+                return self.createIndex(row, 0, list(self.df_nodes.values())[row])
+            return QtCore.QModelIndex()
+        node = parent.internalPointer()
+        if isinstance(node, DataFrameNode) and row < len(node.column_nodes):
+            return self.createIndex(row, 0, node.column_nodes[row])
+        if isinstance(node, DataColumnNode) and row == 0:
+            return self.createIndex(0, 0, node.style_item)
+        return QtCore.QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QtCore.QModelIndex()
+        node = index.internalPointer()
+        if isinstance(node, DataColumnNode):
+            return self.nodeIndex(node.dfnode)
+        if isinstance(node, StyleItem):
+            return self.nodeIndex(node.column_node)
+        return QtCore.QModelIndex()
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if not parent.isValid():
+            return len(self.df_nodes)
+        node = parent.internalPointer()
+        if isinstance(node, DataFrameNode):
+            return len(node.column_nodes)
+        if isinstance(node, DataColumnNode):
+            return 1
+        return 0
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 1
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        node = index.internalPointer()
+        if isinstance(node, DataColumnNode):
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable
+        if isinstance(node, StyleItem):
+            return Qt.ItemIsEnabled | Qt.ItemIsEditable # not selectable
+        return Qt.ItemIsEnabled
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        if isinstance(node, DataFrameNode):
+            if role == Qt.DisplayRole:
+                return node.text()
+            if role == Qt.ToolTipRole:
+                return node.datafile + ('\n' + node.info if node.info else '')
+        elif isinstance(node, DataColumnNode):
+            if role in (Qt.DisplayRole, Qt.EditRole):
+                return node.column_name
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """ rename a column (blank/duplicate names are refused), or commit a style edit """
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        node = index.internalPointer()
+        if isinstance(node, StyleItem):
+            self.signal_style_changed.emit(node.column_node)
+            return True
+        if not isinstance(node, DataColumnNode):
+            return False
+        newName, oldName = str(value), node.column_name
+        if newName == oldName:
+            return False
+        if not newName or newName in node.dfnode.getColumnNamesSet():
+            return False
+        node.column_name = newName
+        self.dataChanged.emit(index, index)
+        self.signal_column_renamed.emit((node.dfnode.datafile, oldName, newName))
+        return True
+
+    # structure changes
+
+    def addDataFrame(self, datafn, columns):
+        row = len(self.df_nodes)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.df_nodes[datafn] = DataFrameNode(datafn=datafn, columnNames=columns, model=self)
+        self.endInsertRows()
+        return self.df_nodes[datafn]
+
+    def removeDataFrame(self, datafn):
+        dfnode = self.df_nodes.get(datafn)
+        if dfnode is not None:
+            row = self.dfRow(dfnode)
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self.df_nodes[datafn]
+            self.endRemoveRows()
+
+    def setColumns(self, dfnode, columnNames):
+        """ replace the column rows of a dataFrame node """
+        parent = self.nodeIndex(dfnode)
+        if dfnode.column_nodes:
+            self.beginRemoveRows(parent, 0, len(dfnode.column_nodes) - 1)
+            dfnode.column_nodes = []
+            self.endRemoveRows()
+        if columnNames:
+            self.beginInsertRows(parent, 0, len(columnNames) - 1)
+            dfnode.column_nodes = [ DataColumnNode(colname=cn, parent=dfnode, row=i)
+                                    for i, cn in enumerate(columnNames) ]
+            self.endInsertRows()
+
+
+
+class StyleDelegate(QtWidgets.QStyledItemDelegate):
+    """ StyleModifier editors for the style rows, default line edit for renaming columns """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._editor_size = None # size hint of a StyleModifier, measured once
+
+    def createEditor(self, parent, option, index):
+        node = index.internalPointer()
+        if not isinstance(node, StyleItem):
+            return super().createEditor(parent, option, index)
+        editor = StyleModifier(parent)
+        editor.signal_style_changed.connect(lambda: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        node = index.internalPointer()
+        if isinstance(node, StyleItem):
+            editor.setStyle(node.column_node.getStyle())
+        else:
+            super().setEditorData(editor, index)
+
+    def setModelData(self, editor, model, index):
+        if isinstance(index.internalPointer(), StyleItem):
+            model.setData(index, None) # the editor already changed the style object
+        else:
+            super().setModelData(editor, model, index)
+
+    def sizeHint(self, option, index):
+        if isinstance(index.internalPointer(), StyleItem):
+            if self._editor_size is None:
+                self._editor_size = StyleModifier().sizeHint()
+            return self._editor_size
+        return super().sizeHint(option, index)
+
+
+
+class DataFrameTree(QtWidgets.QTreeView):
+
+    signal_column_renamed = QtCore.pyqtSignal(tuple) # (fn, oldName, newName)
+    signal_active_style_changed = QtCore.pyqtSignal(object) # DataColumnNode
     signal_dataframe_deleted = QtCore.pyqtSignal(str) # fn
     signal_dataframe_reload = QtCore.pyqtSignal(str) # fn
-    
+    signal_dataframe_export = QtCore.pyqtSignal(str) # fn
+    signal_dataframe_follow = QtCore.pyqtSignal(str, bool) # (fn, follow on/off)
+    signal_follow_settings = QtCore.pyqtSignal()
+    itemSelectionChanged = QtCore.pyqtSignal() # same name as QTreeWidget's
+
     def __init__(self, label='DataFrameTree', parent=None):
         super().__init__(parent)
         # self.setHeaderLabel('DataFrameTree')
@@ -121,138 +357,209 @@ class DataFrameTree(QtWidgets.QTreeWidget):
         self.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection) # allow multiple selection
         self.setRootIsDecorated(True)
         self.setIndentation(20)
+        self.setUniformRowHeights(False) # style rows are taller
         self.makeContextMenu()
-        
-        self.df_nodes = OrderedDict() # fn => DataFrameNode
-    
-    
+
+        self.df_model = DataFrameModel(self)
+        self.df_nodes = self.df_model.df_nodes # fn => DataFrameNode
+        self.setModel(self.df_model)
+        self.setItemDelegate(StyleDelegate(self))
+        self.df_model.signal_column_renamed.connect(self.signal_column_renamed.emit)
+        self.df_model.signal_style_changed.connect(self.onStyleChanged)
+        self.selectionModel().selectionChanged.connect(self.itemSelectionChanged.emit)
+        self.expanded.connect(self.onExpanded)
+        self.collapsed.connect(self.onCollapsed)
+
+        self.editor_filter = gui.Text(default=None, label='Filter',
+                                      tooltip='show the columns containing this text')
+        self.editor_filter.textChanged.connect(self.applyFilter)
+
+
     def makeContextMenu(self):
         self.ctxMenuOnDf = QtWidgets.QMenu(self)
         # reload dataframe
         actReload = QtWidgets.QAction('Reload', self)
         actReload.triggered.connect(self.reloadDf)
         self.ctxMenuOnDf.addAction(actReload)
+        # follow growing file
+        self.actFollow = QtWidgets.QAction('Follow', self)
+        self.actFollow.setCheckable(True)
+        self.actFollow.setToolTip('keep reading the rows appended to the file')
+        self.actFollow.triggered.connect(self.followDf)
+        self.ctxMenuOnDf.addAction(self.actFollow)
+        actFollowSettings = QtWidgets.QAction('Follow Settings...', self)
+        actFollowSettings.triggered.connect(self.signal_follow_settings.emit)
+        self.ctxMenuOnDf.addAction(actFollowSettings)
+        # write the dataframe with the renamed columns
+        actExport = QtWidgets.QAction('Export...', self)
+        actExport.triggered.connect(self.exportDf)
+        self.ctxMenuOnDf.addAction(actExport)
         # delete dataframe
         actDelete = QtWidgets.QAction('Delete', self)
         actDelete.triggered.connect(self.removeDf)
         self.ctxMenuOnDf.addAction(actDelete)
-        
+
         self.setContextMenuPolicy(Qt.CustomContextMenu)
         self.customContextMenuRequested.connect(self.showContextMenu)
-    
-    
+
+
+    def currentNode(self):
+        index = self.currentIndex()
+        return index.internalPointer() if index.isValid() else None
+
     def removeDf(self):
-        dfnode = self.currentItem()
+        dfnode = self.currentNode()
         if isinstance(dfnode, DataFrameNode):
-            dfnode.deleteColumns()
             fn = dfnode.datafile
-            del self.df_nodes[fn]
-            self.takeTopLevelItem(self.indexOfTopLevelItem(dfnode))
+            self.df_model.removeDataFrame(fn)
             self.signal_dataframe_deleted.emit(fn)
-        
+
     def reloadDf(self):
-        dfnode = self.currentItem()
+        dfnode = self.currentNode()
         if isinstance(dfnode, DataFrameNode):
             self.signal_dataframe_reload.emit(dfnode.datafile)
-    
+
+    def exportDf(self):
+        dfnode = self.currentNode()
+        if isinstance(dfnode, DataFrameNode):
+            self.signal_dataframe_export.emit(dfnode.datafile)
+
+    def followDf(self, checked):
+        dfnode = self.currentNode()
+        if isinstance(dfnode, DataFrameNode):
+            self.signal_dataframe_follow.emit(dfnode.datafile, checked)
+
+    def setFollowing(self, datafn, following):
+        if datafn in self.df_nodes:
+            self.df_nodes[datafn].setFollowing(following)
+
     def showContextMenu(self, event):
-        # print(self.currentItem(), type(self.currentItem()))
-        if isinstance(self.currentItem(), DataFrameNode):
+        dfnode = self.currentNode()
+        if isinstance(dfnode, DataFrameNode):
+            self.actFollow.setChecked(dfnode.following)
             self.ctxMenuOnDf.exec_(QtGui.QCursor.pos())
-            
-    
+
+
+    @pyqtSlot(QtCore.QModelIndex)
+    def onExpanded(self, index):
+        """ create the style editor of an expanded column """
+        if isinstance(index.internalPointer(), DataColumnNode):
+            self.openPersistentEditor(self.df_model.index(0, 0, index))
+
+    @pyqtSlot(QtCore.QModelIndex)
+    def onCollapsed(self, index):
+        if isinstance(index.internalPointer(), DataColumnNode):
+            self.closePersistentEditor(self.df_model.index(0, 0, index))
+
+    @pyqtSlot(object) # DataColumnNode
+    def onStyleChanged(self, colNode):
+        if self.selectionModel().isSelected(self.df_model.nodeIndex(colNode)):
+            self.signal_active_style_changed.emit(colNode)
+
+
+    @pyqtSlot(str)
+    def applyFilter(self, text=None):
+        """ hide the columns not containing the filter text (case insensitive) """
+        if text is None:
+            text = self.editor_filter.getValue()
+        text = text.strip().lower()
+        for dfnode in self.df_nodes.values():
+            self.filterColumns(dfnode, text)
+
+    def filterColumns(self, dfnode, text):
+        parent = self.df_model.nodeIndex(dfnode)
+        for col in dfnode.column_nodes:
+            self.setRowHidden(col.row, parent, bool(text) and text not in col.column_name.lower())
+
+
     def addDataFrame(self, datafn, columns):
         if datafn in self.df_nodes:
-            self.df_nodes[datafn].updateColumns(columnNames=columns)
+            dfnode = self.df_nodes[datafn]
+            dfnode.updateColumns(columnNames=columns)
         else:
-            self.df_nodes[datafn] = \
-                DataFrameNode( parent=self, datafn=datafn, columnNames=columns )
-        return self.df_nodes[datafn]
-        
-        
-    def getSelectedColumns(self):
-        nodes = {} # fn => [selected column nodes]
-        for fn, dfnode in self.df_nodes.items():
-            cols = dfnode.getSelectedColumns()
-            if cols:
-                nodes[fn] = cols
-        return nodes
-    
-    
+            dfnode = self.df_model.addDataFrame(datafn, columns)
+        text = self.editor_filter.getValue().strip().lower()
+        if text:
+            self.filterColumns(dfnode, text)
+        return dfnode
+
 
-class DataFrameNode(QtWidgets.QTreeWidgetItem):
-    """ A dataframe node, with multiple column names as sub-node,
-        column sub-node's child is customs style widgets
-    """
-    def __init__(self, datafn, columnNames, parent:DataFrameTree):
-        assert parent is not None
-        super().__init__(parent)
-        self._hash = hash(datafn) # constant
-        self.datafile = datafn
-        self.dfname = os.path.basename(datafn) # can be renamed by user
-        self.setText(0, self.dfname)
-        self.tree = parent
-        self.tree.addTopLevelItem(self)
-        self.setFlags(Qt.ItemIsEnabled) #| Qt.ItemIsEditable)
-        
-        self.column_nodes = [ DataColumnNode(colname=cn, parent=self) for cn in columnNames ] 
-        
-    def __hash__(self):
-        return self._hash
-    
-    def deleteColumns(self):
-        for c in self.column_nodes:
-            self.removeChild(c)
-        self.column_nodes.clear()
-    
-    def updateColumns(self, columnNames):
-        self.deleteColumns()
-        self.column_nodes = [ DataColumnNode(colname=cn, parent=self) for cn in columnNames ]
-        
-    
-    def getColumnNamesSet(self):
-        return { col.column_name for col in self.column_nodes }
-    
     def getSelectedColumns(self):
-        return [col for col in self.column_nodes if col.isSelected()]
-    
-    
+        nodes = OrderedDict((fn, []) for fn in self.df_nodes) # fn => [selected column nodes]
+        for index in self.selectionModel().selectedIndexes():
+            node = index.internalPointer()
+            if isinstance(node, DataColumnNode) and node.dfnode.datafile in nodes:
+                nodes[node.dfnode.datafile].append(node)
+        return OrderedDict((fn, sorted(cols, key=lambda c: c.row)) for fn, cols in nodes.items() if cols)
 
-class DataColumnNode(QtWidgets.QTreeWidgetItem):
-    """A column name node, and its style modifier """
-    def __init__(self, colname, parent:DataFrameNode):
-        assert parent is not None
-        super().__init__(parent)
-        self.dfnode = parent
-        self.tree = parent.tree
-        self.column_name = colname
-        # self.style = UserDefinedStyle()
-        
-        self.setText(0, colname)
-        self.setFlags(Qt.ItemIsEnabled | Qt.ItemIsEditable | Qt.ItemIsSelectable)
-        
-        self.modifier_modifier = StyleModifier()
-        self.modifier_modifier.signal_style_changed.connect(self.onStyleChanged)
-        item = QtWidgets.QTreeWidgetItem(self)
-        item.setFlags(Qt.ItemIsEnabled) # not selectable
-        self.tree.setItemWidget(item, 0, self.modifier_modifier)
-    
-    
-    def onStyleChanged(self):
-        if self.isSelected():
-            self.tree.signal_active_style_changed.emit()
-    
-    def setData(self, column, role, newName):
-        """override parent text edit function to send both old and new names"""
-        super().setData(column, role, newName)
-        oldName = self.column_name
-        if role == Qt.EditRole and newName!=oldName:
-            if newName and newName not in self.dfnode.getColumnNamesSet():
-                self.column_name = newName
-                self.tree.signal_column_renamed.emit((self.dfnode.datafile, oldName, newName))
-            else: # blank/duplicate new name is not allowed
-                super().setData(column, role, oldName) # revert
-            
-    
-    def getStyle(self):
-        return self.modifier_modifier.getStyle()   
\ No newline at end of file
+
+    def removeDataFrame(self, datafn):
+        """ remove a dataFrame node without signal_dataframe_deleted """
+        self.df_model.removeDataFrame(datafn)
+
+
+    def columnNode(self, datafn, columnName):
+        dfnode = self.df_nodes.get(datafn)
+        if dfnode is not None:
+            for col in dfnode.column_nodes:
+                if col.column_name == columnName:
+                    return col
+        return None
+
+
+    def renameColumn(self, datafn, oldName, newName):
+        """ rename a column as if edited in the tree (signal_column_renamed is emitted),
+            return False if refused
+        """
+        col = self.columnNode(datafn, oldName)
+        return col is not None and self.df_model.setData(self.df_model.nodeIndex(col), newName)
+
+
+    def renameColumns(self, datafn, renames:dict):
+        """ rename columns {oldName: newName} at once as if edited in the tree, so swaps & chains
+            (a->b with b->a) apply. They go through unique temporary names, one rename at a time
+            would be refused as a duplicate. Renames to a missing, blank or duplicate name are refused,
+            return {oldName: newName} of the refused ones.
+        """
+        dfnode = self.df_nodes.get(datafn)
+        if dfnode is None:
+            return dict(renames)
+        names = [col.column_name for col in dfnode.column_nodes]
+        refused = {old: new for old, new in renames.items() if old not in names}
+        renames = {old: str(new) for old, new in renames.items() if old in names and str(new) != old}
+        while True: # a refused rename keeps its old name, which may clash in turn
+            finalNames = [renames.get(n, n) for n in names]
+            clashes = {old: new for old, new in renames.items() if not new or finalNames.count(new) > 1}
+            if not clashes:
+                break
+            refused.update(clashes)
+            renames = {old: new for old, new in renames.items() if old not in clashes}
+        temporary = {old: '\0' + old for old in renames} # no column name holds a NUL
+        for old, tmp in temporary.items():
+            self.renameColumn(datafn, old, tmp)
+        for old, tmp in temporary.items():
+            self.renameColumn(datafn, tmp, renames[old])
+        return refused
+
+
+    def setColumnStyle(self, datafn, columnName, style:UserDefinedStyle):
+        col = self.columnNode(datafn, columnName)
+        if col is not None:
+            col.style = style
+
+
+    def selectColumns(self, datafn, columnNames, clear=False):
+        """ select the named columns of a dataFrame, e.g. to restore a selection """
+        dfnode = self.df_nodes.get(datafn)
+        if dfnode is None:
+            return
+        names = set(columnNames)
+        selection = QtCore.QItemSelection()
+        for col in dfnode.column_nodes:
+            if col.column_name in names:
+                index = self.df_model.nodeIndex(col)
+                selection.select(index, index)
+        flags = QtCore.QItemSelectionModel.Select
+        if clear:
+            flags |= QtCore.QItemSelectionModel.Clear
+        self.selectionModel().select(selection, flags)